@@ -26,6 +26,8 @@ class Settings:
     notification_exchange: str = os.getenv("NOTIFICATION_EXCHANGE", "notification.events")
     listing_found_routing_key: str = os.getenv("LISTING_FOUND_ROUTING_KEY", "listing.found")
     api_listing_found_queue: str = os.getenv("API_LISTING_FOUND_QUEUE", "api.listing_found")
+    task_health_routing_key: str = os.getenv("TASK_HEALTH_ROUTING_KEY", "task.health")
+    api_task_health_queue: str = os.getenv("API_TASK_HEALTH_QUEUE", "api.task_health")
     startup_retry_attempts: int = int(os.getenv("STARTUP_RETRY_ATTEMPTS", "30"))
     startup_retry_delay_seconds: float = float(os.getenv("STARTUP_RETRY_DELAY_SECONDS", "2"))
 
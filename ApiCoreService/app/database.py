@@ -1,5 +1,6 @@
 from collections.abc import AsyncGenerator
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -22,11 +23,25 @@ engine = create_async_engine(
 async_session = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
 
 
+# Columns added after the first release; create_all does not alter existing tables.
+SCHEMA_UPGRADES = (
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS adaptive_interval BOOLEAN NOT NULL DEFAULT FALSE",
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS min_interval_minutes INTEGER",
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS max_interval_minutes INTEGER",
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS max_pages INTEGER",
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS effective_interval_minutes INTEGER",
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS interval_reason VARCHAR(200)",
+    "ALTER TABLE task_health ADD COLUMN IF NOT EXISTS fetched_runs BIGINT NOT NULL DEFAULT 0",
+)
+
+
 async def init_db() -> None:
     from app import models  # noqa: F401
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        for statement in SCHEMA_UPGRADES:
+            await conn.execute(text(statement))
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -102,6 +102,7 @@ async def lifespan(app: FastAPI):
     try:
         await retry_startup_step("RabbitMQ", rabbitmq.connect)
         await rabbitmq.start_listing_consumer()
+        await rabbitmq.start_task_health_consumer()
     except Exception:
         logger.exception("RabbitMQ is unavailable. API will start, but parser synchronization is disabled.")
     yield
@@ -132,6 +132,13 @@ class Task(Base):
     platform: Mapped[str] = mapped_column(String(30), nullable=False)
     url: Mapped[str] = mapped_column(Text, nullable=False)
     interval_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=30)
+    adaptive_interval: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    min_interval_minutes: Mapped[int | None] = mapped_column(Integer)
+    max_interval_minutes: Mapped[int | None] = mapped_column(Integer)
+    max_pages: Mapped[int | None] = mapped_column(Integer)
+    # Reported by parserService in `task.health` events for tasks with adaptive_interval.
+    effective_interval_minutes: Mapped[int | None] = mapped_column(Integer)
+    interval_reason: Mapped[str | None] = mapped_column(String(200))
     end_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=utc_now)
@@ -168,3 +175,29 @@ class ListingHistory(Base):
         UniqueConstraint("task_id", "platform", "external_id", name="uix_listing_history_task_platform_external"),
         CheckConstraint("platform IN ('avito', 'cian', 'youla')", name="ck_listings_history_platform"),
     )
+
+
+class TaskHealth(Base):
+    """Latest run summary of a task, kept up to date from parserService `task.health` events."""
+
+    __tablename__ = "task_health"
+
+    task_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("tasks.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    platform: Mapped[str] = mapped_column(String(30), nullable=False)
+    last_run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_error_class: Mapped[str | None] = mapped_column(String(100))
+    last_http_status: Mapped[int | None] = mapped_column(Integer)
+    last_parsed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    consecutive_failures: Mapped[int] = mapped_column(Integer, nullable=False, default=0, index=True)
+    total_runs: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    total_failures: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    total_new: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    fetched_runs: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    fetch_ms_avg: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    parse_ms_avg: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    page_kib_max: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=utc_now, onupdate=utc_now)
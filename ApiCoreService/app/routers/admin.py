@@ -8,8 +8,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.dependencies import require_admin
-from app.models import ListingHistory, Task, User
-from app.schemas import AdminBanRequest, AdminRolePatch, AdminTaskPatch, ListingRead, MessageResponse, TaskRead, UserRead, UserStatus
+from app.models import ListingHistory, Task, TaskHealth, User
+from app.schemas import (
+    AdminBanRequest,
+    AdminRolePatch,
+    AdminTaskPatch,
+    ListingRead,
+    MessageResponse,
+    TaskHealthRead,
+    TaskRead,
+    UserRead,
+    UserStatus,
+)
 from app.services.rabbitmq import rabbitmq
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -161,6 +171,33 @@ async def update_user_role(
     return user
 
 
+@router.get(
+    "/tasks/health",
+    response_model=list[TaskHealthRead],
+    summary="List task health",
+    description=(
+        "Admin-only endpoint that lists run summaries of all tasks, most consecutive failures first, "
+        "to find tasks that keep failing or fetch unusually large pages."
+    ),
+    response_description="Task run summaries ordered by consecutive failures.",
+)
+async def list_task_health(
+    admin: Annotated[User, Depends(require_admin)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    min_consecutive_failures: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
+) -> list[TaskHealth]:
+    result = await db.execute(
+        select(TaskHealth)
+        .where(TaskHealth.consecutive_failures >= min_consecutive_failures)
+        .order_by(TaskHealth.consecutive_failures.desc(), TaskHealth.page_kib_max.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    return list(result.scalars().all())
+
+
 @router.patch(
     "/tasks/{task_id}",
     response_model=TaskRead,
@@ -8,8 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.dependencies import get_current_user
-from app.models import ListingHistory, Task, User
-from app.schemas import ListingRead, MessageResponse, Platform, TaskCreate, TaskRead, TaskUpdate
+from app.models import ListingHistory, Task, TaskHealth, User
+from app.schemas import ListingRead, MessageResponse, Platform, TaskCreate, TaskHealthRead, TaskRead, TaskUpdate
 from app.services.rabbitmq import rabbitmq
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
@@ -48,6 +48,10 @@ async def create_task(
         platform=payload.platform,
         url=payload.url,
         interval_minutes=payload.interval_minutes,
+        adaptive_interval=payload.adaptive_interval,
+        min_interval_minutes=payload.min_interval_minutes,
+        max_interval_minutes=payload.max_interval_minutes,
+        max_pages=payload.max_pages,
         end_date=payload.end_date,
         is_active=payload.is_active,
     )
@@ -119,6 +123,15 @@ async def update_task(
     data = payload.model_dump(exclude_unset=True)
     for key, value in data.items():
         setattr(task, key, value)
+    if (
+        task.min_interval_minutes is not None
+        and task.max_interval_minutes is not None
+        and task.max_interval_minutes < task.min_interval_minutes
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="max_interval_minutes must not be less than min_interval_minutes",
+        )
     await db.commit()
     await db.refresh(task)
     await rabbitmq.publish_task_upserted(task, run_now=False)
@@ -194,3 +207,27 @@ async def get_task_listings(
         select(ListingHistory).where(*conditions).order_by(ListingHistory.created_at.desc()).limit(limit).offset(offset)
     )
     return list(result.scalars().all())
+
+
+@router.get(
+    "/{task_id}/health",
+    response_model=TaskHealthRead,
+    summary="Get task health",
+    description=(
+        "Returns the latest run summary parserService reported for a user's task: when it last ran, "
+        "the last error and HTTP status, consecutive failures and fetch/parse timings. "
+        "Returns 404 until the task has run at least once."
+    ),
+    response_description="Run summary of the requested task.",
+)
+async def get_task_health(
+    task_id: UUID,
+    user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> TaskHealth:
+    await get_user_task(db, user, task_id)
+    result = await db.execute(select(TaskHealth).where(TaskHealth.task_id == task_id))
+    health = result.scalar_one_or_none()
+    if not health:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task has not run yet")
+    return health
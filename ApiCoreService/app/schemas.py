@@ -175,9 +175,21 @@ class TaskBase(BaseModel):
     platform: Platform
     url: str = Field(min_length=8, max_length=4096)
     interval_minutes: int = Field(default=30, gt=0)
+    adaptive_interval: bool = False
+    min_interval_minutes: int | None = Field(default=None, gt=0)
+    max_interval_minutes: int | None = Field(default=None, gt=0)
+    max_pages: int | None = Field(default=None, ge=1, le=10)
     end_date: datetime | None = None
     is_active: bool = True
 
+    @field_validator("max_interval_minutes")
+    @classmethod
+    def validate_interval_bounds(cls, value: int | None, info):
+        min_interval = info.data.get("min_interval_minutes")
+        if value is not None and min_interval is not None and value < min_interval:
+            raise ValueError("max_interval_minutes must not be less than min_interval_minutes")
+        return value
+
     @field_validator("url")
     @classmethod
     def validate_platform_url(cls, value: str, info):
@@ -212,6 +224,10 @@ class TaskUpdate(BaseModel):
     platform: Platform | None = None
     url: str | None = Field(default=None, min_length=8, max_length=4096)
     interval_minutes: int | None = Field(default=None, gt=0)
+    adaptive_interval: bool | None = None
+    min_interval_minutes: int | None = Field(default=None, gt=0)
+    max_interval_minutes: int | None = Field(default=None, gt=0)
+    max_pages: int | None = Field(default=None, ge=1, le=10)
     end_date: datetime | None = None
     is_active: bool | None = None
 
@@ -225,6 +241,12 @@ class TaskRead(BaseModel):
     platform: Platform
     url: str
     interval_minutes: int
+    adaptive_interval: bool
+    min_interval_minutes: int | None
+    max_interval_minutes: int | None
+    max_pages: int | None
+    effective_interval_minutes: int | None = None
+    interval_reason: str | None = None
     end_date: datetime | None
     is_active: bool
     created_at: datetime
@@ -248,6 +270,26 @@ class ListingRead(BaseModel):
     created_at: datetime
 
 
+class TaskHealthRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    task_id: UUID
+    platform: Platform
+    last_run_at: datetime
+    last_error_class: str | None
+    last_http_status: int | None
+    last_parsed_count: int
+    consecutive_failures: int
+    total_runs: int
+    total_failures: int
+    total_new: int
+    fetched_runs: int
+    fetch_ms_avg: int
+    parse_ms_avg: int
+    page_kib_max: int
+    updated_at: datetime
+
+
 class NotificationChannelRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
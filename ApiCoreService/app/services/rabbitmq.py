@@ -6,11 +6,12 @@ from uuid import UUID
 
 import aio_pika
 from aio_pika.abc import AbstractIncomingMessage
+from sqlalchemy import bindparam, case, func, select, update
 from sqlalchemy.dialects.postgresql import insert
 
 from app.config import settings
 from app.database import async_session
-from app.models import ListingHistory, Task
+from app.models import ListingHistory, Task, TaskHealth
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,10 @@ def build_task_upserted_payload(task: Task, *, run_now: bool = False, now: datet
             "url": task.url,
             "name": task.name,
             "interval_minutes": task.interval_minutes,
+            "adaptive_interval": bool(task.adaptive_interval),
+            "min_interval_minutes": task.min_interval_minutes,
+            "max_interval_minutes": task.max_interval_minutes,
+            "max_pages": task.max_pages,
             "end_date": task.end_date.isoformat() if task.end_date else None,
             "is_active": task.is_active,
             "next_run_at": (now or datetime.now(timezone.utc)).isoformat() if run_now else None,
@@ -57,6 +62,46 @@ def listing_found_to_history_values(payload: dict, *, now: datetime | None = Non
     }
 
 
+def task_health_values(entry: dict, *, now: datetime | None = None) -> dict:
+    """Map one task of a `task.health` event to a `task_health` row; counts cover the event's window only."""
+    return {
+        "task_id": UUID(str(entry["task_id"])),
+        "platform": entry["platform"],
+        "last_run_at": parse_datetime(entry["last_run_at"]),
+        "last_error_class": entry.get("last_error_class"),
+        "last_http_status": entry.get("last_http_status"),
+        "last_parsed_count": entry.get("last_parsed_count") or 0,
+        "consecutive_failures": entry.get("consecutive_failures") or 0,
+        "total_runs": entry.get("runs") or 0,
+        "total_failures": entry.get("failures") or 0,
+        "total_new": entry.get("new_count") or 0,
+        # Runs served from the parser's page cache are not in the averages.
+        "fetched_runs": entry.get("fetched_runs") or 0,
+        "fetch_ms_avg": entry.get("fetch_ms_avg") or 0,
+        "parse_ms_avg": entry.get("parse_ms_avg") or 0,
+        "page_kib_max": entry.get("page_kib_max") or 0,
+        "updated_at": now or datetime.now(timezone.utc),
+    }
+
+
+def running_average(average, window_average, window_runs):
+    """SQL for ``task_health`` ``average`` after adding a window of ``window_runs`` fetched runs."""
+    total_runs = TaskHealth.fetched_runs + window_runs
+    return case(
+        (total_runs == 0, average),
+        else_=(average * TaskHealth.fetched_runs + window_average * window_runs) / total_runs,
+    )
+
+
+def task_interval_values(entry: dict) -> dict:
+    """Adaptive interval decision of one task of a `task.health` event, as parameters of the tasks UPDATE."""
+    return {
+        "health_task_id": UUID(str(entry["task_id"])),
+        "health_effective_interval_minutes": entry.get("effective_interval_minutes"),
+        "health_interval_reason": entry.get("interval_reason"),
+    }
+
+
 def parse_datetime(value) -> datetime | None:
     if not value:
         return None
@@ -217,5 +262,90 @@ class RabbitMQClient:
                 await session.execute(statement)
             await session.commit()
 
+    async def start_task_health_consumer(self) -> None:
+        if not self.channel or not self.notification_exchange:
+            raise RuntimeError("RabbitMQ is not connected")
+
+        queue = await self.channel.declare_queue(settings.api_task_health_queue, durable=True)
+        await queue.bind(self.notification_exchange, routing_key=settings.task_health_routing_key)
+        await queue.consume(self._on_task_health)
+        logger.info("ApiCoreService consumes task.health events from queue %s", settings.api_task_health_queue)
+
+    async def _on_task_health(self, message: AbstractIncomingMessage) -> None:
+        try:
+            payload = json.loads(message.body.decode("utf-8"))
+        except json.JSONDecodeError:
+            logger.exception("Invalid task.health JSON. Rejecting message.")
+            await message.reject(requeue=False)
+            return
+
+        try:
+            await self._save_task_health(payload)
+        except Exception:
+            logger.exception("Failed to persist task.health. Requeueing message.")
+            await message.reject(requeue=True)
+            return
+
+        await message.ack()
+
+    async def _save_task_health(self, payload: dict) -> None:
+        now = datetime.now(timezone.utc)
+        entries = payload.get("tasks") or []
+        rows = [task_health_values(entry, now=now) for entry in entries]
+        if not rows:
+            return
+
+        async with async_session() as session:
+            # Health of tasks that were never synced here or are already gone is dropped.
+            result = await session.execute(select(Task.id).where(Task.id.in_([row["task_id"] for row in rows])))
+            known = set(result.scalars().all())
+            rows = [row for row in rows if row["task_id"] in known]
+            if not rows:
+                return
+
+            statement = insert(TaskHealth).values(rows)
+            excluded = statement.excluded
+            statement = statement.on_conflict_do_update(
+                index_elements=[TaskHealth.task_id],
+                set_={
+                    "platform": excluded.platform,
+                    "last_run_at": excluded.last_run_at,
+                    "last_error_class": excluded.last_error_class,
+                    "last_http_status": func.coalesce(excluded.last_http_status, TaskHealth.last_http_status),
+                    "last_parsed_count": excluded.last_parsed_count,
+                    # A window that failed throughout continues the streak from the previous one.
+                    "consecutive_failures": case(
+                        (
+                            excluded.consecutive_failures == excluded.total_runs,
+                            TaskHealth.consecutive_failures + excluded.consecutive_failures,
+                        ),
+                        else_=excluded.consecutive_failures,
+                    ),
+                    "total_runs": TaskHealth.total_runs + excluded.total_runs,
+                    "total_failures": TaskHealth.total_failures + excluded.total_failures,
+                    "total_new": TaskHealth.total_new + excluded.total_new,
+                    "fetched_runs": TaskHealth.fetched_runs + excluded.fetched_runs,
+                    "fetch_ms_avg": running_average(TaskHealth.fetch_ms_avg, excluded.fetch_ms_avg, excluded.fetched_runs),
+                    "parse_ms_avg": running_average(TaskHealth.parse_ms_avg, excluded.parse_ms_avg, excluded.fetched_runs),
+                    "page_kib_max": func.greatest(TaskHealth.page_kib_max, excluded.page_kib_max),
+                    "updated_at": excluded.updated_at,
+                },
+            )
+            await session.execute(statement)
+
+            intervals = [task_interval_values(entry) for entry in entries]
+            await session.execute(
+                update(Task.__table__)
+                .where(Task.id == bindparam("health_task_id"))
+                .values(
+                    effective_interval_minutes=bindparam("health_effective_interval_minutes"),
+                    interval_reason=bindparam("health_interval_reason"),
+                    # Keep updated_at for changes made by the owner.
+                    updated_at=Task.updated_at,
+                ),
+                [values for values in intervals if values["health_task_id"] in known],
+            )
+            await session.commit()
+
 
 rabbitmq = RabbitMQClient()
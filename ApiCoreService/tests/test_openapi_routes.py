@@ -9,6 +9,8 @@ def test_openapi_contains_expected_route_groups():
     assert "/auth/telegram-token" in paths
     assert "/tasks" in paths
     assert "/tasks/{task_id}/listings" in paths
+    assert "/tasks/{task_id}/health" in paths
+    assert "/admin/tasks/health" in paths
     assert "/listings" in paths
     assert "/admin/users/{user_id}/ban" in paths
     assert "/notification-channels" in paths
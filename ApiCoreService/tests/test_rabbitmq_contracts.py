@@ -8,6 +8,8 @@ from app.services.rabbitmq import (
     build_task_deleted_payload,
     build_task_upserted_payload,
     listing_found_to_history_values,
+    task_health_values,
+    task_interval_values,
 )
 
 
@@ -35,6 +37,46 @@ def test_task_upserted_payload_matches_parser_service_contract():
     assert payload["payload"]["next_run_at"] == now.isoformat()
 
 
+def test_task_upserted_payload_carries_adaptive_interval_settings():
+    task = Task(
+        id=uuid4(),
+        user_id=uuid4(),
+        name="Avito phones",
+        platform="avito",
+        url="https://www.avito.ru/moskva/telefony",
+        interval_minutes=30,
+        adaptive_interval=True,
+        min_interval_minutes=10,
+        max_interval_minutes=120,
+        end_date=None,
+        is_active=True,
+    )
+
+    payload = build_task_upserted_payload(task, run_now=False)
+
+    assert payload["payload"]["adaptive_interval"] is True
+    assert payload["payload"]["min_interval_minutes"] == 10
+    assert payload["payload"]["max_interval_minutes"] == 120
+
+
+def test_task_upserted_payload_carries_page_depth():
+    task = Task(
+        id=uuid4(),
+        user_id=uuid4(),
+        name="Cian flats",
+        platform="cian",
+        url="https://www.cian.ru/cat.php?deal_type=rent",
+        interval_minutes=30,
+        max_pages=3,
+        end_date=None,
+        is_active=True,
+    )
+
+    payload = build_task_upserted_payload(task)
+
+    assert payload["payload"]["max_pages"] == 3
+
+
 def test_task_deleted_payload_matches_parser_service_contract():
     task_id = uuid4()
 
@@ -77,6 +119,79 @@ def test_listing_found_payload_maps_to_history_values():
     assert values["published_at"].tzinfo is not None
 
 
+def test_task_health_entry_maps_to_task_health_values():
+    task_id = uuid4()
+    now = datetime(2026, 4, 30, 12, 5, tzinfo=timezone.utc)
+
+    values = task_health_values(
+        {
+            "task_id": str(task_id),
+            "platform": "cian",
+            "runs": 3,
+            "failures": 2,
+            "consecutive_failures": 2,
+            "last_run_at": "2026-04-30T12:00:00+00:00",
+            "last_error_class": "ClientResponseError",
+            "last_http_status": 429,
+            "last_parsed_count": 0,
+            "new_count": 4,
+            "fetched_runs": 2,
+            "fetch_ms_avg": 850,
+            "parse_ms_avg": 40,
+            "page_kib_max": 512,
+        },
+        now=now,
+    )
+
+    assert values["task_id"] == task_id
+    assert values["last_run_at"] == datetime(2026, 4, 30, 12, 0, tzinfo=timezone.utc)
+    assert values["last_http_status"] == 429
+    assert values["consecutive_failures"] == 2
+    assert values["total_runs"] == 3
+    assert values["total_failures"] == 2
+    assert values["total_new"] == 4
+    assert values["fetched_runs"] == 2
+    assert values["fetch_ms_avg"] == 850
+    assert values["page_kib_max"] == 512
+    assert values["updated_at"] == now
+
+
+def test_task_health_window_served_from_cache_adds_no_fetched_runs():
+    values = task_health_values(
+        {
+            "task_id": str(uuid4()),
+            "platform": "avito",
+            "runs": 2,
+            "last_run_at": "2026-04-30T12:00:00+00:00",
+            "fetched_runs": 0,
+            "fetch_ms_avg": None,
+            "parse_ms_avg": None,
+        }
+    )
+
+    assert values["fetched_runs"] == 0
+    assert values["fetch_ms_avg"] == 0
+    assert values["parse_ms_avg"] == 0
+
+
+def test_task_health_entry_carries_adaptive_interval_decision():
+    task_id = uuid4()
+
+    values = task_interval_values(
+        {
+            "task_id": str(task_id),
+            "effective_interval_minutes": 45,
+            "interval_reason": "0.10 new per run, polling slower",
+        }
+    )
+
+    assert values == {
+        "health_task_id": task_id,
+        "health_effective_interval_minutes": 45,
+        "health_interval_reason": "0.10 new per run, polling slower",
+    }
+
+
 class FakeMessage:
     def __init__(self, body: bytes):
         self.body = body
@@ -115,3 +230,34 @@ async def test_listing_consumer_rejects_invalid_json():
 
     assert message.acked is False
     assert message.rejected is False
+
+
+async def test_task_health_consumer_acks_valid_message(monkeypatch):
+    client = RabbitMQClient()
+    saved = []
+
+    async def fake_save(payload):
+        saved.append(payload)
+
+    monkeypatch.setattr(client, "_save_task_health", fake_save)
+    message = FakeMessage(json.dumps({"event_type": "task.health", "tasks": []}).encode("utf-8"))
+
+    await client._on_task_health(message)
+
+    assert message.acked is True
+    assert saved == [{"event_type": "task.health", "tasks": []}]
+
+
+async def test_task_health_consumer_requeues_when_saving_fails(monkeypatch):
+    client = RabbitMQClient()
+
+    async def failing_save(payload):
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(client, "_save_task_health", failing_save)
+    message = FakeMessage(json.dumps({"event_type": "task.health", "tasks": []}).encode("utf-8"))
+
+    await client._on_task_health(message)
+
+    assert message.acked is False
+    assert message.rejected is True
@@ -1,3 +1,9 @@
+from datetime import datetime, timezone
+
+from app.models import TaskHealth
+from tests.conftest import make_task
+
+
 async def test_create_task_persists_and_publishes_parser_contract(client, fake_session, monkeypatch):
     published = []
 
@@ -37,3 +43,57 @@ async def test_create_task_rejects_url_from_wrong_platform(client):
     )
 
     assert response.status_code == 422
+
+
+async def test_task_health_is_returned_after_task_ownership_check(client, fake_session, user):
+    task = make_task(user.id)
+    health = TaskHealth(
+        task_id=task.id,
+        platform="avito",
+        last_run_at=datetime.now(timezone.utc),
+        last_error_class="ClientResponseError",
+        last_http_status=503,
+        last_parsed_count=0,
+        consecutive_failures=3,
+        total_runs=10,
+        total_failures=4,
+        total_new=12,
+        fetched_runs=8,
+        fetch_ms_avg=900,
+        parse_ms_avg=35,
+        page_kib_max=640,
+        updated_at=datetime.now(timezone.utc),
+    )
+    fake_session.execute_results = [task, health]
+
+    response = await client.get(f"/tasks/{task.id}/health")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["task_id"] == str(task.id)
+    assert body["consecutive_failures"] == 3
+    assert body["last_http_status"] == 503
+
+
+async def test_task_health_is_not_found_before_first_run(client, fake_session, user):
+    task = make_task(user.id)
+    fake_session.execute_results = [task, None]
+
+    response = await client.get(f"/tasks/{task.id}/health")
+
+    assert response.status_code == 404
+
+
+async def test_task_read_exposes_adaptive_interval_decision(client, fake_session, user):
+    task = make_task(user.id)
+    task.adaptive_interval = True
+    task.effective_interval_minutes = 45
+    task.interval_reason = "0.10 new per run, polling slower"
+    fake_session.execute_results = [task]
+
+    response = await client.get(f"/tasks/{task.id}")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["effective_interval_minutes"] == 45
+    assert body["interval_reason"] == "0.10 new per run, polling slower"
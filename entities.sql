@@ -139,6 +139,14 @@ CREATE TABLE tasks (
 
     interval_minutes  INTEGER NOT NULL DEFAULT 30,
 
+    adaptive_interval     BOOLEAN NOT NULL DEFAULT FALSE,
+    min_interval_minutes  INTEGER,
+    max_interval_minutes  INTEGER,
+    max_pages             INTEGER,
+
+    effective_interval_minutes  INTEGER,
+    interval_reason             VARCHAR(200),
+
     end_date          TIMESTAMPTZ,
 
     is_active         BOOLEAN NOT NULL DEFAULT TRUE,
@@ -179,6 +187,32 @@ CREATE TABLE listings_history (
     CHECK (platform IN ('avito', 'cian', 'youla'))
 );
 
+CREATE TABLE task_health (
+    task_id                 UUID PRIMARY KEY REFERENCES tasks(id) ON DELETE CASCADE,
+
+    platform                VARCHAR(30) NOT NULL,
+
+    last_run_at             TIMESTAMPTZ NOT NULL,
+    last_error_class        VARCHAR(100),
+    last_http_status        INTEGER,
+    last_parsed_count       INTEGER NOT NULL DEFAULT 0,
+
+    consecutive_failures    INTEGER NOT NULL DEFAULT 0,
+    total_runs              BIGINT NOT NULL DEFAULT 0,
+    total_failures          BIGINT NOT NULL DEFAULT 0,
+    total_new               BIGINT NOT NULL DEFAULT 0,
+
+    fetched_runs            BIGINT NOT NULL DEFAULT 0,
+    fetch_ms_avg            INTEGER NOT NULL DEFAULT 0,
+    parse_ms_avg            INTEGER NOT NULL DEFAULT 0,
+    page_kib_max            INTEGER NOT NULL DEFAULT 0,
+
+    updated_at              TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX idx_task_health_consecutive_failures
+ON task_health(consecutive_failures);
+
 CREATE TABLE outbox_events (
     id              UUID PRIMARY KEY DEFAULT gen_random_uuid(),
 
@@ -245,6 +279,17 @@ CREATE TABLE tasks_cache (
 
     last_run_at       TIMESTAMPTZ,
 
+    adaptive_interval           BOOLEAN NOT NULL DEFAULT FALSE,
+    min_interval_minutes        INTEGER,
+    max_interval_minutes        INTEGER,
+    effective_interval_minutes  INTEGER,
+    yield_rate                  DOUBLE PRECISION,
+    interval_reason             VARCHAR(200),
+    max_pages                   INTEGER,
+
+    lease_owner       VARCHAR(100),
+    lease_expires_at  TIMESTAMPTZ,
+
     CHECK (platform IN ('avito', 'cian', 'youla')),
     CHECK (interval_minutes > 0)
 );
@@ -279,6 +324,32 @@ CREATE TABLE found_listings (
 CREATE INDEX idx_found_listings_task_id
 ON found_listings(task_id);
 
+CREATE INDEX idx_found_listings_task_created
+ON found_listings(task_id, created_at DESC);
+
+CREATE TABLE task_runs (
+    id              BIGSERIAL PRIMARY KEY,
+
+    task_id         UUID NOT NULL REFERENCES tasks_cache(task_id) ON DELETE CASCADE,
+    platform        VARCHAR(30) NOT NULL,
+
+    started_at      TIMESTAMPTZ NOT NULL,
+
+    fetch_ms        INTEGER NOT NULL DEFAULT 0,
+    parse_ms        INTEGER NOT NULL DEFAULT 0,
+    requests        INTEGER NOT NULL DEFAULT 0,
+    page_kib        INTEGER NOT NULL DEFAULT 0,
+
+    parsed_count    INTEGER NOT NULL DEFAULT 0,
+    new_count       INTEGER NOT NULL DEFAULT 0,
+
+    http_status     INTEGER,
+    error_class     VARCHAR(100)
+);
+
+CREATE INDEX idx_task_runs_task_started
+ON task_runs(task_id, started_at DESC);
+
 
 CREATE TABLE outbox_events (
     id              UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -0,0 +1,286 @@
+"""Benchmark the parsers on recorded pages and check them against golden listings.
+
+Usage: python benchmark_parsers.py [FIXTURE ...] [--repeat 20] [--chunk-sizes 256,4096,65536] [--known-from 10]
+                                   [--update-goldens]
+
+Fixtures live in ``benchmarks/fixtures`` and are named ``<platform>_<layout>``:
+HTML result pages, or ``.json`` GraphQL feed responses for Youla. Each one is
+served by a replay HTTP client to the parser's own ``parse_page``, so the
+strategy ranker, the extraction job and the HTML backend set by
+``PARSER_HTML_BACKEND`` are the ones used in production. Avito pages are also
+streamed in chunks of each ``--chunk-sizes`` value, once in full and once
+with every listing from the ``--known-from``-th on already known, which is
+the early stop that ``PARSER_STREAM_HTML`` pays for. The report shows
+pages/sec, per-page latency percentiles and peak Python heap per run.
+
+The listings must equal ``benchmarks/goldens/<fixture>.json`` on every path;
+an early stop must return the golden listings up to the stop.
+Pages that carry the same listings both as embedded JSON and as DOM cards
+(the ``*_state_and_cards`` fixtures) are also parsed with each of those
+strategies tried first, and the results must match. The exit code is 1 when
+any check fails or a golden is missing. Regenerate goldens with
+``--update-goldens`` only after checking that a change in output is intended.
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from pathlib import Path
+
+from config import settings
+from fetching.client import FetchResponse
+from models.Post import FoundListing  # noqa: F401  # TaskCache relates to it by name
+from models.Task import TaskCache
+from parsers.avito import AvitoParser
+from parsers.base import BaseParser, ParsedListing
+from parsers.cian import CianParser
+from parsers.strategies import StrategyRanker
+from parsers.youla import FeedCursor, YoulaParser
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent / "benchmarks"
+FIXTURES_DIR = BENCHMARKS_DIR / "fixtures"
+GOLDENS_DIR = BENCHMARKS_DIR / "goldens"
+
+URLS = {
+    "avito": "https://www.avito.ru/moskva/tovary?q=benchmark",
+    "cian": "https://www.cian.ru/cat.php?deal_type=sale&offer_type=flat",
+    "youla": "https://youla.ru/moskva?q=benchmark",
+}
+
+# Strategies that read the same listings from embedded JSON and from the DOM; the fallbacks
+# after them (bare links, the GraphQL feed) return less by design and are not compared.
+PAIRED_STRATEGIES = {
+    "avito": ("next_data", "items"),
+    "cian": ("offers_state", "offer_cards"),
+    "youla": ("state", "product_cards"),
+}
+
+
+class BufferedAvitoParser(AvitoParser):
+    streaming = False
+
+
+class StreamingAvitoParser(AvitoParser):
+    streaming = True
+
+
+PARSERS = {"avito": BufferedAvitoParser, "cian": CianParser, "youla": YoulaParser}
+
+
+class ReplayStream:
+    def __init__(self, body: bytes, chunk_size: int):
+        self.encoding = "utf-8"
+        self.bytes_read = 0
+        self._body = body
+        self._chunk_size = chunk_size
+
+    async def iter_chunks(self):
+        for start in range(0, len(self._body), self._chunk_size):
+            chunk = self._body[start : start + self._chunk_size]
+            self.bytes_read += len(chunk)
+            yield chunk
+
+
+class ReplayClient:
+    """Stands in for ``HttpClient`` and answers every request with one recorded body."""
+
+    def __init__(self, body: bytes, chunk_size: int = 65536):
+        self.body = body
+        self.chunk_size = chunk_size
+
+    async def get(self, platform: str, url: str, **kwargs) -> FetchResponse:
+        return FetchResponse(platform, url, 200, self.body)
+
+    async def post_json(self, platform: str, url: str, payload: dict, **kwargs) -> FetchResponse:
+        return FetchResponse(platform, url, 200, self.body)
+
+    @asynccontextmanager
+    async def stream(self, platform: str, url: str, **kwargs):
+        yield ReplayStream(self.body, self.chunk_size)
+
+
+class PinnedRanker(StrategyRanker):
+    """Tries ``first`` before the ranked order and remembers which strategy found the listings."""
+
+    def __init__(self, first: str):
+        super().__init__()
+        self.first = first
+        self.winner: str | None = None
+
+    def order(self, platform: str, url: str, names: list[str]) -> list[str]:
+        return sorted(super().order(platform, url, names), key=lambda name: name != self.first)
+
+    def record(self, platform: str, url: str, name: str, success: bool, seconds: float):
+        super().record(platform, url, name, success, seconds)
+        if success:
+            self.winner = name
+
+
+async def parse_fixture(
+    parser: BaseParser,
+    path: Path,
+    stop_ids: frozenset[str] = frozenset(),
+) -> list[ParsedListing]:
+    platform = parser.platform
+    task = TaskCache(platform=platform, url=URLS[platform])
+    if path.suffix == ".json":
+        # Feed responses answer the GraphQL request made for the pages after the first one.
+        page = await parser.parse_page(task, 2, FeedCursor({"auth": {}}, "benchmark"))
+    else:
+        page = await parser.parse_page(task, 1, None, stop_ids)
+    return page.listings
+
+
+async def compare_paths(path: Path) -> str:
+    """Parse the page with each paired strategy tried first and check that they agree."""
+    platform = path.name.split("_", 1)[0]
+    body = path.read_bytes()
+    results = {}
+    for name in PAIRED_STRATEGIES[platform]:
+        ranker = PinnedRanker(name)
+        listings = await parse_fixture(PARSERS[platform](ReplayClient(body), strategies=ranker), path)
+        if ranker.winner == name:
+            results[name] = listings
+    if len(results) < 2:
+        return "-"
+    first, *others = results.values()
+    return "agree" if all(listings == first for listings in others) else "DIFFER"
+
+
+def as_json(listings: list[ParsedListing]) -> list[dict]:
+    return [
+        {**asdict(listing), "published_at": listing.published_at.isoformat() if listing.published_at else None}
+        for listing in listings
+    ]
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def read_golden(path: Path) -> list[dict] | None:
+    golden = GOLDENS_DIR / f"{path.stem}.json"
+    return json.loads(golden.read_text(encoding="utf-8")) if golden.exists() else None
+
+
+def check_golden(path: Path, listings: list[ParsedListing], update: bool, stop_at: int | None = None) -> str:
+    """Compare with the golden, or with its first ``stop_at`` listings for a run that could stop early.
+
+    A page without item cards is parsed in full even when streamed, so the whole golden is accepted too.
+    """
+    actual = as_json(listings)
+    if update:
+        golden = GOLDENS_DIR / f"{path.stem}.json"
+        golden.write_text(json.dumps(actual, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        return "saved"
+    expected = read_golden(path)
+    if expected is None:
+        return "missing"
+    return "ok" if actual in (expected, expected[:stop_at]) else "DIFF"
+
+
+def fixture_runs(path: Path, options) -> list[tuple[str, BaseParser, frozenset[str], int | None]]:
+    """Runs to time on one fixture: label, parser with a fresh ranker, known IDs and where reading stops.
+
+    The known IDs come from the golden as it was before this run.
+    """
+    platform = path.name.split("_", 1)[0]
+    body = path.read_bytes()
+    runs = [("page", PARSERS[platform](ReplayClient(body)), frozenset(), None)]
+    if platform != "avito":
+        return runs
+    runs += [
+        (f"stream/{size}", StreamingAvitoParser(ReplayClient(body, size)), frozenset(), None)
+        for size in options.chunk_sizes
+    ]
+    known = frozenset(listing["external_id"] for listing in (read_golden(path) or [])[options.known_from :])
+    if known:
+        stop_at = options.known_from + settings.stream_known_streak
+        runs += [
+            (f"stop/{size}", StreamingAvitoParser(ReplayClient(body, size)), known, stop_at)
+            for size in options.chunk_sizes
+        ]
+    return runs
+
+
+async def run(options) -> int:
+    fixtures = options.fixtures or sorted(path for path in FIXTURES_DIR.iterdir() if path.is_file())
+    repeat = max(1, options.repeat)
+    failures = 0
+    total_pages = 0
+    total_seconds = 0.0
+
+    print(
+        f"{'fixture':28} {'path':12} {'items':>5} {'pages/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'peak KiB':>9} golden"
+    )
+    for path in fixtures:
+        for label, parser, stop_ids, stop_at in fixture_runs(path, options):
+            tracemalloc.start()
+            listings = await parse_fixture(parser, path, stop_ids)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            latencies = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                await parse_fixture(parser, path, stop_ids)
+                latencies.append(time.perf_counter() - started)
+            latencies.sort()
+            total_pages += repeat
+            total_seconds += sum(latencies)
+
+            # Only the buffered run writes the golden; the streamed runs are checked against it.
+            golden = check_golden(path, listings, options.update_goldens and label == "page", stop_at)
+            failures += golden in ("DIFF", "missing")
+            print(
+                f"{path.name[:28]:28} {label:12} {len(listings):>5} {repeat / sum(latencies):>9.1f} "
+                f"{percentile(latencies, 0.5) * 1000:>8.2f} {percentile(latencies, 0.95) * 1000:>8.2f} "
+                f"{percentile(latencies, 0.99) * 1000:>8.2f} {peak / 1024:>9.0f} {golden}"
+            )
+
+    print()
+    for path in fixtures:
+        if path.suffix == ".json":
+            continue
+        paths = await compare_paths(path)
+        failures += paths == "DIFFER"
+        print(f"{path.name[:28]:28} {' = '.join(PAIRED_STRATEGIES[path.name.split('_', 1)[0]]):28} {paths}")
+
+    # ru_maxrss is in KiB on Linux; it also covers C allocations that tracemalloc does not see.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"total: {total_pages / total_seconds:.1f} pages/s, max RSS {max_rss / 1024:.1f} MiB")
+    if failures:
+        print(f"{failures} check(s) failed: output differs from the golden, has none, or JSON and DOM disagree", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arguments.add_argument("fixtures", nargs="*", type=Path, help="defaults to every file in benchmarks/fixtures")
+    arguments.add_argument("--repeat", type=int, default=20, help="timed runs per fixture and path")
+    arguments.add_argument(
+        "--chunk-sizes",
+        type=lambda value: [int(size) for size in value.split(",") if size],
+        default=[256, 4096, 65536],
+        help="comma-separated chunk sizes for the streamed Avito runs",
+    )
+    arguments.add_argument(
+        "--known-from",
+        type=int,
+        default=10,
+        help="position of the first already known listing in the early-stop Avito runs",
+    )
+    arguments.add_argument("--update-goldens", action="store_true", help="write current output as the goldens")
+    return asyncio.run(run(arguments.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,51 +1,79 @@
 import logging
-from datetime import datetime, timedelta, timezone
+import time
+from datetime import datetime, timezone
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import settings
 from messaging.rabbitmq import RabbitMQClient
+from metrics import LISTINGS_NEW, LISTINGS_PARSED, PUBLISH_SECONDS
 from models.Post import FoundListing
 from models.Task import TaskCache
+from parsers.base import ParsedListing
 from parsers.factory import ParserFactory
 from repositories.listings import ListingRepository
+from repositories.task_state import TaskStateBuffer
+from scheduling.adaptive import decide_interval
+from scheduling.jitter import next_due_time
 
 logger = logging.getLogger(__name__)
 
 
 class ParseTaskCommand:
-    def __init__(self, session: AsyncSession, rabbitmq: RabbitMQClient, parser_factory: ParserFactory):
+    def __init__(
+        self,
+        session: AsyncSession,
+        rabbitmq: RabbitMQClient,
+        parser_factory: ParserFactory,
+        task_state: TaskStateBuffer,
+    ):
         self.session = session
         self.rabbitmq = rabbitmq
         self.parser_factory = parser_factory
+        self.task_state = task_state
 
-    async def execute(self, task: TaskCache) -> list[FoundListing]:
-        parser = self.parser_factory.get(task.platform)
+    async def execute(
+        self,
+        task: TaskCache,
+        parsed_listings: list[ParsedListing] | None = None,
+    ) -> list[FoundListing]:
         repository = ListingRepository(self.session)
 
         is_first_run = task.last_run_at is None
 
-        parsed_listings = await parser.parse(task)
+        if parsed_listings is None:
+            parsed_listings = await self.parser_factory.get(task.platform).parse(task)
         new_listings = await repository.save_new(task, parsed_listings)
+        await self.session.commit()
+        LISTINGS_PARSED.labels(task.platform).observe(len(parsed_listings))
+        LISTINGS_NEW.labels(task.platform).observe(len(new_listings))
+
+        decision = decide_interval(task, len(new_listings))
+        task.yield_rate = decision.yield_rate
+        task.effective_interval_minutes = decision.minutes
+        task.interval_reason = decision.reason
 
         now = datetime.now(timezone.utc)
         task.last_run_at = now
-        task.next_run_at = now + timedelta(minutes=task.interval_minutes)
-
-        await self.session.commit()
+        task.next_run_at = next_due_time(task, now)
+        # The lease is released when the buffered state is flushed.
+        self.task_state.record(task)
 
         listings_to_notify = new_listings[:settings.first_run_notify_limit] if is_first_run else new_listings
 
         if listings_to_notify:
+            started = time.perf_counter()
             await self.rabbitmq.publish_listings_batch(self._batch_payload(task, listings_to_notify))
+            PUBLISH_SECONDS.labels(task.platform).observe(time.perf_counter() - started)
 
         logger.info(
-            "Task %s processed: %s parsed, %s new, %s notified%s",
+            "Task %s processed: %s parsed, %s new, %s notified%s%s",
             task.task_id,
             len(parsed_listings),
             len(new_listings),
             len(listings_to_notify),
             f" (first run, capped at {settings.first_run_notify_limit})" if is_first_run else "",
+            f"; next run in {decision.minutes} min: {decision.reason}" if decision.reason else "",
         )
         return new_listings
 
@@ -0,0 +1,69 @@
+"""Compare HTML backends on recorded result pages.
+
+Usage: python compare_backends.py PAGE.html [PAGE.html ...] [--platform avito] [--repeat 5]
+
+The platform is taken from the file name prefix (``avito_*.html``, as saved
+with PARSER_DEBUG_HTML) unless ``--platform`` is given. For every page the
+report shows the best parse time per backend and whether each backend returns
+the same listings as ``html.parser``.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from fetching.client import HttpClient
+from parsers.documents import available_backends
+from parsers.factory import ParserFactory
+
+REFERENCE_BACKEND = "html.parser"
+
+
+def time_backend(parser, html: str, backend: str, repeat: int) -> tuple[float, list]:
+    best = float("inf")
+    listings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        listings = parser._parse_html(html, backend)
+        best = min(best, time.perf_counter() - started)
+    return best, listings
+
+
+def main(argv: list[str] | None = None) -> int:
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arguments.add_argument("pages", nargs="+", type=Path)
+    arguments.add_argument("--platform", help="avito, cian or youla; defaults to the file name prefix")
+    arguments.add_argument("--repeat", type=int, default=5, help="runs per backend, the best one is reported")
+    options = arguments.parse_args(argv)
+
+    factory = ParserFactory(HttpClient())
+    backends = available_backends()
+    mismatches = 0
+
+    print(f"{'page':40} {'items':>5} " + " ".join(f"{backend:>14}" for backend in backends))
+    for path in options.pages:
+        platform = options.platform or path.name.split("_", 1)[0]
+        parser = factory.get(platform)
+        html = path.read_text(encoding="utf-8", errors="replace")
+
+        timings = {}
+        results = {}
+        for backend in backends:
+            timings[backend], results[backend] = time_backend(parser, html, backend, max(1, options.repeat))
+
+        reference = results[REFERENCE_BACKEND]
+        cells = []
+        for backend in backends:
+            same = results[backend] == reference
+            mismatches += not same
+            cells.append(f"{timings[backend] * 1000:>9.1f}ms {'ok' if same else 'DIFF':>4}")
+        print(f"{path.name[:40]:40} {len(reference):>5} " + " ".join(cells))
+
+    if mismatches:
+        print(f"{mismatches} backend result(s) differ from {REFERENCE_BACKEND}", file=sys.stderr)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 import json
 import os
+import socket
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -14,7 +15,22 @@ class Settings:
     task_events_queue: str = os.getenv("PARSER_TASK_EVENTS_QUEUE", "parser.task_events")
     notification_exchange: str = os.getenv("NOTIFICATION_EXCHANGE", "notification.events")
     listing_found_routing_key: str = os.getenv("LISTING_FOUND_ROUTING_KEY", "listing.found")
+    task_health_routing_key: str = os.getenv("TASK_HEALTH_ROUTING_KEY", "task.health")
     scheduler_tick_seconds: int = int(os.getenv("SCHEDULER_TICK_SECONDS", "30"))
+    scheduler_reconcile_seconds: int = int(os.getenv("SCHEDULER_RECONCILE_SECONDS", "300"))
+    scheduler_jitter_seconds: int = int(os.getenv("SCHEDULER_JITTER_SECONDS", "120"))
+    adaptive_decay_alpha: float = float(os.getenv("ADAPTIVE_DECAY_ALPHA", "0.3"))
+    adaptive_hot_rate: float = float(os.getenv("ADAPTIVE_HOT_RATE", "1"))
+    adaptive_cold_rate: float = float(os.getenv("ADAPTIVE_COLD_RATE", "0.1"))
+    adaptive_max_factor: int = int(os.getenv("ADAPTIVE_MAX_FACTOR", "4"))
+    instance_id: str = os.getenv("PARSER_INSTANCE_ID") or f"{socket.gethostname()}-{os.getpid()}"
+    task_lease_seconds: int = int(os.getenv("TASK_LEASE_SECONDS", "300"))
+    task_state_flush_seconds: float = float(os.getenv("TASK_STATE_FLUSH_SECONDS", "2"))
+    task_run_flush_seconds: float = float(os.getenv("TASK_RUN_FLUSH_SECONDS", "30"))
+    task_run_history: int = int(os.getenv("TASK_RUN_HISTORY", "50"))
+    scheduler_mode: str = os.getenv("SCHEDULER_MODE", "shared").lower()
+    leader_lock_key: int = int(os.getenv("SCHEDULER_LEADER_LOCK_KEY", "720100"))
+    leader_check_seconds: float = float(os.getenv("SCHEDULER_LEADER_CHECK_SECONDS", "5"))
     avito_cookie_header: str = os.getenv("AVITO_COOKIES") or os.getenv("AVITO_COOKIE_HEADER", "")
     avito_cookies_json: str = os.getenv("AVITO_COOKIES_JSON", "")
     avito_user_agent: str = os.getenv(
@@ -37,9 +53,51 @@ class Settings:
         "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
     )
     scheduler_batch_size: int = int(os.getenv("SCHEDULER_BATCH_SIZE", "20"))
+    scheduler_workers: int = int(os.getenv("SCHEDULER_WORKERS", "4"))
+    scheduler_platform_workers: str = os.getenv("SCHEDULER_PLATFORM_WORKERS", "")
+    scheduler_queue_size: int = int(os.getenv("SCHEDULER_QUEUE_SIZE", "50"))
     first_run_notify_limit: int = int(os.getenv("FIRST_RUN_NOTIFY_LIMIT", "5"))
     parser_debug_html: bool = os.getenv("PARSER_DEBUG_HTML", "false").lower() == "true"
     parser_debug_dir: str = os.getenv("PARSER_DEBUG_DIR", "debug_html")
+    http_timeout_seconds: int = int(os.getenv("PARSER_HTTP_TIMEOUT_SECONDS", "20"))
+    http_pool_size: int = int(os.getenv("PARSER_HTTP_POOL_SIZE", "100"))
+    http_limit_per_host: int = int(os.getenv("PARSER_HTTP_LIMIT_PER_HOST", "10"))
+    http_dns_cache_seconds: int = int(os.getenv("PARSER_HTTP_DNS_CACHE_SECONDS", "300"))
+    http_keepalive_seconds: int = int(os.getenv("PARSER_HTTP_KEEPALIVE_SECONDS", "60"))
+    page_cache_ttl_seconds: float = float(os.getenv("PAGE_CACHE_TTL_SECONDS", "60"))
+    page_cache_platform_ttl: str = os.getenv("PAGE_CACHE_PLATFORM_TTL", "")
+    page_cache_max_entries: int = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "1000"))
+    crawl_max_pages: int = int(os.getenv("CRAWL_MAX_PAGES", "5"))
+    strategy_decay_alpha: float = float(os.getenv("PARSER_STRATEGY_DECAY_ALPHA", "0.3"))
+    html_backend: str = os.getenv("PARSER_HTML_BACKEND", "auto")
+    # "auto" uses every core; 0 keeps extraction in threads of the scheduler process.
+    parser_process_workers: int = (
+        (os.cpu_count() or 1)
+        if os.getenv("PARSER_PROCESS_WORKERS", "0") == "auto"
+        else int(os.getenv("PARSER_PROCESS_WORKERS", "0"))
+    )
+    parser_process_max_tasks: int = int(os.getenv("PARSER_PROCESS_MAX_TASKS", "500"))
+    parser_stream_html: bool = os.getenv("PARSER_STREAM_HTML", "false").lower() == "true"
+    stream_known_streak: int = int(os.getenv("PARSER_STREAM_KNOWN_STREAK", "3"))
+    stream_max_items: int = int(os.getenv("PARSER_STREAM_MAX_ITEMS", "100"))
+    metrics_host: str = os.getenv("METRICS_HOST", "0.0.0.0")
+    metrics_port: int = int(os.getenv("METRICS_PORT", "9108"))
+    profiler_enabled: bool = os.getenv("PROFILER_ENABLED", "false").lower() == "true"
+    profiler_sample_rate: float = float(os.getenv("PROFILER_SAMPLE_RATE", "0.1"))
+    profiler_interval_ms: float = float(os.getenv("PROFILER_INTERVAL_MS", "10"))
+    profiler_flush_seconds: float = float(os.getenv("PROFILER_FLUSH_SECONDS", "60"))
+    profiler_dir: str = os.getenv("PROFILER_DIR", "profiles")
+    # Empty leaves the /profiler endpoint unregistered; SIGUSR1 still toggles profiling.
+    profiler_token: str = os.getenv("PROFILER_TOKEN", "")
+    rate_limit_per_second: float = float(os.getenv("PARSER_RATE_PER_SECOND", "1"))
+    rate_limit_burst: int = int(os.getenv("PARSER_RATE_BURST", "3"))
+    max_concurrency: int = int(os.getenv("PARSER_MAX_CONCURRENCY", "4"))
+    platform_rate_limits: str = os.getenv("PARSER_PLATFORM_RATE", "")
+    platform_rate_bursts: str = os.getenv("PARSER_PLATFORM_BURST", "")
+    platform_concurrency: str = os.getenv("PARSER_PLATFORM_CONCURRENCY", "")
+    circuit_failure_threshold: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "2"))
+    circuit_cooldown_seconds: float = float(os.getenv("CIRCUIT_COOLDOWN_SECONDS", "120"))
+    circuit_max_cooldown_seconds: float = float(os.getenv("CIRCUIT_MAX_COOLDOWN_SECONDS", "1800"))
 
     @property
     def avito_cookies(self) -> dict[str, str]:
@@ -53,6 +111,34 @@ class Settings:
     def youla_cookies(self) -> dict[str, str]:
         return self._parse_cookies(self.youla_cookie_header, self.youla_cookies_json)
 
+    def page_cache_ttl_for(self, platform: str) -> float:
+        return float(self._platform_value(self.page_cache_platform_ttl, platform, self.page_cache_ttl_seconds))
+
+    def rate_limit_for(self, platform: str) -> float:
+        return float(self._platform_value(self.platform_rate_limits, platform, self.rate_limit_per_second))
+
+    def rate_burst_for(self, platform: str) -> int:
+        return int(self._platform_value(self.platform_rate_bursts, platform, self.rate_limit_burst))
+
+    def concurrency_for(self, platform: str) -> int:
+        return int(self._platform_value(self.platform_concurrency, platform, self.max_concurrency))
+
+    def workers_for(self, platform: str) -> int:
+        return int(self._platform_value(self.scheduler_platform_workers, platform, self.scheduler_workers))
+
+    def _platform_value(self, overrides: str, platform: str, default):
+        return self._parse_platform_values(overrides).get(platform, default)
+
+    def _parse_platform_values(self, value: str) -> dict[str, str]:
+        """Parse per-platform overrides written as ``avito=30,cian=60``."""
+        values = {}
+        for part in value.split(","):
+            if "=" not in part:
+                continue
+            platform, raw = part.split("=", 1)
+            values[platform.strip().lower()] = raw.strip()
+        return values
+
     def _parse_cookies(self, cookie_header: str, cookies_json: str) -> dict[str, str]:
         if cookies_json:
             try:
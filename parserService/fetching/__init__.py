@@ -0,0 +1,15 @@
+from fetching.breaker import CircuitBreaker
+from fetching.client import BlockedError, CircuitOpenError, FetchError, FetchResponse, FetchStream, HttpClient
+from fetching.throttle import PlatformThrottle, TokenBucket
+
+__all__ = [
+    "BlockedError",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "FetchError",
+    "FetchResponse",
+    "FetchStream",
+    "HttpClient",
+    "PlatformThrottle",
+    "TokenBucket",
+]
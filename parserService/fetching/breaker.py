@@ -0,0 +1,132 @@
+import logging
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+BLOCK_STATUSES = {403, 429}
+BLOCK_URL_MARKERS = ("captcha", "blocked", "firewall")
+BLOCK_TITLE_MARKERS = (
+    "captcha",
+    "доступ ограничен",
+    "access denied",
+    "are you a robot",
+    "вы не робот",
+)
+TITLE_RE = re.compile(rb"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+
+def looks_like_block_page(url: str, body: bytes) -> bool:
+    lowered_url = url.lower()
+    if any(marker in lowered_url for marker in BLOCK_URL_MARKERS):
+        return True
+
+    match = TITLE_RE.search(body[:65536])
+    if not match:
+        return False
+    title = match.group(1).decode("utf-8", errors="ignore").lower()
+    return any(marker in title for marker in BLOCK_TITLE_MARKERS)
+
+
+class CircuitBreaker:
+    """Pauses a platform after blocks, then lets a single probe request through before reopening."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, platform: str, failure_threshold: int, cooldown_seconds: float, max_cooldown_seconds: float):
+        self.platform = platform
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max(cooldown_seconds, max_cooldown_seconds)
+        self.state = self.CLOSED
+        self.consecutive_blocks = 0
+        self.cooldown_seconds = cooldown_seconds
+        self.opened_until = 0.0
+        self.trips = 0
+        self.rejected = 0
+        self.last_reason: str | None = None
+        self._probe_in_flight = False
+
+    @property
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_until - time.monotonic())
+
+    def is_open(self) -> bool:
+        """True while the platform is cooling down or waiting for the probe result."""
+        if self.state == self.OPEN:
+            return self.retry_after > 0
+        return self.state == self.HALF_OPEN and self._probe_in_flight
+
+    def accepts_requests(self) -> bool:
+        if self.is_open():
+            self.rejected += 1
+            return False
+        return True
+
+    def before_request(self) -> bool:
+        """Return False when the request has to be rejected; marks the probe as in flight."""
+        if self.state == self.CLOSED:
+            return True
+
+        if self.state == self.OPEN:
+            if self.retry_after > 0:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+            logger.info("Circuit for %s is half-open, sending a probe request", self.platform)
+
+        if self._probe_in_flight:
+            self.rejected += 1
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.warning("Circuit for %s closed after a successful probe", self.platform)
+        self.state = self.CLOSED
+        self.consecutive_blocks = 0
+        self.cooldown_seconds = self.base_cooldown_seconds
+        self._probe_in_flight = False
+
+    def record_block(self, reason: str, retry_after: float | None = None):
+        self.last_reason = reason
+        self._probe_in_flight = False
+
+        if self.state == self.HALF_OPEN:
+            self.cooldown_seconds = min(self.cooldown_seconds * 2, self.max_cooldown_seconds)
+            self._open(retry_after)
+            return
+
+        self.consecutive_blocks += 1
+        if self.state == self.CLOSED and self.consecutive_blocks >= self.failure_threshold:
+            self._open(retry_after)
+
+    def record_error(self):
+        """Errors that are not blocks (timeouts, 5xx) neither trip nor close the circuit."""
+        self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "retry_after_seconds": round(self.retry_after, 1),
+            "consecutive_blocks": self.consecutive_blocks,
+            "cooldown_seconds": self.cooldown_seconds,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "last_reason": self.last_reason,
+        }
+
+    def _open(self, retry_after: float | None):
+        cooldown = max(self.cooldown_seconds, retry_after or 0)
+        self.state = self.OPEN
+        self.opened_until = time.monotonic() + cooldown
+        self.trips += 1
+        logger.warning(
+            "Circuit for %s opened for %.0fs after %s",
+            self.platform,
+            cooldown,
+            self.last_reason,
+        )
@@ -0,0 +1,343 @@
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import AsyncIterator
+
+import aiohttp
+
+from config import settings
+from fetching.breaker import BLOCK_STATUSES, CircuitBreaker, looks_like_block_page
+from fetching.throttle import PlatformThrottle
+from metrics import observe_body, observe_fetch, observe_fetch_error
+
+logger = logging.getLogger(__name__)
+
+
+class FetchError(Exception):
+    def __init__(self, platform: str, url: str, status: int | None, message: str | None = None):
+        self.platform = platform
+        self.url = url
+        self.status = status
+        super().__init__(message or f"{platform} request to {url} failed with status {status}")
+
+
+class BlockedError(FetchError):
+    """The platform answered with 403, 429 or a captcha page."""
+
+
+class CircuitOpenError(FetchError):
+    def __init__(self, platform: str, url: str, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(
+            platform,
+            url,
+            None,
+            f"{platform} is paused after blocks, retry in {retry_after:.0f}s",
+        )
+
+
+@dataclass(frozen=True)
+class FetchResponse:
+    platform: str
+    url: str
+    status: int
+    body: bytes
+    encoding: str = "utf-8"
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @cached_property
+    def text(self) -> str:
+        return self.body.decode(self.encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class FetchStream:
+    """Response body read chunk by chunk; leaving the ``stream`` block early drops the rest of the download.
+
+    The block page check runs once the first ``HEAD_BYTES`` arrived (or the
+    body ended sooner), since a captcha page shows itself in its title.
+    """
+
+    HEAD_BYTES = 65536
+
+    def __init__(self, client: "HttpClient", breaker: CircuitBreaker, response: aiohttp.ClientResponse, platform: str):
+        self.platform = platform
+        self.url = str(response.url)
+        self.status = response.status
+        self.encoding = response.charset or "utf-8"
+        self.bytes_read = 0
+        # Time spent waiting for body chunks, which the caller's processing between reads does not add to.
+        self.read_seconds = 0.0
+        self._client = client
+        self._breaker = breaker
+        self._response = response
+        self._head = bytearray()
+        self._checked = False
+
+    async def iter_chunks(self, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        chunks = self._response.content.iter_chunked(chunk_size)
+        while True:
+            started = time.perf_counter()
+            try:
+                chunk = await anext(chunks)
+            except StopAsyncIteration:
+                break
+            finally:
+                self.read_seconds += time.perf_counter() - started
+            self.bytes_read += len(chunk)
+            if not self._checked:
+                self._head.extend(chunk)
+                if len(self._head) >= self.HEAD_BYTES:
+                    self.check_head()
+            yield chunk
+        self.check_head()
+
+    def check_head(self):
+        if self._checked:
+            return
+        self._checked = True
+        self._client._check_response(
+            self._breaker,
+            FetchResponse(
+                platform=self.platform,
+                url=self.url,
+                status=self.status,
+                body=bytes(self._head),
+                encoding=self.encoding,
+                headers=dict(self._response.headers),
+            ),
+        )
+        self._head.clear()
+
+
+class HttpClient:
+    """Keeps one pooled keep-alive aiohttp session per platform."""
+
+    def __init__(self):
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+        self._throttles: dict[str, PlatformThrottle] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    async def get(
+        self,
+        platform: str,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        cookies: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> FetchResponse:
+        return await self.request("GET", platform, url, headers=headers, cookies=cookies, timeout=timeout)
+
+    async def post_json(
+        self,
+        platform: str,
+        url: str,
+        payload: dict,
+        *,
+        headers: dict[str, str] | None = None,
+        cookies: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> FetchResponse:
+        return await self.request(
+            "POST",
+            platform,
+            url,
+            headers=headers,
+            cookies=cookies,
+            timeout=timeout,
+            payload=payload,
+        )
+
+    async def request(
+        self,
+        method: str,
+        platform: str,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        cookies: dict[str, str] | None = None,
+        timeout: float | None = None,
+        payload: dict | None = None,
+    ) -> FetchResponse:
+        breaker = self.breaker(platform)
+        if not breaker.accepts_requests():
+            raise CircuitOpenError(platform, url, breaker.retry_after)
+
+        session = self._session(platform)
+        request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+        async with self.throttle(platform).slot() as waited:
+            if waited >= 1:
+                logger.debug("%s request to %s waited %.2fs for a rate limit slot", platform, url, waited)
+            if not breaker.before_request():
+                raise CircuitOpenError(platform, url, breaker.retry_after)
+            started = time.perf_counter()
+            try:
+                async with session.request(
+                    method,
+                    url,
+                    headers=headers,
+                    cookies=cookies or None,
+                    json=payload,
+                    timeout=request_timeout,
+                ) as response:
+                    body = await response.read()
+                    fetched = FetchResponse(
+                        platform=platform,
+                        url=str(response.url),
+                        status=response.status,
+                        body=body,
+                        encoding=response.charset or "utf-8",
+                        headers=dict(response.headers),
+                    )
+                observe_fetch(platform, time.perf_counter() - started, response.status, len(body))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                observe_fetch_error(platform)
+                breaker.record_error()
+                raise FetchError(platform, url, None, f"{platform} request to {url} failed: {exc!r}") from exc
+            except BaseException:
+                breaker.record_error()
+                raise
+
+        self._check_response(breaker, fetched)
+        return fetched
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        platform: str,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        cookies: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[FetchStream]:
+        """GET whose body the caller reads incrementally inside the ``async with`` block."""
+        breaker = self.breaker(platform)
+        if not breaker.accepts_requests():
+            raise CircuitOpenError(platform, url, breaker.retry_after)
+
+        session = self._session(platform)
+        request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+        async with self.throttle(platform).slot() as waited:
+            if waited >= 1:
+                logger.debug("%s request to %s waited %.2fs for a rate limit slot", platform, url, waited)
+            if not breaker.before_request():
+                raise CircuitOpenError(platform, url, breaker.retry_after)
+            started = time.perf_counter()
+            try:
+                async with session.get(
+                    url,
+                    headers=headers,
+                    cookies=cookies or None,
+                    timeout=request_timeout,
+                ) as response:
+                    observe_fetch(platform, time.perf_counter() - started, response.status)
+                    stream = FetchStream(self, breaker, response, platform)
+                    if response.status >= 400:
+                        stream.check_head()
+                    try:
+                        yield stream
+                    finally:
+                        observe_body(stream.bytes_read, stream.read_seconds)
+                    stream.check_head()
+            except FetchError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                observe_fetch_error(platform)
+                breaker.record_error()
+                raise FetchError(platform, url, None, f"{platform} request to {url} failed: {exc!r}") from exc
+            except BaseException:
+                breaker.record_error()
+                raise
+
+    def _check_response(self, breaker: CircuitBreaker, response: FetchResponse):
+        reason = None
+        if response.status in BLOCK_STATUSES:
+            reason = f"HTTP {response.status}"
+        elif response.status < 400 and looks_like_block_page(response.url, response.body):
+            reason = "captcha page"
+
+        if reason:
+            breaker.record_block(reason, retry_after=self._retry_after(response))
+            raise BlockedError(
+                response.platform,
+                response.url,
+                response.status,
+                f"{response.platform} blocked request to {response.url}: {reason}",
+            )
+
+        if response.status >= 400:
+            breaker.record_error()
+            raise FetchError(response.platform, response.url, response.status)
+        breaker.record_success()
+
+    def _retry_after(self, response: FetchResponse) -> float | None:
+        value = response.headers.get("Retry-After")
+        if value and value.strip().isdigit():
+            return float(value)
+        return None
+
+    def throttle(self, platform: str) -> PlatformThrottle:
+        throttle = self._throttles.get(platform)
+        if throttle is None:
+            throttle = PlatformThrottle(
+                platform,
+                rate_per_second=settings.rate_limit_for(platform),
+                burst=settings.rate_burst_for(platform),
+                concurrency=settings.concurrency_for(platform),
+            )
+            self._throttles[platform] = throttle
+        return throttle
+
+    def throttle_stats(self) -> dict[str, dict[str, float]]:
+        return {platform: throttle.stats() for platform, throttle in self._throttles.items()}
+
+    def breaker(self, platform: str) -> CircuitBreaker:
+        breaker = self._breakers.get(platform)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                platform,
+                failure_threshold=settings.circuit_failure_threshold,
+                cooldown_seconds=settings.circuit_cooldown_seconds,
+                max_cooldown_seconds=settings.circuit_max_cooldown_seconds,
+            )
+            self._breakers[platform] = breaker
+        return breaker
+
+    def is_paused(self, platform: str) -> bool:
+        breaker = self._breakers.get(platform)
+        return bool(breaker and breaker.is_open())
+
+    def breaker_stats(self) -> dict[str, dict]:
+        return {platform: breaker.snapshot() for platform, breaker in self._breakers.items()}
+
+    async def close(self):
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            await session.close()
+
+    def _session(self, platform: str) -> aiohttp.ClientSession:
+        session = self._sessions.get(platform)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.http_pool_size,
+                limit_per_host=settings.http_limit_per_host,
+                ttl_dns_cache=settings.http_dns_cache_seconds,
+                keepalive_timeout=settings.http_keepalive_seconds,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                cookie_jar=aiohttp.DummyCookieJar(),
+                timeout=aiohttp.ClientTimeout(total=settings.http_timeout_seconds),
+            )
+            self._sessions[platform] = session
+            logger.info("Opened HTTP session pool for %s", platform)
+        return session
@@ -0,0 +1,82 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+
+class TokenBucket:
+    """Token bucket that makes callers queue in FIFO order until a token is available."""
+
+    def __init__(self, rate_per_second: float, capacity: int):
+        self.rate_per_second = rate_per_second
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate_per_second <= 0:
+            return
+
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate_per_second)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+        self._updated_at = now
+
+
+class PlatformThrottle:
+    """Rate limit and concurrency cap shared by every request to one platform."""
+
+    def __init__(self, platform: str, rate_per_second: float, burst: int, concurrency: int):
+        self.platform = platform
+        self.concurrency = max(1, concurrency)
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.in_use = 0
+        self.waiting = 0
+        self.requests = 0
+        self.wait_seconds_total = 0.0
+        self.max_wait_seconds = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        started_at = time.monotonic()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+            try:
+                await self.bucket.acquire()
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - started_at
+        self.requests += 1
+        self.wait_seconds_total += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+        self.in_use += 1
+        try:
+            yield waited
+        finally:
+            self.in_use -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "in_use": self.in_use,
+            "concurrency": self.concurrency,
+            "waiting": self.waiting,
+            "requests": self.requests,
+            "wait_seconds_total": round(self.wait_seconds_total, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+        }
@@ -0,0 +1,264 @@
+"""Drive the scheduler end to end against a local stand-in for the platforms.
+
+Usage: python load_harness.py [--tasks 2000] [--duration 60] [--latency-ms 300] [--error-rate 0.01] [--throttle-rate 0.02]
+
+A local HTTP server replays the pages in ``benchmarks/fixtures`` with the
+given latency, 5xx and 429 rates. Synthetic ``tasks_cache`` rows pointing at
+it are inserted into the configured database (DB_* variables, use a scratch
+one) and ``TaskScheduler`` runs against them with an in-memory publisher
+instead of RabbitMQ. The report shows tasks/sec, schedule lag (actual start
+minus ``next_run_at``), database round trips per task and the stand-in's
+response counts. The synthetic rows and their listings are deleted at the
+end unless ``--keep`` is given.
+
+Platform rate limits default to off here so that the run measures the
+scheduler rather than the politeness settings; set PARSER_RATE_PER_SECOND
+and friends explicitly to include them.
+"""
+
+import os
+
+# Settings reads the environment once on import, so defaults for this run go in first.
+os.environ.setdefault("PARSER_RATE_PER_SECOND", "0")
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import UUID, uuid4
+
+from aiohttp import web
+from sqlalchemy import delete, event
+
+from metrics import RunTrace
+from models.Task import TaskCache
+from models.database import async_session, engine, init_db
+from parsers.base import ParsedListing
+from scheduler import TaskScheduler
+from scheduling.coalescing import PageKey
+from scheduling.timers import DueQueue
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "benchmarks" / "fixtures"
+PLATFORMS = ("avito", "cian", "youla")
+
+
+class PlatformStandIn:
+    """Replays recorded pages for ``/<platform>/<n>`` and the Youla GraphQL feed for ``/graphql``."""
+
+    def __init__(self, latency_ms: float, jitter_ms: float, error_rate: float, throttle_rate: float):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.responses: Counter[int] = Counter()
+        self.base_url = ""
+        self._pages: dict[str, list[bytes]] = {}
+        self._feed = b"{}"
+        self._runner: web.AppRunner | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        app = web.Application()
+        app.router.add_get("/{platform}/{number}", self._page)
+        app.router.add_post("/graphql", self._graphql)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        port = self._runner.addresses[0][1]
+        self.base_url = f"http://{host}:{port}"
+        self._load_fixtures()
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def _load_fixtures(self):
+        for path in sorted(FIXTURES_DIR.glob("*.html")):
+            body = path.read_bytes().replace(b"https://api-gw.youla.ru/graphql", f"{self.base_url}/graphql".encode())
+            self._pages.setdefault(path.name.split("_", 1)[0], []).append(body)
+        feed = FIXTURES_DIR / "youla_graphql_feed.json"
+        if feed.exists():
+            self._feed = feed.read_bytes()
+
+    async def _respond(self, body: bytes, content_type: str) -> web.Response:
+        delay = max(0.0, self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+        roll = random.random()
+        if roll < self.throttle_rate:
+            response = web.Response(status=429, headers={"Retry-After": "5"}, text="Too Many Requests")
+        elif roll < self.throttle_rate + self.error_rate:
+            response = web.Response(status=503, text="Service Unavailable")
+        else:
+            response = web.Response(body=body, content_type=content_type, charset="utf-8")
+        self.responses[response.status] += 1
+        return response
+
+    async def _page(self, request: web.Request) -> web.Response:
+        pages = self._pages.get(request.match_info["platform"])
+        if not pages:
+            raise web.HTTPNotFound()
+        return await self._respond(pages[int(request.match_info["number"]) % len(pages)], "text/html")
+
+    async def _graphql(self, request: web.Request) -> web.Response:
+        await request.read()
+        return await self._respond(self._feed, "application/json")
+
+
+class InMemoryPublisher:
+    """Stands in for RabbitMQClient; keeps counts of what the scheduler would publish."""
+
+    def __init__(self):
+        self.batches = 0
+        self.listings = 0
+        self.health_events = 0
+
+    async def publish_listings_batch(self, payload: dict):
+        self.batches += 1
+        self.listings += len(payload.get("listings") or [])
+
+    async def publish_task_health(self, payload: dict):
+        self.health_events += 1
+
+    async def consume_task_events(self, handler):
+        pass
+
+    async def stop_consuming_task_events(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class MeasuredScheduler(TaskScheduler):
+    """TaskScheduler that records schedule lag and finished runs."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lags: list[float] = []
+        self.completed = 0
+
+    async def run_page(self, key: PageKey, tasks: list[TaskCache]):
+        started = datetime.now(timezone.utc)
+        self.lags.extend((started - task.next_run_at).total_seconds() for task in tasks)
+        await super().run_page(key, tasks)
+
+    async def run_task(self, task: TaskCache, parsed_listings: list[ParsedListing], run: RunTrace):
+        previous_run = task.last_run_at
+        await super().run_task(task, parsed_listings, run)
+        if task.last_run_at is not None and task.last_run_at != previous_run:
+            self.completed += 1
+
+
+async def insert_tasks(base_url: str, count: int, interval_minutes: int, spread_seconds: float) -> list[UUID]:
+    now = datetime.now(timezone.utc)
+    user_id = uuid4()
+    rows = [
+        TaskCache(
+            task_id=uuid4(),
+            user_id=user_id,
+            platform=PLATFORMS[number % len(PLATFORMS)],
+            url=f"{base_url}/{PLATFORMS[number % len(PLATFORMS)]}/{number}",
+            name=f"load-harness {number}",
+            interval_minutes=interval_minutes,
+            is_active=True,
+            next_run_at=now + timedelta(seconds=spread_seconds * number / max(1, count)),
+        )
+        for number in range(count)
+    ]
+    async with async_session() as session:
+        session.add_all(rows)
+        await session.commit()
+    return [row.task_id for row in rows]
+
+
+async def delete_tasks(task_ids: list[UUID]):
+    async with async_session() as session:
+        # found_listings rows go with their task through ON DELETE CASCADE.
+        for start in range(0, len(task_ids), 1000):
+            await session.execute(delete(TaskCache).where(TaskCache.task_id.in_(task_ids[start : start + 1000])))
+        await session.commit()
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run(options: argparse.Namespace) -> int:
+    stand_in = PlatformStandIn(options.latency_ms, options.jitter_ms, options.error_rate, options.throttle_rate)
+    await stand_in.start()
+    await init_db()
+
+    round_trips = 0
+
+    def count_round_trip(*_):
+        nonlocal round_trips
+        round_trips += 1
+
+    publisher = InMemoryPublisher()
+    scheduler = MeasuredScheduler(publisher, DueQueue())
+    task_ids = await insert_tasks(stand_in.base_url, options.tasks, options.interval, options.spread)
+    print(f"Inserted {len(task_ids)} tasks against {stand_in.base_url}, running for {options.duration}s")
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_round_trip)
+    started = time.monotonic()
+    running = asyncio.create_task(scheduler.run())
+    try:
+        await asyncio.wait({running}, timeout=options.duration)
+    finally:
+        running.cancel()
+        await asyncio.gather(running, return_exceptions=True)
+        elapsed = time.monotonic() - started
+        event.remove(engine.sync_engine, "before_cursor_execute", count_round_trip)
+        await scheduler.parser_factory.close()
+        await stand_in.close()
+        if not options.keep:
+            await delete_tasks(task_ids)
+        await engine.dispose()
+
+    lags = sorted(scheduler.lags)
+    completed = scheduler.completed
+    print(f"tasks completed:      {completed} ({completed / elapsed:.1f} tasks/s over {elapsed:.1f}s)")
+    print(
+        f"schedule lag, s:      p50 {percentile(lags, 0.5):.2f}  p95 {percentile(lags, 0.95):.2f}  "
+        f"p99 {percentile(lags, 0.99):.2f}  max {lags[-1] if lags else 0:.2f}"
+    )
+    print(f"db round trips:       {round_trips} ({round_trips / max(1, completed):.2f} per task)")
+    print(f"stand-in responses:   {dict(sorted(stand_in.responses.items()))}")
+    print(
+        f"published:            {publisher.batches} batches, {publisher.listings} listings, "
+        f"{publisher.health_events} health events"
+    )
+    print(f"page cache:           {scheduler.page_cache.stats()}")
+    print(f"task state writes:    {scheduler.task_state.stats()}")
+    print(f"circuit breakers:     {scheduler.parser_factory.http.breaker_stats()}")
+    return 0 if completed else 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arguments.add_argument("--tasks", type=int, default=2000, help="synthetic tasks to insert")
+    arguments.add_argument("--duration", type=float, default=60, help="seconds to run the scheduler")
+    arguments.add_argument("--interval", type=int, default=1, help="interval_minutes of the synthetic tasks")
+    arguments.add_argument("--spread", type=float, default=10, help="seconds over which first runs fall due")
+    arguments.add_argument("--latency-ms", type=float, default=300, help="mean stand-in response time")
+    arguments.add_argument("--jitter-ms", type=float, default=100, help="uniform spread around the mean")
+    arguments.add_argument("--error-rate", type=float, default=0.01, help="share of 503 responses")
+    arguments.add_argument("--throttle-rate", type=float, default=0.02, help="share of 429 responses")
+    arguments.add_argument("--keep", action="store_true", help="leave the synthetic tasks and listings in place")
+    arguments.add_argument("--verbose", action="store_true", help="keep the scheduler's INFO logging")
+    options = arguments.parse_args(argv)
+
+    if not options.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+    return asyncio.run(run(options))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,8 @@ class RabbitMQClient:
         self.connection = None
         self.channel = None
         self.notification_exchange = None
+        self._task_events_queue = None
+        self._task_events_consumer_tag = None
 
     async def connect(self):
         self.connection = await aio_pika.connect_robust(settings.rabbitmq_url)
@@ -33,6 +35,12 @@ class RabbitMQClient:
             await self.connection.close()
 
     async def publish_listings_batch(self, payload: dict):
+        await self._publish(payload, settings.listing_found_routing_key)
+
+    async def publish_task_health(self, payload: dict):
+        await self._publish(payload, settings.task_health_routing_key)
+
+    async def _publish(self, payload: dict, routing_key: str):
         if not self.notification_exchange:
             raise RuntimeError("RabbitMQClient is not connected")
 
@@ -41,7 +49,7 @@ class RabbitMQClient:
             content_type="application/json",
             delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
         )
-        await self.notification_exchange.publish(message, routing_key=settings.listing_found_routing_key)
+        await self.notification_exchange.publish(message, routing_key=routing_key)
 
     async def consume_task_events(self, handler: Callable[[dict], Awaitable[None]]):
         if not self.channel:
@@ -66,5 +74,13 @@ class RabbitMQClient:
 
             await message.ack()
 
-        await queue.consume(on_message)
+        self._task_events_queue = queue
+        self._task_events_consumer_tag = await queue.consume(on_message)
         logger.info("Consuming task events from queue %s", settings.task_events_queue)
+
+    async def stop_consuming_task_events(self):
+        if not self._task_events_queue or not self._task_events_consumer_tag:
+            return
+        await self._task_events_queue.cancel(self._task_events_consumer_tag)
+        self._task_events_consumer_tag = None
+        logger.info("Stopped consuming task events from queue %s", settings.task_events_queue)
@@ -0,0 +1,158 @@
+import hmac
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from aiohttp import web
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+from profiling import SamplingProfiler
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+LISTING_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+LAG_BUCKETS = (0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+
+FETCH_SECONDS = Histogram(
+    "parser_fetch_seconds",
+    "Time from sending a platform request to having its body; headers only for streamed pages.",
+    ["platform"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_RESPONSES = Counter(
+    "parser_http_responses_total",
+    "Platform responses by status code; 'error' for connection failures and timeouts.",
+    ["platform", "status"],
+)
+PARSE_SECONDS = Histogram(
+    "parser_parse_seconds",
+    "Time spent in one extraction strategy on one page.",
+    ["platform", "strategy"],
+    buckets=LATENCY_BUCKETS,
+)
+LISTINGS_PARSED = Histogram(
+    "parser_run_listings_parsed",
+    "Listings parsed per task run.",
+    ["platform"],
+    buckets=LISTING_BUCKETS,
+)
+LISTINGS_NEW = Histogram(
+    "parser_run_listings_new",
+    "New listings saved per task run.",
+    ["platform"],
+    buckets=LISTING_BUCKETS,
+)
+SCHEDULE_LAG = Histogram(
+    "parser_schedule_lag_seconds",
+    "Delay between a task falling due and its page starting to run.",
+    ["platform"],
+    buckets=LAG_BUCKETS,
+)
+IN_FLIGHT_TASKS = Gauge("parser_in_flight_tasks", "Tasks whose page is being fetched, parsed or saved.", ["platform"])
+DUE_QUEUE_TASKS = Gauge("parser_due_queue_tasks", "Tasks waiting in the in-memory due queue.")
+DB_POOL_CONNECTIONS = Gauge("parser_db_pool_connections", "Database pool connections by state.", ["state"])
+PUBLISH_SECONDS = Histogram(
+    "parser_publish_seconds",
+    "Time to publish a listings batch to RabbitMQ.",
+    ["platform"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+@dataclass
+class RunTrace:
+    """Fetch and parse totals of one page run, filled in through ``current_run``."""
+
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    fetch_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    requests: int = 0
+    bytes_read: int = 0
+    http_status: int | None = None
+
+
+# Set by the scheduler around a page run; fetches and strategies in that context add to it.
+current_run: ContextVar[RunTrace | None] = ContextVar("current_run", default=None)
+
+
+def observe_fetch(platform: str, seconds: float, status: int, bytes_read: int = 0):
+    FETCH_SECONDS.labels(platform).observe(seconds)
+    HTTP_RESPONSES.labels(platform, str(status)).inc()
+    run = current_run.get()
+    if run is not None:
+        run.fetch_seconds += seconds
+        run.requests += 1
+        run.bytes_read += bytes_read
+        run.http_status = status
+
+
+def observe_fetch_error(platform: str):
+    HTTP_RESPONSES.labels(platform, "error").inc()
+
+
+def observe_body(bytes_read: int, seconds: float):
+    """Add a streamed body read after the headers were observed to the current run's fetch totals."""
+    run = current_run.get()
+    if run is not None:
+        run.bytes_read += bytes_read
+        run.fetch_seconds += seconds
+
+
+def observe_parse(platform: str, strategy: str, seconds: float):
+    PARSE_SECONDS.labels(platform, strategy).observe(seconds)
+    run = current_run.get()
+    if run is not None:
+        run.parse_seconds += seconds
+
+
+def watch_db_pool(pool):
+    """Read the pool counters at scrape time instead of tracking every checkout."""
+    DB_POOL_CONNECTIONS.labels("checked_out").set_function(pool.checkedout)
+    DB_POOL_CONNECTIONS.labels("idle").set_function(pool.checkedin)
+    DB_POOL_CONNECTIONS.labels("overflow").set_function(lambda: max(0, pool.overflow()))
+    DB_POOL_CONNECTIONS.labels("size").set_function(pool.size)
+
+
+async def start_metrics_server(
+    host: str,
+    port: int,
+    profiler: SamplingProfiler | None = None,
+    profiler_token: str = "",
+) -> web.AppRunner:
+    """Serve ``/metrics`` in the Prometheus text format from the running event loop.
+
+    With a profiler and a token, ``/profiler`` also reports its state (GET),
+    enables it with an optional ``?rate=`` (POST) and disables it (DELETE) for
+    requests carrying ``Authorization: Bearer <token>``.
+    """
+
+    async def handle(_: web.Request) -> web.Response:
+        response = web.Response(body=generate_latest())
+        response.headers["Content-Type"] = CONTENT_TYPE_LATEST
+        return response
+
+    async def handle_profiler(request: web.Request) -> web.Response:
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {profiler_token}"):
+            raise web.HTTPUnauthorized()
+        if request.method == "POST":
+            try:
+                rate = float(request.query["rate"]) if "rate" in request.query else None
+            except ValueError:
+                raise web.HTTPBadRequest(text="rate must be a number between 0 and 1")
+            profiler.enable(rate)
+        elif request.method == "DELETE":
+            profiler.disable()
+        return web.json_response(profiler.stats())
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    if profiler is not None and profiler_token:
+        for method in ("GET", "POST", "DELETE"):
+            app.router.add_route(method, "/profiler", handle_profiler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info("Serving metrics on http://%s:%s/metrics", host, port)
+    return runner
@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from sqlalchemy import BigInteger, CheckConstraint, Column, DateTime, ForeignKey, String, Text, UniqueConstraint
+from sqlalchemy import BigInteger, CheckConstraint, Column, DateTime, ForeignKey, Index, String, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -28,6 +28,7 @@ class FoundListing(Base):
     __table_args__ = (
         UniqueConstraint("task_id", "platform", "external_id", name="uix_found_listing_task_platform_external"),
         CheckConstraint("platform IN ('avito', 'cian', 'youla')", name="ck_found_listings_platform"),
+        Index("idx_found_listings_task_created", "task_id", created_at.desc()),
     )
 
 
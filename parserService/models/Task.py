@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
-from sqlalchemy import Boolean, CheckConstraint, Column, DateTime, Integer, String, Text
+from sqlalchemy import Boolean, CheckConstraint, Column, DateTime, Float, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -25,6 +25,15 @@ class TaskCache(Base):
         default=lambda: datetime.now(timezone.utc) + timedelta(minutes=1),
     )
     last_run_at = Column(DateTime(timezone=True))
+    adaptive_interval = Column(Boolean, nullable=False, default=False)
+    min_interval_minutes = Column(Integer)
+    max_interval_minutes = Column(Integer)
+    effective_interval_minutes = Column(Integer)
+    yield_rate = Column(Float)
+    interval_reason = Column(String(200))
+    max_pages = Column(Integer)
+    lease_owner = Column(String(100))
+    lease_expires_at = Column(DateTime(timezone=True))
 
     listings = relationship(
         "FoundListing",
@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from models.database import Base
+
+
+class TaskRun(Base):
+    """One scheduler run of a task; only the newest ``TASK_RUN_HISTORY`` rows per task are kept."""
+
+    __tablename__ = "task_runs"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks_cache.task_id", ondelete="CASCADE"), nullable=False)
+    platform = Column(String(30), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    fetch_ms = Column(Integer, nullable=False, default=0)
+    parse_ms = Column(Integer, nullable=False, default=0)
+    requests = Column(Integer, nullable=False, default=0)
+    page_kib = Column(Integer, nullable=False, default=0)
+    parsed_count = Column(Integer, nullable=False, default=0)
+    new_count = Column(Integer, nullable=False, default=0)
+    http_status = Column(Integer)
+    error_class = Column(String(100))
+
+    __table_args__ = (Index("idx_task_runs_task_started", "task_id", started_at.desc()),)
@@ -1,6 +1,7 @@
 import os
 
 from dotenv import load_dotenv
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
@@ -34,13 +35,31 @@ async_session = sessionmaker(
 Base = declarative_base()
 
 
+# Columns added after the first release; create_all does not alter existing tables.
+SCHEMA_UPGRADES = (
+    "ALTER TABLE tasks_cache ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(100)",
+    "ALTER TABLE tasks_cache ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ",
+    "ALTER TABLE tasks_cache ADD COLUMN IF NOT EXISTS adaptive_interval BOOLEAN NOT NULL DEFAULT FALSE",
+    "ALTER TABLE tasks_cache ADD COLUMN IF NOT EXISTS min_interval_minutes INTEGER",
+    "ALTER TABLE tasks_cache ADD COLUMN IF NOT EXISTS max_interval_minutes INTEGER",
+    "ALTER TABLE tasks_cache ADD COLUMN IF NOT EXISTS effective_interval_minutes INTEGER",
+    "ALTER TABLE tasks_cache ADD COLUMN IF NOT EXISTS yield_rate DOUBLE PRECISION",
+    "ALTER TABLE tasks_cache ADD COLUMN IF NOT EXISTS interval_reason VARCHAR(200)",
+    "ALTER TABLE tasks_cache ADD COLUMN IF NOT EXISTS max_pages INTEGER",
+    "CREATE INDEX IF NOT EXISTS idx_found_listings_task_created ON found_listings (task_id, created_at DESC)",
+)
+
+
 async def init_db():
     """Create parser service tables declared by imported ORM models."""
     from models.Post import FoundListing  # noqa: F401
     from models.Task import TaskCache  # noqa: F401
+    from models.TaskRun import TaskRun  # noqa: F401
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        for statement in SCHEMA_UPGRADES:
+            await conn.execute(text(statement))
 
 
 async def get_db():
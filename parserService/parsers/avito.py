@@ -1,44 +1,178 @@
-import asyncio
-import json
+import codecs
 import logging
 import re
+import time
 from urllib.parse import urljoin, urlsplit, urlunsplit
 
-import requests
-from bs4 import BeautifulSoup
-
 from config import settings
+from fetching.client import HttpClient
 from models.Task import TaskCache
-from parsers.base import BaseParser, ParsedListing
+from parsers.avito_stream import AvitoItemExtractor
+from parsers.base import BaseParser, ParsedListing, ParsedPage, page_url
+from parsers.documents import HtmlNode, PageSource, parse_document
+from parsers.embedded import loads, script_content, walk_dicts
+from parsers.executor import ParseExecutor
+from parsers.strategies import StrategyRanker
+from profiling import to_thread
 
 logger = logging.getLogger(__name__)
 
 
 class AvitoParser(BaseParser):
     platform = "avito"
+    extractors = {"next_data": ("_parse_next_data", "body"), "items": ("_parse_items", "document")}
+    STREAM_FEED_BYTES = 65536
 
-    def __init__(self, timeout_seconds: int = 20):
+    def __init__(
+        self,
+        http: HttpClient,
+        timeout_seconds: int = 20,
+        strategies: StrategyRanker | None = None,
+        executor: ParseExecutor | None = None,
+    ):
+        self.http = http
         self.timeout_seconds = timeout_seconds
+        self.strategies = strategies or StrategyRanker()
+        self.executor = executor
+
+    @property
+    def streaming(self) -> bool:
+        return settings.parser_stream_html
 
-    async def parse(self, task: TaskCache) -> list[ParsedListing]:
-        return await asyncio.to_thread(self._parse_sync, task.url)
+    @property
+    def strategy_names(self) -> list[str]:
+        # Streamed item cards can stop mid-page; otherwise the embedded JSON is cheaper than a DOM.
+        return ["items", "next_data"] if self.streaming else ["next_data", "items"]
 
-    def _parse_sync(self, url: str) -> list[ParsedListing]:
-        response = requests.get(
+    async def parse_page(
+        self,
+        task: TaskCache,
+        page: int,
+        cursor: object | None,
+        stop_ids: frozenset[str] = frozenset(),
+    ) -> ParsedPage:
+        url = page_url(task.url, page)
+        # Item cards are what the stream reads; skip it for layouts where another strategy has been winning.
+        if self.streaming and self.strategies.order(self.platform, url, self.strategy_names)[0] == "items":
+            return await self._stream_page(url, page, stop_ids)
+
+        response = await self.http.get(
+            self.platform,
             url,
             headers=self._headers(),
             cookies=settings.avito_cookies,
             timeout=self.timeout_seconds,
         )
-        response.raise_for_status()
+        listings = await self._extract(url, PageSource(response.body, response.encoding))
+
+        logger.info("Parsed %s Avito listings from %s", len(listings), url)
+        return ParsedPage(listings, next_cursor=page + 1 if listings else None)
+
+    async def _stream_page(self, url: str, page: int, stop_ids: frozenset[str]) -> ParsedPage:
+        """Parse item cards while the page downloads and stop at a run of known listings or the item cap.
+
+        Promoted cards can repeat old listings at the top of a date-sorted search,
+        so reading stops only after ``stream_known_streak`` known cards in a row.
+        Pages without item cards are parsed in full from the buffered body.
+        """
+        extractor = AvitoItemExtractor()
+        listings: list[ParsedListing] = []
+        seen: set[str] = set()
+        buffered: list[bytes] = []
+        known_streak = 0
+        stop_reason = None
+        # Only time spent extracting counts as parsing; waiting for the body is the site's share.
+        parse_seconds = 0.0
+
+        def timed_feed(text: str) -> float:
+            started = time.perf_counter()
+            extractor.feed(text)
+            return time.perf_counter() - started
+
+        async def feed(text: str) -> str | None:
+            nonlocal known_streak, parse_seconds
+            parse_seconds += await to_thread(timed_feed, text)
+            for item in extractor.pop_items():
+                listing = self._listing_from_item(item)
+                if listing is None or listing.external_id in seen:
+                    continue
+                seen.add(listing.external_id)
+                listings.append(listing)
+                known_streak = known_streak + 1 if listing.external_id in stop_ids else 0
+                if known_streak >= settings.stream_known_streak:
+                    return "known listings"
+                if settings.stream_max_items and len(listings) >= settings.stream_max_items:
+                    return "item cap"
+            return None
+
+        async with self.http.stream(
+            self.platform,
+            url,
+            headers=self._headers(),
+            cookies=settings.avito_cookies,
+            timeout=self.timeout_seconds,
+        ) as stream:
+            decoder = codecs.getincrementaldecoder(stream.encoding)(errors="replace")
+            # Network reads are often much smaller than a chunk; batch them so each thread hop parses a useful amount.
+            pending: list[str] = []
+            pending_bytes = 0
+            async for chunk in stream.iter_chunks():
+                if not listings:
+                    buffered.append(chunk)
+                pending.append(decoder.decode(chunk))
+                pending_bytes += len(chunk)
+                if pending_bytes < self.STREAM_FEED_BYTES:
+                    continue
+                stop_reason = await feed("".join(pending))
+                pending, pending_bytes = [], 0
+                if stop_reason:
+                    break
+                if listings:
+                    buffered.clear()
+            else:
+                stop_reason = await feed("".join(pending) + decoder.decode(b"", final=True))
+            bytes_read = stream.bytes_read
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        listings = self._parse_items(soup)
+        self.strategies.record(self.platform, url, "items", bool(listings), parse_seconds)
         if not listings:
-            listings = self._parse_next_data(soup)
+            listings = await self._extract(url, PageSource(b"".join(buffered), stream.encoding), skip={"items"})
+            logger.info("Parsed %s Avito listings from %s", len(listings), url)
+            return ParsedPage(listings, next_cursor=page + 1 if listings else None)
 
-        logger.info("Parsed %s Avito listings from %s", len(listings), url)
-        return listings
+        logger.info(
+            "Parsed %s Avito listings from %s, read %s KiB%s",
+            len(listings),
+            url,
+            bytes_read // 1024,
+            f", stopped early at {stop_reason}" if stop_reason else "",
+        )
+        return ParsedPage(
+            listings,
+            next_cursor=None if stop_reason else page + 1,
+            partial=stop_reason == "known listings",
+        )
+
+    def _listing_from_item(self, item: dict) -> ParsedListing | None:
+        absolute_url = self._normalize_url(item["href"])
+        external_id = self._extract_external_id(item, absolute_url)
+        if not external_id or not absolute_url:
+            return None
+        return ParsedListing(
+            platform=self.platform,
+            external_id=external_id,
+            title=item["title"] or item["name"],
+            price=self._parse_price(item["price"] if item["price"] is not None else item["price_text"]),
+            url=absolute_url,
+            image_url=item["image_url"],
+        )
+
+    async def _extract(self, url: str, source: PageSource, skip: set[str] = frozenset()) -> list[ParsedListing]:
+        """Run extraction strategies in the order that has worked for this kind of URL."""
+        names = [name for name in self.strategy_names if name not in skip]
+        return (await self._extract_local(url, source, names)).listings
+
+    def _parse_html(self, html: str, backend: str | None = None) -> list[ParsedListing]:
+        return self._parse_items(parse_document(html, backend))
 
     def _headers(self) -> dict[str, str]:
         return {
@@ -51,7 +185,7 @@ class AvitoParser(BaseParser):
             "user-agent": settings.avito_user_agent,
         }
 
-    def _parse_items(self, soup: BeautifulSoup) -> list[ParsedListing]:
+    def _parse_items(self, soup: HtmlNode) -> list[ParsedListing]:
         listings = []
         for item in soup.select("[data-marker='item']"):
             link = item.select_one("[data-marker='item-title']")
@@ -79,23 +213,26 @@ class AvitoParser(BaseParser):
 
         return self._deduplicate(listings)
 
-    def _parse_next_data(self, soup: BeautifulSoup) -> list[ParsedListing]:
-        script = soup.select_one("script#__NEXT_DATA__")
-        if not script or not script.string:
+    def _parse_next_data(self, body: bytes, encoding: str) -> list[ParsedListing]:
+        script = script_content(body, b"__NEXT_DATA__")
+        if not script:
             return []
 
         try:
-            data = json.loads(script.string)
-        except json.JSONDecodeError:
+            data = loads(script, encoding)
+        except ValueError:
             return []
 
         listings = []
-        for item in self._walk_dicts(data):
-            url = item.get("url") or item.get("uri") or item.get("href")
-            absolute_url = self._normalize_url(url)
-            external_id = str(item.get("id") or item.get("itemId") or self._id_from_url(absolute_url) or "")
+        for item in walk_dicts(data):
+            # Categories, breadcrumbs and locations also carry an id, url and name; an item URL ends in its ID.
+            absolute_url = self._normalize_url(item.get("url") or item.get("uri") or item.get("href"))
+            external_id = self._id_from_url(absolute_url)
             title = item.get("title") or item.get("name")
-            if not external_id or not absolute_url or not title:
+            if not external_id or not title:
+                continue
+            item_id = item.get("id") or item.get("itemId")
+            if item_id is not None and str(item_id) != external_id:
                 continue
 
             price = item.get("price") or item.get("priceValue")
@@ -157,15 +294,6 @@ class AvitoParser(BaseParser):
         text = node.get_text(" ", strip=True)
         return text or None
 
-    def _walk_dicts(self, value):
-        if isinstance(value, dict):
-            yield value
-            for child in value.values():
-                yield from self._walk_dicts(child)
-        elif isinstance(value, list):
-            for child in value:
-                yield from self._walk_dicts(child)
-
     def _deduplicate(self, listings: list[ParsedListing]) -> list[ParsedListing]:
         seen = set()
         unique = []
@@ -0,0 +1,87 @@
+from html.parser import HTMLParser
+
+VOID_ELEMENTS = frozenset("area base br col embed hr img input link meta param source track wbr".split())
+
+
+class AvitoItemExtractor(HTMLParser):
+    """Incremental extractor of ``[data-marker='item']`` cards fed with chunks of an Avito results page.
+
+    Every finished card becomes a dict with the same pieces the BeautifulSoup
+    path reads: ``data-item-id``/``id`` markers, title link, price and image.
+    Text is joined the way ``get_text(" ")`` does: a text node split across
+    chunks is glued back together and separate nodes get a space between them.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._item: dict | None = None
+        self._depth = 0
+        self._capture: str | None = None
+        self._capture_depth = 0
+        self._finished: list[dict] = []
+
+    def pop_items(self) -> list[dict]:
+        items, self._finished = self._finished, []
+        return items
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]):
+        attributes = dict(attrs)
+        if self._item is None:
+            if attributes.get("data-marker") == "item" and tag not in VOID_ELEMENTS:
+                self._item = {
+                    "data-item-id": attributes.get("data-item-id"),
+                    "id": attributes.get("id"),
+                    "href": None,
+                    "title": [],
+                    "name": [],
+                    "price": None,
+                    "price_text": [],
+                    "image_url": None,
+                }
+                self._depth = 1
+            return
+
+        if tag not in VOID_ELEMENTS:
+            self._depth += 1
+
+        item = self._item
+        self._separate()
+        if attributes.get("data-marker") == "item-title" and item["href"] is None:
+            item["href"] = attributes.get("href")
+            self._start_capture("title", tag)
+        elif attributes.get("itemprop") == "name" and not item["name"]:
+            self._start_capture("name", tag)
+        elif attributes.get("itemprop") == "price" and item["price"] is None:
+            item["price"] = attributes.get("content")
+            if item["price"] is None:
+                self._start_capture("price_text", tag)
+        if tag == "img" and item["image_url"] is None:
+            item["image_url"] = attributes.get("src")
+
+    def handle_endtag(self, tag: str):
+        if self._item is None or tag in VOID_ELEMENTS:
+            return
+        self._separate()
+        if self._capture and self._depth == self._capture_depth:
+            self._capture = None
+        self._depth -= 1
+        if self._depth == 0:
+            item, self._item = self._item, None
+            for key in ("title", "name", "price_text"):
+                item[key] = " ".join("".join(item[key]).split()) or None
+            self._finished.append(item)
+
+    def handle_data(self, data: str):
+        if self._item is not None and self._capture:
+            self._item[self._capture].append(data)
+
+    def _separate(self):
+        # HTMLParser may hand one text node over in several calls; only tags end a node.
+        if self._capture:
+            self._item[self._capture].append(" ")
+
+    def _start_capture(self, field: str, tag: str):
+        if tag in VOID_ELEMENTS or self._capture:
+            return
+        self._capture = field
+        self._capture_depth = self._depth
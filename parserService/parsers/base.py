@@ -1,8 +1,18 @@
+import logging
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Awaitable, Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from models.Task import TaskCache
+from parsers.documents import PageSource
+from profiling import to_thread
+
+logger = logging.getLogger(__name__)
+
+KnownIdsLookup = Callable[[list[str]], Awaitable[set[str]]]
 
 
 @dataclass(frozen=True)
@@ -16,9 +26,149 @@ class ParsedListing:
     published_at: datetime | None = None
 
 
+@dataclass(frozen=True)
+class ParsedPage:
+    listings: list[ParsedListing]
+    # Opaque continuation passed to the next parse_page call; None when there is no next page.
+    next_cursor: object | None = None
+    # Reading stopped mid-page at listings from ``stop_ids``.
+    partial: bool = False
+
+
+@dataclass(frozen=True)
+class PageExtraction:
+    """Outcome of the local strategies tried over one page in a single thread hop or worker job."""
+
+    strategy: str | None
+    listings: list[ParsedListing]
+    # (strategy, found listings, seconds) for every strategy tried, in order.
+    attempts: list[tuple[str, bool, float]]
+    # What ``_page_context`` read from the page, as trimmed by ``_returned_context``.
+    context: object = None
+
+
+@dataclass(frozen=True)
+class CrawlResult:
+    listings: list[ParsedListing]
+    # Crawling stopped at listings the requesting tasks already store, so other tasks cannot reuse it.
+    partial: bool = False
+
+
 class BaseParser(ABC):
     platform: str
 
+    # Streaming parsers can stop reading a page at listings from ``stop_ids``.
+    streaming = False
+    # ParseExecutor for extraction in worker processes; None keeps it in threads.
+    executor = None
+    # Network-free extraction strategies in declared order: the method and what it reads, which is
+    # "body" (raw bytes and encoding), "document" (the parsed DOM) or "context" (see ``_page_context``).
+    # Methods are looked up by name so that a worker process can run them.
+    extractors: dict[str, tuple[str, str]] = {}
+
     @abstractmethod
-    async def parse(self, task: TaskCache) -> list[ParsedListing]:
-        """Return listings from the platform page for the given task."""
+    async def parse_page(
+        self,
+        task: TaskCache,
+        page: int,
+        cursor: object | None,
+        stop_ids: frozenset[str] = frozenset(),
+    ) -> ParsedPage:
+        """Return listings from one results page; ``page`` starts at 1."""
+
+    async def parse(
+        self,
+        task: TaskCache,
+        max_pages: int = 1,
+        known_ids: KnownIdsLookup | None = None,
+        stop_ids: frozenset[str] = frozenset(),
+    ) -> list[ParsedListing]:
+        """Return listings from up to ``max_pages`` results pages for the given task."""
+        return (await self.crawl(task, max_pages, known_ids, stop_ids)).listings
+
+    async def crawl(
+        self,
+        task: TaskCache,
+        max_pages: int = 1,
+        known_ids: KnownIdsLookup | None = None,
+        stop_ids: frozenset[str] = frozenset(),
+    ) -> CrawlResult:
+        """Crawl up to ``max_pages`` results pages for the given task.
+
+        Crawling stops early on an empty page, on the last page, or on a page
+        whose listings ``known_ids`` reports as already stored. ``stop_ids`` are
+        the most recently stored IDs, used by streaming parsers to stop mid-page.
+        The result is ``partial`` when it stopped because of what the requesting
+        tasks already know.
+        """
+        listings: list[ParsedListing] = []
+        seen: set[str] = set()
+        cursor = None
+        for page in range(1, max(1, max_pages) + 1):
+            parsed = await self.parse_page(task, page, cursor, stop_ids)
+            fresh = [listing for listing in parsed.listings if listing.external_id not in seen]
+            seen.update(listing.external_id for listing in fresh)
+            listings.extend(fresh)
+            if parsed.partial:
+                return CrawlResult(listings, partial=True)
+
+            if page == max_pages or not fresh or parsed.next_cursor is None:
+                break
+            ids = [listing.external_id for listing in fresh]
+            if known_ids is not None and len(await known_ids(ids)) == len(ids):
+                logger.info("Stopped %s crawl of %s at page %s: only known listings", self.platform, task.url, page)
+                return CrawlResult(listings, partial=True)
+            cursor = parsed.next_cursor
+        return CrawlResult(listings)
+
+    async def _extract_local(self, url: str, source: PageSource, names: list[str]) -> PageExtraction:
+        """Run the named local strategies in ranked order over one page and record every attempt.
+
+        All of them run in one worker job when there is a process executor and
+        in one thread hop otherwise, so the page is decoded and its DOM built at
+        most once.
+        """
+        order = self.strategies.order(self.platform, url, names)
+        if self.executor is not None and self.executor.uses_processes:
+            extraction = await self.executor.extract(self.platform, order, source.body, source.encoding)
+        else:
+            extraction = await to_thread(self.extract_page, order, source)
+        for name, success, seconds in extraction.attempts:
+            self.strategies.record(self.platform, url, name, success, seconds)
+        return extraction
+
+    def extract_page(self, names: list[str], source: PageSource) -> PageExtraction:
+        """Try the named strategies over the page in order and stop at the first one that finds listings."""
+        context = self._page_context(source)
+        inputs = {
+            "body": lambda: (source.body, source.encoding),
+            "document": lambda: (source.document,),
+            "context": lambda: (context,),
+        }
+        attempts = []
+        for name in names:
+            method, reads = self.extractors[name]
+            started = time.perf_counter()
+            listings = getattr(self, method)(*inputs[reads]())
+            attempts.append((name, bool(listings), time.perf_counter() - started))
+            if listings:
+                return PageExtraction(name, listings, attempts, self._returned_context(context))
+        return PageExtraction(None, [], attempts, self._returned_context(context))
+
+    def _page_context(self, source: PageSource) -> object:
+        """Data read once per page for the "context" strategies and for the caller; none by default."""
+        return None
+
+    def _returned_context(self, context: object) -> object:
+        """The part of the page context that the caller needs back."""
+        return context
+
+
+def page_url(url: str, page: int, param: str = "p") -> str:
+    """Search URL for results page ``page``; the first page keeps the task URL as is."""
+    if page <= 1:
+        return url
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != param]
+    query.append((param, str(page)))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), parts.fragment))
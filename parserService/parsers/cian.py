@@ -1,42 +1,103 @@
-import asyncio
 import logging
 import re
 from urllib.parse import urljoin, urlsplit, urlunsplit
 
-import requests
-from bs4 import BeautifulSoup
-
 from config import settings
+from fetching.client import HttpClient
 from models.Task import TaskCache
-from parsers.base import BaseParser, ParsedListing
+from parsers.base import BaseParser, ParsedListing, ParsedPage, page_url
+from parsers.documents import HtmlNode, PageSource, parse_document
+from parsers.embedded import values_after
+from parsers.executor import ParseExecutor
+from parsers.strategies import StrategyRanker
 
 logger = logging.getLogger(__name__)
 
 
 class CianParser(BaseParser):
     platform = "cian"
-
-    def __init__(self, timeout_seconds: int = 20):
+    extractors = {
+        "offers_state": ("_parse_offers_state", "body"),
+        "offer_cards": ("_parse_offer_cards", "document"),
+        "script_links": ("_parse_embedded_json", "document"),
+    }
+
+    def __init__(
+        self,
+        http: HttpClient,
+        timeout_seconds: int = 20,
+        strategies: StrategyRanker | None = None,
+        executor: ParseExecutor | None = None,
+    ):
+        self.http = http
         self.timeout_seconds = timeout_seconds
-
-    async def parse(self, task: TaskCache) -> list[ParsedListing]:
-        return await asyncio.to_thread(self._parse_sync, task.url)
-
-    def _parse_sync(self, url: str) -> list[ParsedListing]:
-        response = requests.get(
+        self.strategies = strategies or StrategyRanker()
+        self.executor = executor
+
+    async def parse_page(
+        self,
+        task: TaskCache,
+        page: int,
+        cursor: object | None,
+        stop_ids: frozenset[str] = frozenset(),
+    ) -> ParsedPage:
+        url = page_url(task.url, page)
+        response = await self.http.get(
+            self.platform,
             url,
             headers=self._headers(),
             cookies=settings.cian_cookies,
             timeout=self.timeout_seconds,
         )
-        response.raise_for_status()
+        listings = await self._extract(url, PageSource(response.body, response.encoding))
+
+        logger.info("Parsed %s Cian listings from %s", len(listings), url)
+        return ParsedPage(listings, next_cursor=page + 1 if listings else None)
+
+    async def _extract(self, url: str, source: PageSource) -> list[ParsedListing]:
+        """Run extraction strategies in the order that has worked for this kind of URL.
+
+        The declared order puts the embedded ``"offers"`` JSON first, since it needs no DOM.
+        """
+        return (await self._extract_local(url, source, list(self.extractors))).listings
 
-        soup = BeautifulSoup(response.text, "html.parser")
+    def _parse_offers_state(self, body: bytes, encoding: str) -> list[ParsedListing]:
+        for offers in values_after(body, b'"offers":', encoding):
+            if not isinstance(offers, list):
+                continue
+            listings = [
+                listing
+                for listing in (self._listing_from_offer(offer) for offer in offers if isinstance(offer, dict))
+                if listing
+            ]
+            if listings:
+                return self._deduplicate(listings)
+        return []
+
+    def _listing_from_offer(self, offer: dict) -> ParsedListing | None:
+        absolute_url = self._normalize_url(offer.get("fullUrl"))
+        external_id = self._id_from_url(absolute_url)
+        if not external_id or not absolute_url:
+            return None
+
+        terms = offer.get("bargainTerms") or {}
+        price = terms.get("priceRur") or terms.get("price")
+        photos = offer.get("photos") or []
+        first_photo = photos[0] if photos and isinstance(photos[0], dict) else {}
+        return ParsedListing(
+            platform=self.platform,
+            external_id=external_id,
+            title=offer.get("title") or None,
+            price=self._parse_price(str(price)) if price is not None else None,
+            url=absolute_url,
+            image_url=first_photo.get("fullUrl") or first_photo.get("thumbnailUrl"),
+        )
+
+    def _parse_html(self, html: str, backend: str | None = None) -> list[ParsedListing]:
+        soup = parse_document(html, backend)
         listings = self._parse_offer_cards(soup)
         if not listings:
             listings = self._parse_embedded_json(soup)
-
-        logger.info("Parsed %s Cian listings from %s", len(listings), url)
         return listings
 
     def _headers(self) -> dict[str, str]:
@@ -50,7 +111,7 @@ class CianParser(BaseParser):
             "user-agent": settings.cian_user_agent,
         }
 
-    def _parse_offer_cards(self, soup: BeautifulSoup) -> list[ParsedListing]:
+    def _parse_offer_cards(self, soup: HtmlNode) -> list[ParsedListing]:
         listings = []
         for card in soup.select("[data-testid='offer-card']"):
             link = card.select_one("[data-name='TitleComponent']") or card.select_one("a[href*='.cian.ru/']")
@@ -77,7 +138,7 @@ class CianParser(BaseParser):
 
         return self._deduplicate(listings)
 
-    def _parse_embedded_json(self, soup: BeautifulSoup) -> list[ParsedListing]:
+    def _parse_embedded_json(self, soup: HtmlNode) -> list[ParsedListing]:
         listings = []
         for script in soup.select("script"):
             text = script.string or script.get_text()
@@ -0,0 +1,112 @@
+import logging
+from functools import cached_property, lru_cache
+
+from bs4 import BeautifulSoup
+
+from config import settings
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+except ImportError:
+    HAS_LXML = False
+else:
+    HAS_LXML = True
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+
+class SelectolaxNode:
+    """The part of the BeautifulSoup node API the parsers use, on top of a selectolax (lexbor) node."""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        self._node = node
+
+    def select(self, selector: str) -> list["SelectolaxNode"]:
+        return [SelectolaxNode(node) for node in self._node.css(selector)]
+
+    def select_one(self, selector: str) -> "SelectolaxNode | None":
+        node = self._node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    def get(self, attribute: str, default=None):
+        value = self._node.attributes.get(attribute, default)
+        # Valueless attributes come back as None; BeautifulSoup reports them as "".
+        return "" if value is None and attribute in self._node.attributes else value
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        texts = (node.text_content or "" for node in self._node.traverse(include_text=True) if node.tag == "-text")
+        if strip:
+            return separator.join(text.strip() for text in texts if text.strip())
+        return separator.join(texts)
+
+    @property
+    def string(self) -> str | None:
+        return self._node.text(deep=True) or None
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __str__(self) -> str:
+        return self._node.html or ""
+
+
+HtmlNode = BeautifulSoup | SelectolaxNode
+
+
+def available_backends() -> list[str]:
+    backends = []
+    if LexborHTMLParser is not None:
+        backends.append("selectolax")
+    if HAS_LXML:
+        backends.append("lxml")
+    backends.append("html.parser")
+    return backends
+
+
+@lru_cache(maxsize=None)
+def resolve_backend(name: str | None = None) -> str:
+    """Pick the configured backend, or the fastest installed one for ``auto``."""
+    name = (name or settings.html_backend).lower()
+    available = available_backends()
+    if name == "auto":
+        return available[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML backend '{name}'. Supported: auto, {', '.join(BACKENDS)}")
+    if name not in available:
+        logger.warning("HTML backend %s is not installed, using %s", name, available[0])
+        return available[0]
+    return name
+
+
+def parse_document(html: str, backend: str | None = None) -> HtmlNode:
+    """Parse a page into a node that answers ``select``/``select_one``/``get``/``get_text`` like BeautifulSoup."""
+    backend = resolve_backend(backend)
+    if backend == "selectolax":
+        return SelectolaxNode(LexborHTMLParser(html).root)
+    return BeautifulSoup(html, backend)
+
+
+class PageSource:
+    """Response body whose decoded text and DOM are built on first use and shared by extraction strategies."""
+
+    def __init__(self, body: bytes, encoding: str, backend: str | None = None):
+        self.body = body
+        self.encoding = encoding
+        self.backend = backend
+
+    @cached_property
+    def text(self) -> str:
+        return self.body.decode(self.encoding, errors="replace")
+
+    @cached_property
+    def document(self) -> HtmlNode:
+        return parse_document(self.text, self.backend)
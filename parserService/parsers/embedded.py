@@ -0,0 +1,72 @@
+import codecs
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_decoder = json.JSONDecoder()
+
+
+def loads(data: bytes | str, encoding: str = "utf-8"):
+    """Decode JSON with orjson when it is installed; raises ValueError on bad input either way."""
+    if isinstance(data, bytes) and codecs.lookup(encoding).name != "utf-8":
+        data = data.decode(encoding, errors="replace")
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def script_content(body: bytes, marker: bytes) -> bytes | None:
+    """Content of the ``<script>`` whose opening tag contains ``marker``, found without building a DOM."""
+    position = body.find(marker)
+    while position != -1:
+        tag_start = body.rfind(b"<script", 0, position)
+        tag_end = body.find(b">", position)
+        if tag_start != -1 and tag_end != -1 and body.find(b">", tag_start, position) == -1:
+            content_end = body.find(b"</script", tag_end)
+            return body[tag_end + 1 : content_end if content_end != -1 else None]
+        position = body.find(marker, position + len(marker))
+    return None
+
+
+def text_between(body: bytes, start: bytes, end: bytes) -> bytes | None:
+    start_at = body.find(start)
+    if start_at == -1:
+        return None
+    start_at += len(start)
+    end_at = body.find(end, start_at)
+    if end_at == -1:
+        return None
+    return body[start_at:end_at]
+
+
+def values_after(body: bytes, marker: bytes, encoding: str = "utf-8"):
+    """Yield every JSON value that directly follows ``marker`` inside an inline script.
+
+    The end of the value is not known up front, so the rest of the script is
+    handed to the stdlib decoder's ``raw_decode``, which stops where the value ends.
+    """
+    position = body.find(marker)
+    while position != -1:
+        start = position + len(marker)
+        script_end = body.find(b"</script", start)
+        text = body[start : script_end if script_end != -1 else None].decode(encoding, errors="replace")
+        try:
+            value, _ = _decoder.raw_decode(text.lstrip())
+        except ValueError:
+            pass
+        else:
+            yield value
+        position = body.find(marker, start)
+
+
+def walk_dicts(value):
+    if isinstance(value, dict):
+        yield value
+        for child in value.values():
+            yield from walk_dicts(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from walk_dicts(child)
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from config import settings
+from parsers.base import PageExtraction, ParsedListing
+from parsers.documents import PageSource
+
+logger = logging.getLogger(__name__)
+
+# Parsers built once per worker process; they only run sync extraction, so they get no HTTP client.
+_worker_parsers: dict = {}
+
+
+def _worker_parser(platform: str):
+    parser = _worker_parsers.get(platform)
+    if parser is None:
+        from parsers.avito import AvitoParser
+        from parsers.cian import CianParser
+        from parsers.youla import YoulaParser
+
+        classes = {cls.platform: cls for cls in (AvitoParser, CianParser, YoulaParser)}
+        parser = _worker_parsers[platform] = classes[platform](None)
+    return parser
+
+
+def extract_in_worker(platform: str, names: list[str], body: bytes, encoding: str) -> tuple:
+    """Run ``parser.extract_page`` over a raw page inside a worker process.
+
+    Listings go back as plain tuples, which pickle smaller and faster than dataclasses.
+    """
+    extraction = _worker_parser(platform).extract_page(names, PageSource(body, encoding))
+    rows = [
+        (
+            listing.platform,
+            listing.external_id,
+            listing.title,
+            listing.price,
+            listing.url,
+            listing.image_url,
+            listing.published_at,
+        )
+        for listing in extraction.listings
+    ]
+    return extraction.strategy, rows, extraction.attempts, extraction.context
+
+
+class ParseExecutor:
+    """Runs CPU-bound page extraction in a pool of worker processes.
+
+    Fetching stays on the event loop; only the raw body crosses the process
+    boundary, once per page, and the worker tries the strategies in the order
+    given. Workers are replaced after ``max_tasks_per_worker`` pages so a
+    leaking parser cannot grow forever, and a crashed pool is rebuilt and the
+    page retried once. With zero workers nothing is started and parsers keep
+    extracting in threads.
+    """
+
+    def __init__(self, workers: int | None = None, max_tasks_per_worker: int | None = None):
+        self.workers = workers if workers is not None else settings.parser_process_workers
+        self.max_tasks_per_worker = (
+            max_tasks_per_worker if max_tasks_per_worker is not None else settings.parser_process_max_tasks
+        )
+        self._pool: ProcessPoolExecutor | None = None
+        self._submitted = 0
+        self._restarts = 0
+
+    @property
+    def uses_processes(self) -> bool:
+        return self.workers > 0
+
+    async def extract(self, platform: str, names: list[str], body: bytes, encoding: str) -> PageExtraction:
+        try:
+            strategy, rows, attempts, context = await self._submit(platform, names, body, encoding)
+        except BrokenProcessPool:
+            logger.warning("Parse worker pool broke while extracting a %s page, restarting it", platform)
+            strategy, rows, attempts, context = await self._submit(platform, names, body, encoding)
+        return PageExtraction(strategy, [ParsedListing(*row) for row in rows], attempts, context)
+
+    async def _submit(self, platform: str, names: list[str], body: bytes, encoding: str) -> tuple:
+        pool = self._ensure_pool()
+        self._submitted += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                pool, extract_in_worker, platform, names, body, encoding
+            )
+        except BrokenProcessPool:
+            self._discard(pool)
+            raise
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                # Spawned workers do not inherit the event loop's threads and sockets.
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=self.max_tasks_per_worker or None,
+            )
+            logger.info("Started %s parse worker processes", self.workers)
+        return self._pool
+
+    def _discard(self, pool: ProcessPoolExecutor):
+        if self._pool is pool:
+            self._pool = None
+            self._restarts += 1
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict[str, int]:
+        return {"workers": self.workers, "submitted": self._submitted, "restarts": self._restarts}
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
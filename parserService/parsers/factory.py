@@ -1,15 +1,23 @@
+import asyncio
+
+from fetching.client import HttpClient
 from parsers.avito import AvitoParser
 from parsers.base import BaseParser
 from parsers.cian import CianParser
+from parsers.executor import ParseExecutor
+from parsers.strategies import StrategyRanker
 from parsers.youla import YoulaParser
 
 
 class ParserFactory:
-    def __init__(self):
+    def __init__(self, http: HttpClient | None = None):
+        self.http = http or HttpClient()
+        self.strategies = StrategyRanker()
+        self.executor = ParseExecutor()
         self._parsers: dict[str, BaseParser] = {
-            AvitoParser.platform: AvitoParser(),
-            CianParser.platform: CianParser(),
-            YoulaParser.platform: YoulaParser(),
+            AvitoParser.platform: AvitoParser(self.http, strategies=self.strategies, executor=self.executor),
+            CianParser.platform: CianParser(self.http, strategies=self.strategies, executor=self.executor),
+            YoulaParser.platform: YoulaParser(self.http, strategies=self.strategies, executor=self.executor),
         }
 
     @property
@@ -22,3 +30,7 @@ class ParserFactory:
         except KeyError as exc:
             supported = ", ".join(sorted(self._parsers))
             raise ValueError(f"Unsupported platform '{platform}'. Supported: {supported}") from exc
+
+    async def close(self):
+        await self.http.close()
+        await asyncio.to_thread(self.executor.close)
@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from urllib.parse import parse_qsl, urlsplit
+
+from config import settings
+from metrics import observe_parse
+from parsers.base import ParsedListing
+
+Strategy = Callable[[], Awaitable[list[ParsedListing]]]
+
+
+def url_pattern(url: str) -> str:
+    """Shape of a search URL: host, path depth and query parameter names.
+
+    Pages of the same shape are usually served with the same layout, so a
+    strategy that worked for one of them is the best first guess for the rest.
+    """
+    parts = urlsplit(url)
+    depth = len([segment for segment in parts.path.split("/") if segment])
+    keys = sorted({key for key, _ in parse_qsl(parts.query) if key != "p"})
+    return f"{parts.netloc.lower()}/{depth}?{','.join(keys)}"
+
+
+class StrategyRanker:
+    """Orders extraction strategies by a decayed success score per platform and URL pattern.
+
+    Strategies are tried in that order until one returns listings; the ones
+    that came back empty lose score, the one that worked gains it. Ties keep
+    the order declared by the parser. Only strategies that read the fetched
+    page should be ranked: the ranker never tries the rest once one wins, so a
+    strategy that makes its own request would be paid on every later page.
+    """
+
+    def __init__(self, decay_alpha: float | None = None, max_patterns: int = 512):
+        self.decay_alpha = decay_alpha if decay_alpha is not None else settings.strategy_decay_alpha
+        self.max_patterns = max_patterns
+        self._scores: OrderedDict[tuple[str, str], dict[str, float]] = OrderedDict()
+        self._metrics: dict[tuple[str, str], dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def order(self, platform: str, url: str, names: list[str]) -> list[str]:
+        with self._lock:
+            scores = self._scores.get((platform, url_pattern(url)), {})
+        return sorted(names, key=lambda name: -scores.get(name, 0.5))
+
+    def record(self, platform: str, url: str, name: str, success: bool, seconds: float):
+        observe_parse(platform, name, seconds)
+        key = (platform, url_pattern(url))
+        with self._lock:
+            scores = self._scores.setdefault(key, {})
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.max_patterns:
+                self._scores.popitem(last=False)
+            previous = scores.get(name, 0.5)
+            scores[name] = (1 - self.decay_alpha) * previous + self.decay_alpha * float(success)
+
+            metrics = self._metrics.setdefault((platform, name), {"attempts": 0, "successes": 0, "seconds": 0.0})
+            metrics["attempts"] += 1
+            metrics["successes"] += int(success)
+            metrics["seconds"] += seconds
+
+    async def run(self, platform: str, url: str, strategies: dict[str, Strategy]) -> tuple[str | None, list[ParsedListing]]:
+        """Try strategies best first; return the name of the one that found listings and its result."""
+        for name in self.order(platform, url, list(strategies)):
+            started = time.perf_counter()
+            try:
+                listings = await strategies[name]()
+            except Exception:
+                self.record(platform, url, name, False, time.perf_counter() - started)
+                raise
+            self.record(platform, url, name, bool(listings), time.perf_counter() - started)
+            if listings:
+                return name, listings
+        return None, []
+
+    def stats(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Success rate and mean time per strategy, grouped by platform."""
+        with self._lock:
+            snapshot = {key: dict(metrics) for key, metrics in self._metrics.items()}
+        stats: dict[str, dict[str, dict[str, float]]] = {}
+        for (platform, name), metrics in sorted(snapshot.items()):
+            attempts = metrics["attempts"] or 1
+            stats.setdefault(platform, {})[name] = {
+                "attempts": metrics["attempts"],
+                "success_rate": round(metrics["successes"] / attempts, 3),
+                "mean_ms": round(metrics["seconds"] * 1000 / attempts, 2),
+            }
+        return stats
@@ -1,135 +1,237 @@
 import asyncio
-import json
 import logging
 import re
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from urllib.parse import parse_qs, urljoin, urlsplit, urlunsplit
 
-import requests
-from bs4 import BeautifulSoup
-
 from config import settings
+from fetching.client import FetchError, FetchResponse, HttpClient
 from models.Task import TaskCache
-from parsers.base import BaseParser, ParsedListing
+from parsers.base import BaseParser, ParsedListing, ParsedPage
+from parsers.documents import HtmlNode, PageSource, parse_document
+from parsers.embedded import loads, text_between, walk_dicts
+from parsers.executor import ParseExecutor
+from parsers.strategies import StrategyRanker
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class FeedCursor:
+    """Position in the GraphQL feed; ``after`` is None while only the HTML first page was read."""
+
+    state: dict
+    after: str | None
+
+
 class YoulaParser(BaseParser):
     platform = "youla"
+    # The embedded state is declared ahead of the DOM.
+    extractors = {
+        "state": ("_parse_state", "context"),
+        "product_cards": ("_parse_product_cards", "document"),
+        "embedded_links": ("_parse_embedded_links", "document"),
+    }
 
-    def __init__(self, timeout_seconds: int = 20):
+    def __init__(
+        self,
+        http: HttpClient,
+        timeout_seconds: int = 20,
+        strategies: StrategyRanker | None = None,
+        executor: ParseExecutor | None = None,
+    ):
+        self.http = http
         self.timeout_seconds = timeout_seconds
-
-    async def parse(self, task: TaskCache) -> list[ParsedListing]:
-        return await asyncio.to_thread(self._parse_sync, task.url)
-
-    def _parse_sync(self, url: str) -> list[ParsedListing]:
-        response = requests.get(
+        self.strategies = strategies or StrategyRanker()
+        self.executor = executor
+
+    async def parse_page(
+        self,
+        task: TaskCache,
+        page: int,
+        cursor: object | None,
+        stop_ids: frozenset[str] = frozenset(),
+    ) -> ParsedPage:
+        url = task.url
+        if page > 1 and isinstance(cursor, FeedCursor):
+            return await self._parse_feed_page(url, cursor)
+
+        response = await self.http.get(
+            self.platform,
             url,
             headers=self._headers(url),
             cookies=settings.youla_cookies,
             timeout=self.timeout_seconds,
         )
-        response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        state = self._extract_state(response.text)
-        listings = self._parse_product_cards(soup)
+        extraction = await self._extract_local(url, PageSource(response.body, response.encoding), list(self.extractors))
+        listings = extraction.listings
+        state = extraction.context
+        next_cursor = FeedCursor(state, None) if listings and state else None
         if not listings:
-            listings = self._parse_embedded_links(soup)
-        if not listings:
-            listings = self._parse_graphql_feed(url, state)
+            feed_after = None
+
+            async def parse_feed() -> list[ParsedListing]:
+                nonlocal feed_after
+                listings, feed_after = await self._parse_graphql_feed(url, state, "")
+                return listings
+
+            # The feed costs a request, so it is only tried after every strategy that reads the page.
+            _, listings = await self.strategies.run(self.platform, url, {"graphql_feed": parse_feed})
+            next_cursor = FeedCursor(state, feed_after) if feed_after else None
         if not listings:
-            self._log_empty_response(url, response, soup)
+            await asyncio.to_thread(self._log_empty_response, url, response)
 
         logger.info("Parsed %s Youla listings from %s", len(listings), url)
+        return ParsedPage(listings, next_cursor)
+
+    async def _parse_feed_page(self, url: str, cursor: FeedCursor) -> ParsedPage:
+        after = cursor.after
+        if after is None:
+            # The first page came from HTML, which has no feed cursor; read the feed's first page to get one.
+            _, after = await self._parse_graphql_feed(url, cursor.state, "")
+            if after is None:
+                return ParsedPage([])
+
+        listings, next_after = await self._parse_graphql_feed(url, cursor.state, after)
+        logger.info("Parsed %s Youla listings from the %s feed after cursor %s", len(listings), url, after)
+        return ParsedPage(listings, FeedCursor(cursor.state, next_after) if listings and next_after else None)
+
+    def _parse_html(self, html: str, backend: str | None = None) -> list[ParsedListing]:
+        soup = parse_document(html, backend)
+        listings = self._parse_product_cards(soup)
+        if not listings:
+            listings = self._parse_embedded_links(soup)
         return listings
 
-    def _extract_state(self, html: str) -> dict | None:
-        match = re.search(r"window\.__YOULA_STATE__\s*=\s*(\{.*?\});\s*window\.__YOULA_TEST__", html, re.S)
-        if not match:
+    def _extract_state(self, body: bytes, encoding: str) -> dict | None:
+        raw = text_between(body, b"window.__YOULA_STATE__", b"window.__YOULA_TEST__")
+        if raw is None:
             return None
 
+        raw = raw.strip().removeprefix(b"=").strip().removesuffix(b";")
         try:
-            return json.loads(match.group(1))
-        except json.JSONDecodeError:
+            state = loads(raw, encoding)
+        except ValueError:
             logger.warning("Failed to decode __YOULA_STATE__ from Youla page")
             return None
+        return state if isinstance(state, dict) else None
+
+    def _page_context(self, source: PageSource) -> dict | None:
+        return self._extract_state(source.body, source.encoding)
+
+    def _returned_context(self, state: dict | None) -> dict | None:
+        """Keep only what the GraphQL feed request reads, so a worker does not send the whole state back."""
+        if not state:
+            return None
+        data = state.get("data") or {}
+        return {
+            "auth": state.get("auth") or {},
+            "data": {"routeParams": data.get("routeParams") or {}, "cities": data.get("cities") or []},
+            "entities": {"cities": (state.get("entities") or {}).get("cities") or []},
+        }
 
-    def _parse_graphql_feed(self, url: str, state: dict | None) -> list[ParsedListing]:
+    def _parse_state(self, state: dict | None) -> list[ParsedListing]:
         if not state:
             return []
+        listings = []
+        for product in walk_dicts(state):
+            if "name" not in product or not self._id_from_url(product.get("url")):
+                continue
+            listing = self._listing_from_product(product)
+            if listing:
+                listings.append(listing)
+        return self._deduplicate(listings)
+
+    async def _parse_graphql_feed(
+        self,
+        url: str,
+        state: dict | None,
+        cursor: str,
+    ) -> tuple[list[ParsedListing], str | None]:
+        """Return one page of the GraphQL feed and the cursor of the next page, if any."""
+        if not state:
+            return [], None
 
         endpoint = (((state.get("auth") or {}).get("apiFederationUri")) or "").replace("\\/", "/")
         if not endpoint:
             endpoint = "https://api-gw.youla.ru/graphql"
 
-        payload = self._graphql_payload(url, state)
+        payload = self._graphql_payload(url, state, cursor)
         headers = self._graphql_headers(url, state)
 
         try:
-            response = requests.post(
+            response = await self.http.post_json(
+                self.platform,
                 endpoint,
-                json=payload,
+                payload,
                 headers=headers,
                 cookies=settings.youla_cookies,
                 timeout=self.timeout_seconds,
             )
-            response.raise_for_status()
             data = response.json()
-        except (requests.RequestException, ValueError) as exc:
+        except (FetchError, ValueError) as exc:
             logger.warning("Youla GraphQL fallback failed for %s: %s", url, exc)
-            return []
+            return [], None
 
         if data.get("errors"):
             logger.warning("Youla GraphQL returned errors for %s: %s", url, data["errors"])
-            return []
-
-        items = (((data.get("data") or {}).get("feed") or {}).get("items")) or []
+            return [], None
+        return self._parse_feed_response(data)
+
+    def _parse_feed_response(self, data: dict) -> tuple[list[ParsedListing], str | None]:
+        feed = (data.get("data") or {}).get("feed") or {}
+        items = feed.get("items") or []
+        page_info = feed.get("pageInfo") or {}
+        next_cursor = page_info.get("endCursor") if page_info.get("hasNextPage") else None
         listings = []
         for item in items:
             product = item.get("product") if isinstance(item, dict) else None
             if not isinstance(product, dict):
                 continue
 
-            absolute_url = self._normalize_url(product.get("url"))
-            external_id = str(product.get("id") or self._id_from_url(absolute_url) or "")
-            title = product.get("name")
-            if not absolute_url or not external_id or not title:
-                continue
+            listing = self._listing_from_product(product)
+            if listing:
+                listings.append(listing)
 
-            image_url = None
-            images = product.get("images")
-            if isinstance(images, list) and images:
-                first = images[0]
-                if isinstance(first, dict):
-                    image_url = first.get("url")
-
-            price = None
-            price_info = product.get("price")
-            if isinstance(price_info, dict):
-                real_price = price_info.get("realPrice")
-                orig_price = price_info.get("origPrice")
-                if isinstance(real_price, dict):
-                    price = self._parse_price(real_price.get("price"))
-                if price is None and isinstance(orig_price, dict):
-                    price = self._parse_price(orig_price.get("price"))
-                if price is None:
-                    price = self._parse_price(price_info.get("realPriceText"))
+        return self._deduplicate(listings), next_cursor
 
-            listings.append(
-                ParsedListing(
-                    platform=self.platform,
-                    external_id=external_id,
-                    title=str(title),
-                    price=price,
-                    url=absolute_url,
-                    image_url=image_url,
-                )
-            )
+    def _listing_from_product(self, product: dict) -> ParsedListing | None:
+        """Listing from a product object shaped like the GraphQL ProductCardFragment."""
+        absolute_url = self._normalize_url(product.get("url"))
+        external_id = str(product.get("id") or self._id_from_url(absolute_url) or "")
+        title = product.get("name")
+        if not absolute_url or not external_id or not title:
+            return None
 
-        return self._deduplicate(listings)
+        image_url = None
+        images = product.get("images")
+        if isinstance(images, list) and images:
+            first = images[0]
+            if isinstance(first, dict):
+                image_url = first.get("url")
+
+        price = None
+        price_info = product.get("price")
+        if isinstance(price_info, dict):
+            real_price = price_info.get("realPrice")
+            orig_price = price_info.get("origPrice")
+            if isinstance(real_price, dict):
+                price = self._parse_price(real_price.get("price"))
+            if price is None and isinstance(orig_price, dict):
+                price = self._parse_price(orig_price.get("price"))
+            if price is None:
+                price = self._parse_price(price_info.get("realPriceText"))
+
+        return ParsedListing(
+            platform=self.platform,
+            external_id=external_id,
+            title=str(title),
+            price=price,
+            url=absolute_url,
+            image_url=image_url,
+        )
 
     def _graphql_headers(self, url: str, state: dict) -> dict[str, str]:
         auth = state.get("auth") or {}
@@ -154,7 +256,7 @@ class YoulaParser(BaseParser):
             headers["authorization"] = str(token)
         return headers
 
-    def _graphql_payload(self, url: str, state: dict) -> dict:
+    def _graphql_payload(self, url: str, state: dict, cursor: str = "") -> dict:
         parsed = urlsplit(url)
         params = parse_qs(parsed.query)
         city_id = self._city_id_from_state(url, state)
@@ -186,7 +288,7 @@ class YoulaParser(BaseParser):
                     "distanceMax": None,
                 },
                 "search": search,
-                "cursor": "",
+                "cursor": cursor,
             },
             "query": """
 query catalogProductsBoard($sort: Sort, $attributes: [AttributeItem!], $location: LocationInput, $cursor: Cursor!, $search: String, $datePublished: DateInput) {
@@ -203,6 +305,10 @@ query catalogProductsBoard($sort: Sort, $attributes: [AttributeItem!], $location
         }
       }
     }
+    pageInfo {
+      hasNextPage
+      endCursor
+    }
   }
 }
 
@@ -302,7 +408,7 @@ fragment ProductCardFragment on Product {
             "user-agent": settings.youla_user_agent,
         }
 
-    def _parse_product_cards(self, soup: BeautifulSoup) -> list[ParsedListing]:
+    def _parse_product_cards(self, soup: HtmlNode) -> list[ParsedListing]:
         listings = []
         for card in soup.select("[data-test-component='ProductOrAdCard']"):
             figure = card.select_one("[data-test-component='ProductCard']")
@@ -332,7 +438,7 @@ fragment ProductCardFragment on Product {
 
         return self._deduplicate(listings)
 
-    def _parse_embedded_links(self, soup: BeautifulSoup) -> list[ParsedListing]:
+    def _parse_embedded_links(self, soup: HtmlNode) -> list[ParsedListing]:
         listings = []
         html = str(soup)
         for raw_url in re.findall(r"(?:https://youla\.ru)?/[a-z0-9_-]+(?:/[a-z0-9_-]+)+-[0-9a-f]{20,32}", html):
@@ -383,12 +489,13 @@ fragment ProductCardFragment on Product {
             return None
         return node.get("src") or node.get("href") or node.get("xlink:href")
 
-    def _log_empty_response(self, url: str, response: requests.Response, soup: BeautifulSoup):
+    def _log_empty_response(self, url: str, response: FetchResponse):
         html = response.text
         lowered = html.lower()
+        soup = parse_document(html)
         title = self._text(soup.select_one("title"))
         diagnostics = {
-            "status_code": response.status_code,
+            "status_code": response.status,
             "final_url": response.url,
             "html_length": len(html),
             "title": title,
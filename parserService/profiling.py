@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Innermost frames from these files mean the thread is parked, not doing work.
+IDLE_FILES = ("threading.py", "selectors.py", "queue.py", "concurrent/futures/thread.py")
+
+# Set inside ``SamplingProfiler.sampled``; threads started through ``to_thread`` from there register with it.
+_sampling: ContextVar["SamplingProfiler | None"] = ContextVar("sampling", default=None)
+
+
+class SamplingProfiler:
+    """Samples Python stacks during a random fraction of page runs.
+
+    When enabled, a daemon thread reads ``sys._current_frames()`` every
+    ``interval_ms`` while at least one sampled run is fetching or extracting.
+    It counts a thread's stack only if the stack passes through the frame that
+    entered ``sampled`` or through a ``to_thread`` call made under it, so other
+    tasks on the event loop and other runs' extraction threads are left out.
+    Every ``flush_seconds`` the counts go to ``<output_dir>/parser-<time>.folded``
+    in the collapsed format that flamegraph.pl and speedscope read. Extraction
+    inside ``PARSER_PROCESS_WORKERS`` processes is not seen. Disabled, it costs
+    one attribute check per run.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float | None = None,
+        interval_ms: float | None = None,
+        output_dir: str | None = None,
+        flush_seconds: float | None = None,
+    ):
+        self.sample_rate = sample_rate if sample_rate is not None else settings.profiler_sample_rate
+        self.interval_ms = interval_ms if interval_ms is not None else settings.profiler_interval_ms
+        self.output_dir = Path(output_dir or settings.profiler_dir)
+        self.flush_seconds = flush_seconds if flush_seconds is not None else settings.profiler_flush_seconds
+        self.samples = 0
+        self.files_written = 0
+        self._stacks: Counter[str] = Counter()
+        self._active_runs = 0
+        # Frames whose callees belong to a sampled run, with how many blocks hold each.
+        self._frames: Counter = Counter()
+        self._lock = threading.Lock()
+        self._stopped: threading.Event | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._stopped is not None
+
+    def enable(self, sample_rate: float | None = None):
+        if sample_rate is not None:
+            self.sample_rate = min(1.0, max(0.0, sample_rate))
+        if self._stopped is None:
+            self._stopped = threading.Event()
+            threading.Thread(
+                target=self._sample_loop, args=(self._stopped,), name="parser-profiler", daemon=True
+            ).start()
+        logger.info("Profiling %.0f%% of page runs every %s ms", self.sample_rate * 100, self.interval_ms)
+
+    def disable(self):
+        if self._stopped is not None:
+            self._stopped.set()
+            self._stopped = None
+            logger.info("Profiling disabled")
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def should_sample(self) -> bool:
+        return self._stopped is not None and random.random() < self.sample_rate
+
+    @contextmanager
+    def sampled(self, sample: bool = True):
+        """Record the caller's stacks for the duration of the block if ``sample`` is true."""
+        if not sample:
+            yield
+            return
+        # The generator runs under contextlib's __enter__, whose caller entered the block.
+        frame = sys._getframe(2)
+        token = _sampling.set(self)
+        with self._lock:
+            self._active_runs += 1
+        try:
+            with self._tracking(frame):
+                yield
+        finally:
+            _sampling.reset(token)
+            with self._lock:
+                self._active_runs -= 1
+
+    @contextmanager
+    def _tracking(self, frame):
+        with self._lock:
+            self._frames[frame] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._frames[frame] -= 1
+                if not self._frames[frame]:
+                    del self._frames[frame]
+
+    def _sample_loop(self, stopped: threading.Event):
+        own_thread = threading.get_ident()
+        names = {}
+        while not stopped.wait(self.interval_ms / 1000):
+            with self._lock:
+                tracked = set(self._frames)
+            if not tracked:
+                continue
+            if len(names) != threading.active_count():
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread or frame.f_code.co_filename.endswith(IDLE_FILES):
+                    continue
+                stack = []
+                in_run = False
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                    in_run = in_run or frame in tracked
+                    frame = frame.f_back
+                if not in_run:
+                    continue
+                stack.append(names.get(thread_id, str(thread_id)))
+                with self._lock:
+                    self._stacks[";".join(reversed(stack))] += 1
+                    self.samples += 1
+
+    def flush(self):
+        with self._lock:
+            stacks, self._stacks = self._stacks, Counter()
+        if not stacks:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"parser-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}.folded"
+        with path.open("a", encoding="utf-8") as file:
+            file.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        self.files_written += 1
+        logger.info("Wrote %s profiled stacks to %s", len(stacks), path)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                logger.exception("Failed to write profiled stacks")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "active_runs": self._active_runs,
+            "samples": self.samples,
+            "files_written": self.files_written,
+        }
+
+
+def _run_tracked(func, *args):
+    profiler = _sampling.get()
+    if profiler is None:
+        return func(*args)
+    with profiler._tracking(sys._getframe()):
+        return func(*args)
+
+
+async def to_thread(func, /, *args):
+    """``asyncio.to_thread`` whose thread the profiler samples when the calling run is sampled."""
+    return await asyncio.to_thread(_run_tracked, func, *args)
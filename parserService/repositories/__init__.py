@@ -1,3 +1,4 @@
 from repositories.listings import ListingRepository
+from repositories.task_state import TaskStateBuffer
 
-__all__ = ["ListingRepository"]
+__all__ = ["ListingRepository", "TaskStateBuffer"]
@@ -1,4 +1,8 @@
-from sqlalchemy import select
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.Post import FoundListing
@@ -10,38 +14,99 @@ class ListingRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_existing_external_ids(self, task: TaskCache) -> set[str]:
+    async def get_known_external_ids(
+        self,
+        task_ids: list[UUID],
+        platform: str,
+        candidate_ids: list[str],
+    ) -> set[str]:
+        """Return the candidate IDs that every one of the given tasks has already stored."""
+        if not task_ids or not candidate_ids:
+            return set()
+        result = await self.session.execute(
+            select(FoundListing.external_id)
+            .where(
+                FoundListing.task_id.in_(task_ids),
+                FoundListing.platform == platform,
+                FoundListing.external_id.in_(candidate_ids),
+            )
+            .group_by(FoundListing.external_id)
+            .having(func.count() == len(set(task_ids)))
+        )
+        return set(result.scalars().all())
+
+    async def get_existing_external_ids(self, task: TaskCache, candidate_ids: set[str]) -> set[str]:
+        """Return which of the freshly parsed IDs are already stored for the task.
+
+        Only the candidates are looked up, through the unique (task_id, platform,
+        external_id) index, so the cost follows the page size rather than the
+        task history.
+        """
+        if not candidate_ids:
+            return set()
         result = await self.session.execute(
             select(FoundListing.external_id).where(
                 FoundListing.task_id == task.task_id,
                 FoundListing.platform == task.platform,
+                FoundListing.external_id.in_(candidate_ids),
             )
         )
         return set(result.scalars().all())
 
+    async def get_recent_external_ids(self, task_ids: list[UUID], platform: str, limit: int) -> frozenset[str]:
+        """Return the IDs among the latest ``limit`` stored for every one of the given tasks."""
+        recent: set[str] | None = None
+        for task_id in dict.fromkeys(task_ids):
+            result = await self.session.execute(
+                select(FoundListing.external_id)
+                .where(FoundListing.task_id == task_id, FoundListing.platform == platform)
+                .order_by(FoundListing.created_at.desc())
+                .limit(limit)
+            )
+            ids = set(result.scalars().all())
+            recent = ids if recent is None else recent & ids
+        return frozenset(recent or ())
+
     async def save_new(self, task: TaskCache, listings: list[ParsedListing]) -> list[FoundListing]:
-        existing_ids = await self.get_existing_external_ids(task)
-        new_rows = []
+        """Insert the parsed listings not stored yet in one statement and return the rows that were new.
 
+        Most of a polled page is already stored, so the known IDs are dropped
+        first and only new listings are sent. ``ON CONFLICT DO NOTHING`` on the
+        (task_id, platform, external_id) key still skips a listing that a
+        concurrent run stored in between.
+        """
+        unique_listings: dict[str, ParsedListing] = {}
         for listing in listings:
-            if listing.external_id in existing_ids:
-                continue
-            row = FoundListing(
-                user_id=task.user_id,
-                task_id=task.task_id,
-                platform=listing.platform,
-                external_id=listing.external_id,
-                title=listing.title,
-                price=listing.price,
-                url=listing.url,
-                image_url=listing.image_url,
-                published_at=listing.published_at,
-            )
-            self.session.add(row)
-            new_rows.append(row)
-            existing_ids.add(listing.external_id)
-
-        if new_rows:
-            await self.session.flush()
+            unique_listings.setdefault(listing.external_id, listing)
+        existing_ids = await self.get_existing_external_ids(task, set(unique_listings))
+        for external_id in existing_ids:
+            unique_listings.pop(external_id, None)
+        if not unique_listings:
+            return []
 
-        return new_rows
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "id": uuid4(),
+                "user_id": task.user_id,
+                "task_id": task.task_id,
+                "platform": listing.platform,
+                "external_id": listing.external_id,
+                "title": listing.title,
+                "price": listing.price,
+                "url": listing.url,
+                "image_url": listing.image_url,
+                "published_at": listing.published_at,
+                "created_at": now,
+            }
+            for listing in unique_listings.values()
+        ]
+        statement = (
+            insert(FoundListing)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["task_id", "platform", "external_id"])
+            .returning(FoundListing)
+        )
+        inserted = {row.external_id: row for row in await self.session.scalars(statement)}
+        # RETURNING order is not guaranteed; keep the order of the page.
+        return [inserted[external_id] for external_id in unique_listings if external_id in inserted]
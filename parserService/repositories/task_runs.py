@@ -0,0 +1,182 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from sqlalchemy import DateTime, Integer, String, Uuid, cast, column, delete, exists, func, insert, select, values
+
+from metrics import RunTrace
+from models.Task import TaskCache
+from models.TaskRun import TaskRun
+from models.database import async_session
+
+logger = logging.getLogger(__name__)
+
+RUN_COLUMNS = (
+    ("task_id", Uuid),
+    ("platform", String),
+    ("started_at", DateTime(timezone=True)),
+    ("fetch_ms", Integer),
+    ("parse_ms", Integer),
+    ("requests", Integer),
+    ("page_kib", Integer),
+    ("parsed_count", Integer),
+    ("new_count", Integer),
+    ("http_status", Integer),
+    ("error_class", String),
+)
+
+
+class TaskRunLog:
+    """Buffers one row per task run and writes them with one INSERT per flush.
+
+    The same transaction trims every flushed task back to its newest
+    ``keep_runs`` rows, so ``task_runs`` stays a ring buffer per task. After a
+    write, ``publish`` gets a ``task.health`` summary of the flushed runs.
+    """
+
+    def __init__(
+        self,
+        flush_seconds: float,
+        keep_runs: int,
+        publish: Callable[[dict], Awaitable[None]] | None = None,
+    ):
+        self.flush_seconds = flush_seconds
+        self.keep_runs = keep_runs
+        self.publish = publish
+        self.flushes = 0
+        self.rows_written = 0
+        self._pending: list[dict] = []
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(
+        self,
+        task: TaskCache,
+        run: RunTrace,
+        parsed: int = 0,
+        new: int = 0,
+        error: BaseException | None = None,
+    ):
+        self._pending.append(
+            {
+                "task_id": task.task_id,
+                "platform": task.platform,
+                "started_at": run.started_at,
+                "fetch_ms": round(run.fetch_seconds * 1000),
+                "parse_ms": round(run.parse_seconds * 1000),
+                "requests": run.requests,
+                "page_kib": run.bytes_read // 1024,
+                "parsed_count": parsed,
+                "new_count": new,
+                # Fetch errors carry the status of the response that failed.
+                "http_status": getattr(error, "status", None) or run.http_status,
+                "error_class": type(error).__name__ if error is not None else None,
+                # Not stored in task_runs; the health event carries the current interval decision.
+                "effective_interval_minutes": task.effective_interval_minutes,
+                "interval_reason": task.interval_reason,
+            }
+        )
+
+    async def flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+
+        runs = values(*(column(name, type_) for name, type_ in RUN_COLUMNS), name="runs").data(
+            [tuple(row[name] for name, _ in RUN_COLUMNS) for row in pending]
+        )
+        statement = insert(TaskRun).from_select(
+            [name for name, _ in RUN_COLUMNS],
+            # Runs of tasks deleted in the meantime are dropped instead of failing the foreign key.
+            select(*(cast(runs.c[name], type_) for name, type_ in RUN_COLUMNS)).where(
+                exists().where(TaskCache.task_id == runs.c.task_id)
+            ),
+        )
+        task_ids = list({row["task_id"] for row in pending})
+        ranked = (
+            select(
+                TaskRun.id,
+                func.row_number()
+                .over(partition_by=TaskRun.task_id, order_by=TaskRun.started_at.desc())
+                .label("position"),
+            )
+            .where(TaskRun.task_id.in_(task_ids))
+            .subquery()
+        )
+        prune = delete(TaskRun).where(TaskRun.id.in_(select(ranked.c.id).where(ranked.c.position > self.keep_runs)))
+
+        try:
+            async with async_session() as session:
+                result = await session.execute(statement)
+                await session.execute(prune)
+                await session.commit()
+        except Exception:
+            self._pending = pending + self._pending
+            raise
+
+        self.flushes += 1
+        self.rows_written += result.rowcount
+        if self.publish is not None:
+            try:
+                await self.publish(health_payload(pending))
+            except Exception:
+                logger.exception("Failed to publish health of %s task(s)", len(task_ids))
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to write %s task run(s)", len(self._pending))
+
+    def stats(self) -> dict[str, int]:
+        return {"pending": len(self._pending), "flushes": self.flushes, "rows_written": self.rows_written}
+
+
+def health_payload(rows: list[dict]) -> dict:
+    """``task.health`` event summarizing runs per task, in the order they finished.
+
+    Runs with ``requests == 0`` were served from the page cache, waited on
+    another task's parse or were skipped by an open breaker. They count as
+    runs but not in ``fetched_runs``, and the fetch and parse averages cover
+    only the fetched runs (``None`` when there were none), so the receiver
+    can weigh them into a running average.
+    """
+    by_task: dict[UUID, list[dict]] = {}
+    for row in rows:
+        by_task.setdefault(row["task_id"], []).append(row)
+
+    tasks = []
+    for task_id, runs in by_task.items():
+        last = runs[-1]
+        consecutive_failures = 0
+        for run in reversed(runs):
+            if run["error_class"] is None:
+                break
+            consecutive_failures += 1
+        fetched = [run for run in runs if run["requests"]]
+        statuses = [run["http_status"] for run in runs if run["http_status"] is not None]
+        tasks.append(
+            {
+                "task_id": str(task_id),
+                "platform": last["platform"],
+                "runs": len(runs),
+                "failures": sum(run["error_class"] is not None for run in runs),
+                "consecutive_failures": consecutive_failures,
+                "last_run_at": last["started_at"].isoformat(),
+                "last_error_class": last["error_class"],
+                "last_http_status": statuses[-1] if statuses else None,
+                "last_parsed_count": last["parsed_count"],
+                "new_count": sum(run["new_count"] for run in runs),
+                "fetched_runs": len(fetched),
+                "fetch_ms_avg": round(sum(run["fetch_ms"] for run in fetched) / len(fetched)) if fetched else None,
+                "parse_ms_avg": round(sum(run["parse_ms"] for run in fetched) / len(fetched)) if fetched else None,
+                "page_kib_max": max(run["page_kib"] for run in runs),
+                "effective_interval_minutes": last["effective_interval_minutes"],
+                "interval_reason": last["interval_reason"],
+            }
+        )
+    return {"event_type": "task.health", "source_service": "parsingService", "tasks": tasks}
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DateTime, Float, Integer, String, Uuid, cast, column, update, values
+
+from config import settings
+from models.Task import TaskCache
+from models.database import async_session
+
+logger = logging.getLogger(__name__)
+
+
+class TaskStateBuffer:
+    """Collects the bookkeeping of finished runs and writes it in one statement.
+
+    Every flush is a single ``UPDATE tasks_cache ... FROM (VALUES ...)`` instead
+    of a transaction per run. The lease of a task stays held until its state is
+    flushed, so no other replica picks it up in between.
+    """
+
+    def __init__(self, flush_seconds: float):
+        self.flush_seconds = flush_seconds
+        self.flushes = 0
+        self.rows_written = 0
+        self._pending: dict[UUID, dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(self, task: TaskCache):
+        self._pending[task.task_id] = {
+            "task_id": task.task_id,
+            "last_run_at": task.last_run_at,
+            "next_run_at": task.next_run_at,
+            "yield_rate": task.yield_rate,
+            "effective_interval_minutes": task.effective_interval_minutes,
+            "interval_reason": task.interval_reason,
+        }
+
+    def pending_deadlines(self) -> dict[UUID, datetime]:
+        """Next run times that tasks_cache does not show yet."""
+        return {task_id: row["next_run_at"] for task_id, row in self._pending.items()}
+
+    async def flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+
+        finished = values(
+            column("task_id", Uuid),
+            column("last_run_at", DateTime(timezone=True)),
+            column("next_run_at", DateTime(timezone=True)),
+            column("yield_rate", Float),
+            column("effective_interval_minutes", Integer),
+            column("interval_reason", String),
+            name="finished",
+        ).data([tuple(row.values()) for row in pending.values()])
+        statement = (
+            update(TaskCache)
+            .where(
+                TaskCache.task_id == finished.c.task_id,
+                # A lease taken over by another replica means that replica owns the task now.
+                TaskCache.lease_owner == settings.instance_id,
+            )
+            .values(
+                last_run_at=finished.c.last_run_at,
+                next_run_at=finished.c.next_run_at,
+                # A column that is NULL in every row comes out of VALUES as text.
+                yield_rate=cast(finished.c.yield_rate, Float),
+                effective_interval_minutes=cast(finished.c.effective_interval_minutes, Integer),
+                interval_reason=finished.c.interval_reason,
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        try:
+            async with async_session() as session:
+                result = await session.execute(statement)
+                await session.commit()
+        except Exception:
+            # Keep newer records that arrived while the write was failing.
+            self._pending = {**pending, **self._pending}
+            raise
+
+        self.flushes += 1
+        self.rows_written += result.rowcount
+        if result.rowcount < len(pending):
+            logger.info(
+                "Skipped state of %s finished task(s) that were deleted or leased by another replica",
+                len(pending) - result.rowcount,
+            )
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush state of %s finished task(s)", len(self._pending))
+
+    def stats(self) -> dict[str, int]:
+        return {"pending": len(self._pending), "flushes": self.flushes, "rows_written": self.rows_written}
@@ -1,17 +1,40 @@
 import asyncio
 import logging
-from datetime import datetime, timezone
+import signal
+import time
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from sqlalchemy import delete, or_, select
+from sqlalchemy import delete, or_, select, update
 
 from commands.parse_task import ParseTaskCommand
 from config import settings
+from fetching.client import BlockedError, CircuitOpenError
 from messaging.rabbitmq import RabbitMQClient
+from metrics import (
+    DUE_QUEUE_TASKS,
+    IN_FLIGHT_TASKS,
+    SCHEDULE_LAG,
+    RunTrace,
+    current_run,
+    start_metrics_server,
+    watch_db_pool,
+)
 from models.Task import TaskCache
-from models.database import async_session, init_db
+from models.database import async_session, engine, init_db
+from parsers.base import BaseParser, CrawlResult, ParsedListing
 from parsers.factory import ParserFactory
+from profiling import SamplingProfiler
+from repositories.listings import ListingRepository
+from repositories.task_runs import TaskRunLog
+from repositories.task_state import TaskStateBuffer
 from init_db import init_database
+from scheduling.coalescing import PageKey, group_tasks_by_page
+from scheduling.jitter import jitter_window_seconds, spread_due_time
+from scheduling.leader import LeaderElection
+from scheduling.page_cache import PageResultCache
+from scheduling.timers import DueQueue
+from scheduling.workers import WorkerPool
 
 logging.basicConfig(
     level=logging.INFO,
@@ -25,6 +48,9 @@ logger = logging.getLogger(__name__)
 
 
 class TaskEventHandler:
+    def __init__(self, due_queue: DueQueue | None = None):
+        self.due_queue = due_queue
+
     async def handle(self, payload: dict):
         event_type = payload.get("event_type") or payload.get("type") or "task.upserted"
         data = payload.get("payload") or payload.get("task") or payload
@@ -51,14 +77,32 @@ class TaskEventHandler:
             task.platform = platform
             task.url = data["url"]
             task.name = data.get("name") or data.get("task_name")
+            interval_changed = task.interval_minutes != interval_minutes
             task.interval_minutes = interval_minutes
             task.end_date = self._parse_datetime(data.get("end_date"))
             task.is_active = bool(data.get("is_active", True))
-            task.next_run_at = self._parse_datetime(data.get("next_run_at")) or datetime.now(timezone.utc)
+            task.adaptive_interval = bool(data.get("adaptive_interval", False))
+            task.min_interval_minutes = self._optional_int(data.get("min_interval_minutes"))
+            task.max_interval_minutes = self._optional_int(data.get("max_interval_minutes"))
+            task.max_pages = self._optional_int(data.get("max_pages"))
+            if not task.adaptive_interval or interval_changed:
+                task.effective_interval_minutes = None
+                task.interval_reason = None
+            task.next_run_at = self._parse_datetime(data.get("next_run_at")) or spread_due_time(
+                task_id,
+                datetime.now(timezone.utc),
+                jitter_window_seconds(interval_minutes),
+            )
 
             await session.commit()
             logger.info("Task %s cached/updated for platform %s", task_id, platform)
 
+        if self.due_queue is not None:
+            if task.is_active:
+                self.due_queue.schedule(task_id, task.next_run_at, platform)
+            else:
+                self.due_queue.remove(task_id)
+
     async def _delete_task(self, data: dict):
         task_id = self._required_uuid(data, "task_id", "id")
         async with async_session() as session:
@@ -66,12 +110,18 @@ class TaskEventHandler:
             await session.commit()
             logger.info("Task %s deleted from cache", task_id)
 
+        if self.due_queue is not None:
+            self.due_queue.remove(task_id)
+
     def _required_uuid(self, data: dict, *keys: str) -> UUID:
         for key in keys:
             if data.get(key):
                 return UUID(str(data[key]))
         raise ValueError(f"Missing required UUID field. Expected one of: {', '.join(keys)}")
 
+    def _optional_int(self, value) -> int | None:
+        return int(value) if value else None
+
     def _parse_datetime(self, value) -> datetime | None:
         if not value:
             return None
@@ -82,52 +132,379 @@ class TaskEventHandler:
 
 
 class TaskScheduler:
-    def __init__(self, rabbitmq: RabbitMQClient):
+    def __init__(self, rabbitmq: RabbitMQClient, due_queue: DueQueue | None = None):
         self.rabbitmq = rabbitmq
         self.parser_factory = ParserFactory()
+        self.page_cache = PageResultCache()
+        self.due_queue = due_queue or DueQueue()
+        DUE_QUEUE_TASKS.set_function(lambda: len(self.due_queue))
         self.running_tasks: set[UUID] = set()
+        self.task_state = TaskStateBuffer(settings.task_state_flush_seconds)
+        self.run_log = TaskRunLog(settings.task_run_flush_seconds, settings.task_run_history, rabbitmq.publish_task_health)
+        self.profiler = SamplingProfiler()
+        self.workers: WorkerPool[tuple[PageKey, list[TaskCache]]] = WorkerPool(
+            lambda work: self.run_page(*work),
+            self.parser_factory.supported_platforms,
+            size_for=settings.workers_for,
+            queue_size=settings.scheduler_queue_size,
+        )
 
-    async def get_tasks_to_run(self) -> list[TaskCache]:
+    def _schedulable_filters(self, now: datetime) -> tuple:
+        return (
+            TaskCache.is_active.is_(True),
+            TaskCache.platform.in_(sorted(self.parser_factory.supported_platforms)),
+            or_(TaskCache.end_date.is_(None), TaskCache.end_date >= now),
+        )
+
+    async def load_schedule(self):
+        """Rebuild the in-memory due queue from tasks_cache."""
         now = datetime.now(timezone.utc)
-        supported_platforms = sorted(self.parser_factory.supported_platforms)
         async with async_session() as session:
             result = await session.execute(
-                select(TaskCache).where(
-                    TaskCache.is_active.is_(True),
-                    TaskCache.platform.in_(supported_platforms),
-                    TaskCache.next_run_at <= now,
-                    or_(TaskCache.end_date.is_(None), TaskCache.end_date >= now),
+                select(TaskCache.task_id, TaskCache.next_run_at, TaskCache.platform).where(
+                    *self._schedulable_filters(now)
                 )
-                .order_by(TaskCache.next_run_at.asc())
-                .limit(settings.scheduler_batch_size)
             )
-            return list(result.scalars().all())
+            deadlines = {
+                task_id: (next_run_at, platform)
+                for task_id, next_run_at, platform in result.all()
+                if task_id not in self.running_tasks
+            }
+        # Finished runs whose state is not flushed yet still show their old next_run_at.
+        for task_id, next_run_at in self.task_state.pending_deadlines().items():
+            if task_id in deadlines:
+                deadlines[task_id] = (next_run_at, deadlines[task_id][1])
+        self.due_queue.replace_all(deadlines)
+        logger.info("Loaded %s scheduled tasks", len(deadlines))
 
-    async def run_task(self, task_id: UUID):
-        if task_id in self.running_tasks:
-            logger.info("Task %s is already running", task_id)
-            return
+    async def get_tasks_to_run(self, task_ids: list[UUID]) -> list[TaskCache]:
+        """Claim due tasks with a lease so that parser replicas split them without overlap.
 
-        self.running_tasks.add(task_id)
+        Rows locked by another replica are skipped; a replica that crashed stops
+        renewing its leases and its tasks become claimable once they expire.
+        """
+        now = datetime.now(timezone.utc)
+        platforms = sorted(
+            platform
+            for platform in self.parser_factory.supported_platforms
+            if not self.parser_factory.http.is_paused(platform)
+        )
+        claimed: list[TaskCache] = []
+        unclaimed_rows = []
+        async with async_session() as session:
+            if platforms:
+                claimable = (
+                    select(TaskCache.task_id)
+                    .where(
+                        TaskCache.task_id.in_(task_ids),
+                        *self._schedulable_filters(now),
+                        TaskCache.platform.in_(platforms),
+                        TaskCache.next_run_at <= now,
+                        or_(
+                            TaskCache.lease_expires_at.is_(None),
+                            TaskCache.lease_expires_at < now,
+                            TaskCache.lease_owner == settings.instance_id,
+                        ),
+                    )
+                    .with_for_update(skip_locked=True)
+                )
+                result = await session.execute(
+                    update(TaskCache)
+                    .where(TaskCache.task_id.in_(claimable))
+                    .values(
+                        lease_owner=settings.instance_id,
+                        lease_expires_at=now + timedelta(seconds=settings.task_lease_seconds),
+                    )
+                    .returning(TaskCache)
+                    .execution_options(synchronize_session=False)
+                )
+                claimed = list(result.scalars().all())
+
+            unclaimed = set(task_ids) - {task.task_id for task in claimed}
+            if unclaimed:
+                result = await session.execute(
+                    select(
+                        TaskCache.task_id,
+                        TaskCache.platform,
+                        TaskCache.next_run_at,
+                        TaskCache.lease_expires_at,
+                    ).where(TaskCache.task_id.in_(unclaimed), *self._schedulable_filters(now))
+                )
+                unclaimed_rows = result.all()
+            await session.commit()
+
+        for task_id, platform, next_run_at, lease_expires_at in unclaimed_rows:
+            if self.parser_factory.http.is_paused(platform):
+                self._retry_later(task_id, platform, self.parser_factory.http.breaker(platform).retry_after)
+                continue
+            run_at = max(next_run_at, lease_expires_at or next_run_at)
+            if run_at <= now:
+                self._retry_later(task_id, platform)
+            else:
+                self.due_queue.schedule(task_id, run_at, platform)
+        return claimed
+
+    def _retry_later(self, task_id: UUID, platform: str, delay_seconds: float = 0):
+        delay = max(delay_seconds, settings.scheduler_tick_seconds)
+        self.due_queue.schedule(task_id, datetime.now(timezone.utc) + timedelta(seconds=delay), platform)
+
+    async def run_page(self, key: PageKey, tasks: list[TaskCache]):
+        """Fetch and parse a page once, then save and publish for every task tracking it."""
+        task_ids = {task.task_id for task in tasks}
+        run = RunTrace()
+        for task in tasks:
+            SCHEDULE_LAG.labels(key.platform).observe(max(0.0, (run.started_at - task.next_run_at).total_seconds()))
+        IN_FLIGHT_TASKS.labels(key.platform).inc(len(tasks))
+        run_token = current_run.set(run)
         try:
-            async with async_session() as session:
-                task = await session.get(TaskCache, task_id)
-                if not task or not task.is_active:
-                    return
-                command = ParseTaskCommand(session, self.rabbitmq, self.parser_factory)
-                await command.execute(task)
-        except Exception:
-            logger.exception("Failed to process task %s", task_id)
+            try:
+                parser = self.parser_factory.get(key.platform)
+                depth = self._crawl_depth(tasks)
+                with self.profiler.sampled(self.profiler.should_sample()):
+                    parsed_listings = await self.page_cache.get_or_parse(
+                        key, lambda: self._parse_page(parser, tasks, depth), depth
+                    )
+            except CircuitOpenError as exc:
+                logger.info("Skipped %s task(s) for %s: %s", len(tasks), key.url, exc)
+                for task in tasks:
+                    self.run_log.record(task, run, error=exc)
+                    self._retry_later(task.task_id, task.platform, exc.retry_after)
+                return
+            except BlockedError as exc:
+                logger.warning("Blocked while parsing %s task(s): %s", len(tasks), exc)
+                for task in tasks:
+                    self.run_log.record(task, run, error=exc)
+                    self._retry_later(task.task_id, task.platform)
+                return
+            except Exception as exc:
+                logger.exception("Failed to parse %s page %s for %s task(s)", key.platform, key.url, len(tasks))
+                for task in tasks:
+                    self.run_log.record(task, run, error=exc)
+                    self._retry_later(task.task_id, task.platform)
+                return
+
+            if len(tasks) > 1:
+                logger.info("Page %s shared by %s tasks, fetched once", key.url, len(tasks))
+            await asyncio.gather(*(self.run_task(task, parsed_listings, run) for task in tasks))
         finally:
-            self.running_tasks.remove(task_id)
+            current_run.reset(run_token)
+            IN_FLIGHT_TASKS.labels(key.platform).dec(len(tasks))
+            self.running_tasks.difference_update(task_ids)
+
+    async def _parse_page(self, parser: BaseParser, tasks: list[TaskCache], depth: int) -> CrawlResult:
+        stop_ids = await self._recent_ids(tasks) if parser.streaming else frozenset()
+        return await parser.crawl(
+            tasks[0],
+            depth,
+            lambda ids: self._known_ids(tasks, ids),
+            stop_ids,
+        )
+
+    def _crawl_depth(self, tasks: list[TaskCache]) -> int:
+        # A first run has nothing to catch up on; older pages would only be recorded as seen.
+        if all(task.last_run_at is None for task in tasks):
+            return 1
+        return max(1, min(settings.crawl_max_pages, max(task.max_pages or 1 for task in tasks)))
+
+    async def _known_ids(self, tasks: list[TaskCache], external_ids: list[str]) -> set[str]:
+        async with async_session() as session:
+            return await ListingRepository(session).get_known_external_ids(
+                [task.task_id for task in tasks],
+                tasks[0].platform,
+                external_ids,
+            )
+
+    async def _recent_ids(self, tasks: list[TaskCache]) -> frozenset[str]:
+        if all(task.last_run_at is None for task in tasks):
+            return frozenset()
+        async with async_session() as session:
+            return await ListingRepository(session).get_recent_external_ids(
+                [task.task_id for task in tasks],
+                tasks[0].platform,
+                settings.stream_max_items or 100,
+            )
+
+    async def run_task(self, task: TaskCache, parsed_listings: list[ParsedListing], run: RunTrace):
+        """Save and publish a run for a task claimed by ``get_tasks_to_run``; no re-fetch is needed."""
+        try:
+            async with async_session() as session:
+                command = ParseTaskCommand(session, self.rabbitmq, self.parser_factory, self.task_state)
+                new_listings = await command.execute(task, parsed_listings)
+            self.run_log.record(task, run, parsed=len(parsed_listings), new=len(new_listings))
+            self.due_queue.schedule(task.task_id, task.next_run_at, task.platform)
+        except Exception as exc:
+            logger.exception("Failed to process task %s", task.task_id)
+            self.run_log.record(task, run, parsed=len(parsed_listings), error=exc)
+            self._retry_later(task.task_id, task.platform)
+
+    async def renew_leases(self) -> set[UUID]:
+        """Extend the leases of tasks this replica still holds; return the held tasks whose lease was lost.
+
+        Claimed tasks can wait in the worker queues, crawl several throttled
+        pages or sit in the state buffer for longer than ``TASK_LEASE_SECONDS``;
+        without renewal another replica would claim and run them again.
+        """
+        held = self.running_tasks.union(self.task_state.pending_deadlines())
+        if not held:
+            return set()
+        async with async_session() as session:
+            result = await session.execute(
+                update(TaskCache)
+                .where(TaskCache.task_id.in_(held), TaskCache.lease_owner == settings.instance_id)
+                .values(lease_expires_at=datetime.now(timezone.utc) + timedelta(seconds=settings.task_lease_seconds))
+                .returning(TaskCache.task_id)
+                .execution_options(synchronize_session=False)
+            )
+            renewed = set(result.scalars().all())
+            await session.commit()
+        lost = held - renewed
+        if lost:
+            logger.warning("Leases of %s held task(s) expired and may be run by another replica", len(lost))
+        return lost
 
-    async def run(self):
+    async def keep_leases(self):
+        while True:
+            await asyncio.sleep(settings.task_lease_seconds / 3)
+            try:
+                await self.renew_leases()
+            except Exception:
+                logger.exception("Failed to renew task leases")
+
+    def dispatch(self, pending: list[tuple[PageKey, list[TaskCache]]]) -> list[tuple[PageKey, list[TaskCache]]]:
+        """Hand pages to platform workers; return the ones whose platform queue is full."""
+        return [work for work in pending if not self.workers.submit_nowait(work[0].platform, work)]
+
+    async def run(self, reload_schedule: bool = True):
         logger.info("Parser scheduler started")
+        if reload_schedule:
+            await self.load_schedule()
+        self.workers.start()
+        flushing = asyncio.create_task(self.task_state.run(), name="task-state-flush")
+        logging_runs = asyncio.create_task(self.run_log.run(), name="task-run-log")
+        profiling = asyncio.create_task(self.profiler.run(), name="profiler-flush")
+        renewing = asyncio.create_task(self.keep_leases(), name="lease-renewal")
+        reconciled_at = time.monotonic()
+        pending: list[tuple[PageKey, list[TaskCache]]] = []
+        try:
+            while True:
+                since_reconcile = time.monotonic() - reconciled_at
+                if since_reconcile >= settings.scheduler_reconcile_seconds:
+                    await self.load_schedule()
+                    self.log_stats()
+                    reconciled_at = time.monotonic()
+                    since_reconcile = 0
+
+                pending = self.dispatch(pending)
+                # A platform with held work has a full worker queue; its due tasks stay in the due queue
+                # so that the other platforms keep being popped.
+                blocked = {key.platform for key, _ in pending}
+                now = datetime.now(timezone.utc)
+                task_ids = self.due_queue.pop_due(now, limit=settings.scheduler_batch_size, exclude=blocked)
+                if task_ids:
+                    tasks = await self.get_tasks_to_run(task_ids)
+                    tasks = [task for task in tasks if task.task_id not in self.running_tasks]
+                    # Queued tasks count as running so that reconciliation does not queue them twice.
+                    self.running_tasks.update(task.task_id for task in tasks)
+                    pending.extend(group_tasks_by_page(tasks).items())
+                    continue
+
+                if pending:
+                    # Backpressure: hold the popped work until a worker frees a queue slot,
+                    # but wake up for tasks of the other platforms falling due.
+                    next_due = self.due_queue.next_deadline(exclude=blocked)
+                    until_due = (next_due - now).total_seconds() if next_due is not None else 1
+                    await self.workers.wait_for_capacity(timeout=min(1, max(0.0, until_due)))
+                else:
+                    await self.due_queue.wait(settings.scheduler_reconcile_seconds - since_reconcile)
+        finally:
+            await self.workers.close()
+            flushing.cancel()
+            logging_runs.cancel()
+            profiling.cancel()
+            renewing.cancel()
+            await asyncio.gather(flushing, logging_runs, profiling, renewing, return_exceptions=True)
+            try:
+                await self.task_state.flush()
+            except Exception:
+                logger.exception("Failed to flush state of finished tasks on shutdown")
+            try:
+                await self.run_log.flush()
+            except Exception:
+                logger.exception("Failed to write task runs on shutdown")
+            try:
+                self.profiler.flush()
+            except Exception:
+                logger.exception("Failed to write profiled stacks on shutdown")
+            # Work that was queued but never started is picked up again after the lease expires.
+            self.running_tasks.clear()
+
+    async def standby(self, election: LeaderElection):
+        """Wait for the leadership lock, then load the schedule as it is now.
+
+        A standby consumes no task events, so anything loaded before the lock
+        was won could miss tasks created or edited since.
+        """
+        while not await election.try_acquire():
+            await asyncio.sleep(settings.leader_check_seconds)
+        await self.load_schedule()
+
+    async def release_leases(self):
+        """Clear the leases this replica holds so that the new leader can claim those tasks at once."""
+        async with async_session() as session:
+            result = await session.execute(
+                update(TaskCache)
+                .where(TaskCache.lease_owner == settings.instance_id)
+                .values(lease_owner=None, lease_expires_at=None)
+                .returning(TaskCache.task_id)
+                .execution_options(synchronize_session=False)
+            )
+            released = result.scalars().all()
+            await session.commit()
+        if released:
+            logger.info("Released leases of %s task(s)", len(released))
+
+    async def run_elected(self, election: LeaderElection, task_events: TaskEventHandler):
+        """Run only while holding the leadership lock; fall back to standby when it is lost."""
         while True:
-            tasks = await self.get_tasks_to_run()
-            if tasks:
-                await asyncio.gather(*(self.run_task(task.task_id) for task in tasks))
-            await asyncio.sleep(settings.scheduler_tick_seconds)
+            logger.info("Parser scheduler is in standby")
+            await self.standby(election)
+            await self.rabbitmq.consume_task_events(task_events.handle)
+
+            running = asyncio.create_task(self.run(reload_schedule=False))
+            watching = asyncio.create_task(election.watch())
+            try:
+                done, _ = await asyncio.wait({running, watching}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for task in (running, watching):
+                    task.cancel()
+                await asyncio.gather(running, watching, return_exceptions=True)
+                await self.rabbitmq.stop_consuming_task_events()
+                try:
+                    await self.release_leases()
+                except Exception:
+                    logger.exception("Failed to release task leases; they expire after TASK_LEASE_SECONDS")
+                await election.release()
+
+            if running in done:
+                running.result()
+            logger.warning("Scheduler leadership lost, returning to standby")
+
+    def log_stats(self):
+        logger.info("Parser workers: %s", self.workers.stats())
+        logger.info("Page cache: %s", self.page_cache.stats())
+        logger.info("Task state writes: %s", self.task_state.stats())
+        logger.info("Task run log: %s", self.run_log.stats())
+        logger.info("Fetch throttles: %s", self.parser_factory.http.throttle_stats())
+        logger.info("Extraction strategies: %s", self.parser_factory.strategies.stats())
+        if self.parser_factory.executor.uses_processes:
+            logger.info("Parse processes: %s", self.parser_factory.executor.stats())
+        if self.profiler.enabled:
+            logger.info("Profiler: %s", self.profiler.stats())
+        histogram = self.due_queue.due_histogram(datetime.now(timezone.utc))
+        logger.info("Due tasks per minute, next %s min (peak %s): %s", len(histogram), max(histogram), histogram)
+        breakers = self.parser_factory.http.breaker_stats()
+        if any(state["state"] != "closed" for state in breakers.values()):
+            logger.info("Circuit breakers: %s", breakers)
 
 
 async def main():
@@ -136,14 +513,39 @@ async def main():
     rabbitmq = RabbitMQClient()
     await rabbitmq.connect()
 
-    task_events = TaskEventHandler()
-    await rabbitmq.consume_task_events(task_events.handle)
-
-    scheduler = TaskScheduler(rabbitmq)
+    due_queue = DueQueue()
+    task_events = TaskEventHandler(due_queue)
+    scheduler = TaskScheduler(rabbitmq, due_queue)
+    if settings.profiler_enabled:
+        scheduler.profiler.enable()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, scheduler.profiler.toggle)
+    except (AttributeError, NotImplementedError):
+        logger.info("SIGUSR1 is not available here; use the /profiler endpoint to toggle profiling")
+    metrics_server = None
+    if settings.metrics_port:
+        watch_db_pool(engine.pool)
+        metrics_server = await start_metrics_server(
+            settings.metrics_host,
+            settings.metrics_port,
+            scheduler.profiler,
+            settings.profiler_token,
+        )
     try:
-        await scheduler.run()
+        if settings.scheduler_mode == "leader":
+            await scheduler.run_elected(
+                LeaderElection(settings.leader_lock_key, settings.leader_check_seconds),
+                task_events,
+            )
+        else:
+            await rabbitmq.consume_task_events(task_events.handle)
+            await scheduler.run()
     finally:
+        await scheduler.parser_factory.close()
         await rabbitmq.close()
+        scheduler.profiler.disable()
+        if metrics_server is not None:
+            await metrics_server.cleanup()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,13 @@
+from scheduling.coalescing import PageKey, group_tasks_by_page, normalize_task_url, page_key
+from scheduling.jitter import next_due_time, spread_due_time
+from scheduling.page_cache import PageResultCache
+
+__all__ = [
+    "PageKey",
+    "PageResultCache",
+    "group_tasks_by_page",
+    "next_due_time",
+    "normalize_task_url",
+    "page_key",
+    "spread_due_time",
+]
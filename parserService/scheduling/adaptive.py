@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+
+from config import settings
+from models.Task import TaskCache
+
+
+@dataclass(frozen=True)
+class IntervalDecision:
+    minutes: int
+    yield_rate: float | None
+    reason: str | None
+
+
+def interval_bounds(task: TaskCache) -> tuple[int, int]:
+    low = task.min_interval_minutes or task.interval_minutes
+    high = task.max_interval_minutes or task.interval_minutes * settings.adaptive_max_factor
+    return low, max(low, high)
+
+
+def decide_interval(task: TaskCache, new_count: int) -> IntervalDecision:
+    """Update the decayed new-listings-per-run rate and pick the next polling interval.
+
+    Tasks that have not opted in keep their fixed ``interval_minutes``; the rate
+    is still tracked so that switching the mode on starts from real history.
+    """
+    if task.last_run_at is None:
+        # Everything on the first page is new on the first run, so it says nothing about the yield.
+        reason = "first run, collecting history" if task.adaptive_interval else None
+        return IntervalDecision(task.effective_interval_minutes or task.interval_minutes, task.yield_rate, reason)
+
+    previous = task.yield_rate
+    alpha = settings.adaptive_decay_alpha
+    rate = float(new_count) if previous is None else alpha * new_count + (1 - alpha) * previous
+
+    if not task.adaptive_interval:
+        return IntervalDecision(task.interval_minutes, rate, None)
+
+    current = task.effective_interval_minutes or task.interval_minutes
+    low, high = interval_bounds(task)
+    if rate >= settings.adaptive_hot_rate:
+        proposed = current / 2
+        reason = f"{rate:.2f} new per run, polling faster"
+    elif rate <= settings.adaptive_cold_rate:
+        proposed = current * 1.5
+        reason = f"{rate:.2f} new per run, polling slower"
+    else:
+        proposed = current
+        reason = f"{rate:.2f} new per run, interval kept"
+
+    minutes = min(high, max(low, round(proposed)))
+    if minutes == low and proposed < low:
+        reason += f", at minimum {low} min"
+    elif minutes == high and proposed > high:
+        reason += f", at maximum {high} min"
+    return IntervalDecision(minutes, rate, reason)
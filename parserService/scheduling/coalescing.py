@@ -0,0 +1,42 @@
+from typing import NamedTuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from models.Task import TaskCache
+
+TRACKING_PARAMS = {"gclid", "yclid", "fbclid"}
+
+
+class PageKey(NamedTuple):
+    platform: str
+    url: str
+
+
+def normalize_task_url(url: str) -> str:
+    """Canonical form of a search URL so that equivalent task URLs share one fetch."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    netloc = parts.netloc.lower()
+    if (scheme, netloc.rsplit(":", 1)[-1]) in {("https", "443"), ("http", "80")}:
+        netloc = netloc.rsplit(":", 1)[0]
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=False)
+        if not key.startswith("utm_") and key not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+
+def page_key(task: TaskCache) -> PageKey:
+    return PageKey(task.platform, normalize_task_url(task.url))
+
+
+def group_tasks_by_page(tasks: list[TaskCache]) -> dict[PageKey, list[TaskCache]]:
+    groups: dict[PageKey, list[TaskCache]] = {}
+    for task in tasks:
+        groups.setdefault(page_key(task), []).append(task)
+    return groups
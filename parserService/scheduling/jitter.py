@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from config import settings
+from models.Task import TaskCache
+
+
+def phase_offset(task_id: UUID, window_seconds: int) -> int:
+    """Stable per-task offset inside the jitter window, derived from the task id."""
+    return task_id.int % window_seconds if window_seconds > 1 else 0
+
+
+def spread_due_time(task_id: UUID, target: datetime, window_seconds: int) -> datetime:
+    """First moment at or after ``target`` that falls on the task's phase of the window grid.
+
+    Tasks with the same interval and target land on different seconds of the
+    window, and each task keeps landing on its own phase from run to run.
+    """
+    if window_seconds <= 1:
+        return target
+    delay = (phase_offset(task_id, window_seconds) - target.timestamp()) % window_seconds
+    return target + timedelta(seconds=delay)
+
+
+def jitter_window_seconds(interval_minutes: int) -> int:
+    return max(0, min(settings.scheduler_jitter_seconds, interval_minutes * 60 // 2))
+
+
+def next_due_time(task: TaskCache, now: datetime) -> datetime:
+    interval_minutes = task.effective_interval_minutes or task.interval_minutes
+    target = now + timedelta(minutes=interval_minutes)
+    return spread_due_time(task.task_id, target, jitter_window_seconds(interval_minutes))
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from models.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElection:
+    """Session-level Postgres advisory lock held on a dedicated connection.
+
+    The lock belongs to the connection, so a crashed or disconnected leader
+    releases it automatically and a standby can take over.
+    """
+
+    def __init__(self, lock_key: int, check_seconds: float):
+        self.lock_key = lock_key
+        self.check_seconds = check_seconds
+        self._connection: AsyncConnection | None = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._connection is not None
+
+    async def try_acquire(self) -> bool:
+        if self._connection is not None:
+            return True
+
+        connection = await engine.connect()
+        try:
+            acquired = await connection.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key})
+            # Leave the implicit transaction so that the connection does not sit idle in transaction.
+            await connection.commit()
+        except Exception:
+            await connection.close()
+            raise
+
+        if not acquired:
+            await connection.close()
+            return False
+
+        self._connection = connection
+        logger.info("Acquired scheduler leadership (advisory lock %s)", self.lock_key)
+        return True
+
+    async def watch(self):
+        """Return once leadership is lost."""
+        while self._connection is not None:
+            await asyncio.sleep(self.check_seconds)
+            try:
+                await self._connection.execute(text("SELECT 1"))
+                await self._connection.commit()
+            except Exception:
+                logger.exception("Lost connection holding the scheduler leadership lock")
+                await self._discard()
+
+    async def release(self):
+        if self._connection is None:
+            return
+        try:
+            await self._connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key})
+            await self._connection.commit()
+        except Exception:
+            logger.exception("Failed to release scheduler leadership lock")
+        await self._discard()
+
+    async def _discard(self):
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                await connection.close()
+            except Exception:
+                logger.debug("Leadership connection was already closed", exc_info=True)
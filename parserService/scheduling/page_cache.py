@@ -0,0 +1,110 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from config import settings
+from parsers.base import CrawlResult, ParsedListing
+from scheduling.coalescing import PageKey
+
+
+class PageResultCache:
+    """Bounded LRU cache of recent parse results keyed by platform, normalized URL and crawl depth.
+
+    A crawl of three pages cannot stand in for a crawl of one, or the other way
+    round, so each depth is cached on its own. ``partial`` results depend on the
+    tasks that requested them and are neither cached nor handed to other callers.
+    """
+
+    def __init__(self, max_entries: int | None = None, ttl_for: Callable[[str], float] | None = None):
+        self.max_entries = max_entries if max_entries is not None else settings.page_cache_max_entries
+        self.ttl_for = ttl_for or settings.page_cache_ttl_for
+        self._entries: OrderedDict[tuple[PageKey, int], tuple[float, tuple[ParsedListing, ...]]] = OrderedDict()
+        self._in_flight: dict[tuple[PageKey, int], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.partial = 0
+
+    def get(self, key: PageKey, depth: int = 1) -> list[ParsedListing] | None:
+        entry = self._entries.get((key, depth))
+        if entry is None:
+            return None
+
+        expires_at, listings = entry
+        if expires_at <= time.monotonic():
+            del self._entries[(key, depth)]
+            return None
+
+        self._entries.move_to_end((key, depth))
+        return list(listings)
+
+    def put(self, key: PageKey, listings: list[ParsedListing], depth: int = 1):
+        ttl = self.ttl_for(key.platform)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        self._entries[(key, depth)] = (time.monotonic() + ttl, tuple(listings))
+        self._entries.move_to_end((key, depth))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_parse(
+        self,
+        key: PageKey,
+        parse: Callable[[], Awaitable[CrawlResult]],
+        depth: int = 1,
+    ) -> list[ParsedListing]:
+        cached = self.get(key, depth)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        slot = (key, depth)
+        pending = self._in_flight.get(slot)
+        if pending is not None:
+            shared = await asyncio.shield(pending)
+            if not shared.partial:
+                self.hits += 1
+                return list(shared.listings)
+            # The other run stopped at listings only its own tasks know; this group needs its own.
+            self.misses += 1
+            return await self._parse_uncached(parse)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[slot] = future
+        try:
+            result = await parse()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark the exception as retrieved when nobody else was waiting on it.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            if result.partial:
+                self.partial += 1
+            else:
+                self.put(key, result.listings, depth)
+            return result.listings
+        finally:
+            self._in_flight.pop(slot, None)
+
+    async def _parse_uncached(self, parse: Callable[[], Awaitable[CrawlResult]]) -> list[ParsedListing]:
+        result = await parse()
+        self.partial += result.partial
+        return result.listings
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "partial": self.partial,
+        }
@@ -0,0 +1,116 @@
+import asyncio
+import heapq
+from collections.abc import Collection
+from datetime import datetime, timezone
+from uuid import UUID
+
+
+class DueQueue:
+    """In-memory min-heaps of ``(next_run_at, task_id)``, one per platform.
+
+    Rescheduling a task pushes a new entry; the entry it replaces stays in the
+    heap and is skipped when it reaches the top. Separate heaps let the
+    scheduler leave a saturated platform's tasks queued while it keeps popping
+    the others.
+    """
+
+    def __init__(self):
+        self._heaps: dict[str, list[tuple[datetime, UUID]]] = {}
+        self._deadlines: dict[UUID, tuple[datetime, str]] = {}
+        self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, task_id: UUID) -> bool:
+        return task_id in self._deadlines
+
+    def schedule(self, task_id: UUID, run_at: datetime, platform: str):
+        run_at = run_at if run_at.tzinfo else run_at.replace(tzinfo=timezone.utc)
+        current_next = self.next_deadline()
+        self._deadlines[task_id] = (run_at, platform)
+        heapq.heappush(self._heaps.setdefault(platform, []), (run_at, task_id))
+        if current_next is None or run_at < current_next:
+            self._changed.set()
+        self._compact()
+
+    def remove(self, task_id: UUID):
+        self._deadlines.pop(task_id, None)
+
+    def replace_all(self, deadlines: dict[UUID, tuple[datetime, str]]):
+        """Replace the schedule with ``{task_id: (next_run_at, platform)}``."""
+        self._deadlines = {
+            task_id: (run_at if run_at.tzinfo else run_at.replace(tzinfo=timezone.utc), platform)
+            for task_id, (run_at, platform) in deadlines.items()
+        }
+        self._rebuild()
+        self._changed.set()
+
+    def next_deadline(self, exclude: Collection[str] = ()) -> datetime | None:
+        platform = self._earliest_platform(exclude)
+        return self._heaps[platform][0][0] if platform is not None else None
+
+    def pop_due(self, now: datetime, limit: int | None = None, exclude: Collection[str] = ()) -> list[UUID]:
+        """Remove and return tasks due at ``now``, except those of ``exclude`` platforms.
+
+        Popped tasks are rescheduled once their run finishes.
+        """
+        due = []
+        while limit is None or len(due) < limit:
+            platform = self._earliest_platform(exclude)
+            if platform is None or self._heaps[platform][0][0] > now:
+                break
+            _, task_id = heapq.heappop(self._heaps[platform])
+            del self._deadlines[task_id]
+            due.append(task_id)
+        return due
+
+    def due_histogram(self, now: datetime, minutes: int = 60) -> list[int]:
+        """Number of tasks due in each of the next ``minutes`` minutes; overdue tasks count in the first."""
+        buckets = [0] * minutes
+        for run_at, _ in self._deadlines.values():
+            minute = int((run_at - now).total_seconds() // 60)
+            if minute < minutes:
+                buckets[max(0, minute)] += 1
+        return buckets
+
+    async def wait(self, max_seconds: float):
+        """Sleep until the earliest deadline, a new earlier deadline, or ``max_seconds``."""
+        self._changed.clear()
+        next_run_at = self.next_deadline()
+        timeout = max_seconds
+        if next_run_at is not None:
+            until_next = (next_run_at - datetime.now(timezone.utc)).total_seconds()
+            timeout = max(0.0, min(timeout, until_next))
+        if timeout <= 0:
+            return
+
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _earliest_platform(self, exclude: Collection[str]) -> str | None:
+        earliest = None
+        for platform, heap in self._heaps.items():
+            if platform in exclude:
+                continue
+            while heap:
+                run_at, task_id = heap[0]
+                if self._deadlines.get(task_id) == (run_at, platform):
+                    break
+                heapq.heappop(heap)
+            if heap and (earliest is None or heap[0][0] < self._heaps[earliest][0][0]):
+                earliest = platform
+        return earliest
+
+    def _compact(self):
+        if sum(len(heap) for heap in self._heaps.values()) > 2 * len(self._deadlines) + 64:
+            self._rebuild()
+
+    def _rebuild(self):
+        self._heaps = {}
+        for task_id, (run_at, platform) in self._deadlines.items():
+            self._heaps.setdefault(platform, []).append((run_at, task_id))
+        for heap in self._heaps.values():
+            heapq.heapify(heap)
@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerPool(Generic[T]):
+    """Fixed number of workers per platform draining bounded per-platform queues."""
+
+    def __init__(
+        self,
+        handler: Callable[[T], Awaitable[None]],
+        platforms: set[str],
+        size_for: Callable[[str], int],
+        queue_size: int,
+    ):
+        self.handler = handler
+        self._sizes = {platform: max(1, size_for(platform)) for platform in platforms}
+        self._queues: dict[str, asyncio.Queue[T]] = {
+            platform: asyncio.Queue(maxsize=max(1, queue_size)) for platform in platforms
+        }
+        self._busy = {platform: 0 for platform in platforms}
+        self._workers: list[asyncio.Task] = []
+        self._freed = asyncio.Event()
+
+    def start(self):
+        if self._workers:
+            return
+        for platform, size in self._sizes.items():
+            for number in range(size):
+                self._workers.append(
+                    asyncio.create_task(self._work(platform), name=f"parser-worker-{platform}-{number}")
+                )
+        logger.info("Started parser workers: %s", self._sizes)
+
+    def submit_nowait(self, platform: str, item: T) -> bool:
+        """Queue work for a platform; False when its queue is full and the caller has to hold it."""
+        try:
+            self._queues[platform].put_nowait(item)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def wait_for_capacity(self, timeout: float):
+        self._freed.clear()
+        try:
+            await asyncio.wait_for(self._freed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def close(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        for queue in self._queues.values():
+            while not queue.empty():
+                queue.get_nowait()
+                queue.task_done()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {
+            platform: {
+                "workers": self._sizes[platform],
+                "busy": self._busy[platform],
+                "queued": queue.qsize(),
+                "queue_size": queue.maxsize,
+            }
+            for platform, queue in self._queues.items()
+        }
+
+    async def _work(self, platform: str):
+        queue = self._queues[platform]
+        while True:
+            item = await queue.get()
+            self._busy[platform] += 1
+            try:
+                await self.handler(item)
+            except Exception:
+                logger.exception("Parser worker for %s failed", platform)
+            finally:
+                self._busy[platform] -= 1
+                queue.task_done()
+                self._freed.set()
@@ -0,0 +1,39 @@
+import json
+
+from parsers.avito import AvitoParser
+from parsers.base import ParsedListing
+
+
+def page(data: dict) -> bytes:
+    script = json.dumps(data, ensure_ascii=False)
+    return f'<html><body><script id="__NEXT_DATA__" type="application/json">{script}</script></body></html>'.encode()
+
+
+def test_only_item_dicts_become_listings():
+    item = {
+        "id": 4100000001,
+        "url": "/moskva/telefony/iphone_4100000001",
+        "title": "iPhone 13",
+        "price": {"value": 52000},
+        "images": [{"url": "https://00.img.avito.st/image/1/1.jpg"}],
+        "category": {"id": 9, "url": "/moskva/telefony", "name": "Телефоны"},
+        "location": {"id": 637640, "name": "Москва", "url": "/moskva"},
+    }
+    data = {
+        "breadcrumbs": [{"id": 9, "url": "/moskva/transport", "name": "Транспорт"}],
+        "seo": {"id": 12, "url": "/moskva/telefony/apple_12345", "title": "Apple в Москве"},
+        "catalog": {"items": [item, dict(item)]},
+    }
+
+    listings = AvitoParser(None)._parse_next_data(page(data), "utf-8")
+
+    assert listings == [
+        ParsedListing(
+            platform="avito",
+            external_id="4100000001",
+            title="iPhone 13",
+            price=52000,
+            url="https://www.avito.ru/moskva/telefony/iphone_4100000001",
+            image_url="https://00.img.avito.st/image/1/1.jpg",
+        )
+    ]
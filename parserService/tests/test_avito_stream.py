@@ -0,0 +1,87 @@
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+
+from parsers.avito import AvitoParser
+from parsers.avito_stream import AvitoItemExtractor
+from parsers.documents import PageSource
+from parsers.strategies import StrategyRanker
+
+FIXTURE = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures" / "avito_item_cards.html"
+URL = "https://www.avito.ru/moskva/telefony"
+
+
+class FakeStream:
+    encoding = "utf-8"
+
+    def __init__(self, body: bytes, chunk_size: int, delay: float = 0):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.delay = delay
+        self.bytes_read = 0
+
+    async def iter_chunks(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            await asyncio.sleep(self.delay)
+            chunk = self.body[start : start + self.chunk_size]
+            self.bytes_read += len(chunk)
+            yield chunk
+
+
+class FakeHttp:
+    def __init__(self, body: bytes, chunk_size: int, delay: float = 0):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.delay = delay
+
+    @asynccontextmanager
+    async def stream(self, platform, url, **kwargs):
+        yield FakeStream(self.body, self.chunk_size, self.delay)
+
+
+@pytest.mark.parametrize("chunk_size", [7, 100, 4096, 1 << 20])
+async def test_streamed_page_matches_dom_extraction(chunk_size):
+    body = FIXTURE.read_bytes()
+    parser = AvitoParser(FakeHttp(body, chunk_size))
+
+    page = await parser._stream_page(URL, 1, frozenset())
+
+    assert page.listings == parser._parse_items(PageSource(body, "utf-8").document)
+    assert page.partial is False
+
+
+async def test_stream_stopped_at_known_listings_is_partial():
+    body = FIXTURE.read_bytes()
+    parser = AvitoParser(FakeHttp(body, 4096))
+    listings = parser._parse_items(PageSource(body, "utf-8").document)
+
+    page = await parser._stream_page(URL, 1, frozenset(listing.external_id for listing in listings[5:]))
+
+    assert page.partial is True
+    assert page.next_cursor is None
+    # The default streak of three known cards ends reading at the eighth card.
+    assert page.listings == listings[:8]
+
+
+async def test_small_reads_are_parsed_in_batches(monkeypatch):
+    body = FIXTURE.read_bytes()
+    feeds = []
+    feed = AvitoItemExtractor.feed
+    monkeypatch.setattr(AvitoItemExtractor, "feed", lambda self, text: feeds.append(text) or feed(self, text))
+
+    await AvitoParser(FakeHttp(body, 100))._stream_page(URL, 1, frozenset())
+
+    assert len(feeds) <= len(body) // AvitoParser.STREAM_FEED_BYTES + 1
+
+
+async def test_download_time_is_not_recorded_as_parse_time():
+    body = FIXTURE.read_bytes()
+    ranker = StrategyRanker()
+    # About 40 reads of 20 ms each: the page takes at least 0.8 s to arrive.
+    http = FakeHttp(body, len(body) // 40 + 1, delay=0.02)
+
+    await AvitoParser(http, strategies=ranker)._stream_page(URL, 1, frozenset())
+
+    assert ranker.stats()["avito"]["items"]["mean_ms"] < 400
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from scheduling.timers import DueQueue
+
+NOW = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_pop_due_returns_tasks_of_all_platforms_in_deadline_order():
+    queue = DueQueue()
+    avito, cian, later = uuid4(), uuid4(), uuid4()
+    queue.schedule(cian, NOW - timedelta(seconds=5), "cian")
+    queue.schedule(avito, NOW - timedelta(seconds=10), "avito")
+    queue.schedule(later, NOW + timedelta(minutes=1), "youla")
+
+    assert queue.pop_due(NOW) == [avito, cian]
+    assert later in queue
+
+
+def test_pop_due_leaves_tasks_of_excluded_platforms_queued():
+    queue = DueQueue()
+    avito_tasks = [uuid4() for _ in range(3)]
+    for number, task_id in enumerate(avito_tasks):
+        queue.schedule(task_id, NOW - timedelta(minutes=10 - number), "avito")
+    cian = uuid4()
+    queue.schedule(cian, NOW, "cian")
+
+    assert queue.pop_due(NOW, limit=2, exclude={"avito"}) == [cian]
+    assert all(task_id in queue for task_id in avito_tasks)
+    assert queue.next_deadline(exclude={"avito"}) is None
+    assert queue.pop_due(NOW, limit=2) == avito_tasks[:2]
+
+
+def test_rescheduled_task_moves_to_its_new_platform():
+    queue = DueQueue()
+    task_id = uuid4()
+    queue.schedule(task_id, NOW, "avito")
+    queue.schedule(task_id, NOW, "cian")
+
+    assert queue.pop_due(NOW, exclude={"cian"}) == []
+    assert queue.pop_due(NOW) == [task_id]
+    assert len(queue) == 0
+
+
+def test_replace_all_keeps_platforms():
+    queue = DueQueue()
+    avito, cian = uuid4(), uuid4()
+    queue.replace_all({avito: (NOW, "avito"), cian: (NOW + timedelta(seconds=1), "cian")})
+
+    assert queue.pop_due(NOW + timedelta(seconds=1), exclude={"avito"}) == [cian]
+    assert queue.next_deadline() == NOW
@@ -0,0 +1,78 @@
+import asyncio
+import os
+
+import pytest
+
+import parsers.documents as documents
+from benchmark_parsers import FIXTURES_DIR
+from parsers.cian import CianParser
+from parsers.documents import PageSource
+from parsers.executor import ParseExecutor
+from parsers.youla import YoulaParser
+
+
+@pytest.fixture
+def executor():
+    executor = ParseExecutor(workers=1, max_tasks_per_worker=0)
+    yield executor
+    executor.close()
+
+
+def youla_page() -> PageSource:
+    return PageSource((FIXTURES_DIR / "youla_state_and_cards.html").read_bytes(), "utf-8")
+
+
+async def test_worker_runs_the_strategies_of_a_page_in_one_job(executor):
+    source = youla_page()
+    names = ["product_cards", "state", "embedded_links"]
+
+    extraction = await executor.extract("youla", names, source.body, source.encoding)
+
+    expected = YoulaParser(None).extract_page(names, source)
+    assert extraction.strategy == "product_cards"
+    assert extraction.listings == expected.listings
+    assert [name for name, _, _ in extraction.attempts] == ["product_cards"]
+    # Only what the feed request needs comes back, not the whole embedded state.
+    assert extraction.context == expected.context
+    assert set(extraction.context) == {"auth", "data", "entities"}
+    assert executor.stats()["submitted"] == 1
+
+
+async def test_crashed_pool_is_rebuilt_and_the_page_retried(executor):
+    source = youla_page()
+    first = await executor.extract("youla", ["state"], source.body, source.encoding)
+    for process in list(executor._pool._processes.values()):
+        process.kill()
+        process.join()
+
+    retried = await executor.extract("youla", ["state"], source.body, source.encoding)
+
+    assert retried.listings == first.listings
+    assert executor.stats()["restarts"] == 1
+
+
+@pytest.mark.parametrize(("max_tasks", "distinct"), [(1, 3), (0, 1)])
+async def test_workers_are_replaced_after_max_tasks_pages(max_tasks, distinct):
+    executor = ParseExecutor(workers=1, max_tasks_per_worker=max_tasks)
+    try:
+        loop = asyncio.get_running_loop()
+        pids = [await loop.run_in_executor(executor._ensure_pool(), os.getpid) for _ in range(3)]
+    finally:
+        executor.close()
+
+    assert len(set(pids)) == distinct
+
+
+def test_dom_strategies_of_a_page_share_one_document(monkeypatch):
+    parsed = []
+    parse_document = documents.parse_document
+    monkeypatch.setattr(documents, "parse_document", lambda *args: parsed.append(args) or parse_document(*args))
+
+    extraction = CianParser(None).extract_page(
+        ["offers_state", "offer_cards", "script_links"],
+        PageSource(b"<html><body><div>No offers here</div></body></html>", "utf-8"),
+    )
+
+    assert extraction.listings == []
+    assert [name for name, _, _ in extraction.attempts] == ["offers_state", "offer_cards", "script_links"]
+    assert len(parsed) == 1
@@ -0,0 +1,36 @@
+import pytest
+
+from benchmark_parsers import (
+    FIXTURES_DIR,
+    BufferedAvitoParser,
+    ReplayClient,
+    StreamingAvitoParser,
+    compare_paths,
+    parse_fixture,
+)
+
+
+@pytest.mark.parametrize(
+    "fixture",
+    ["avito_state_and_cards.html", "cian_state_and_cards.html", "youla_state_and_cards.html"],
+)
+async def test_embedded_json_and_dom_cards_give_the_same_listings(fixture):
+    assert await compare_paths(FIXTURES_DIR / fixture) == "agree"
+
+
+async def test_compare_paths_reports_a_field_only_one_path_reads(tmp_path):
+    path = tmp_path / "cian_state_and_cards.html"
+    body = (FIXTURES_DIR / path.name).read_bytes()
+    path.write_bytes(body.replace(b'<span data-mark="MainPrice"><span>8', b'<span data-mark="MainPrice"><span>9', 1))
+
+    assert await compare_paths(path) == "DIFFER"
+
+
+@pytest.mark.parametrize("chunk_size", [64, 512])
+async def test_streamed_page_matches_buffered_page(chunk_size):
+    path = FIXTURES_DIR / "avito_state_and_cards.html"
+    body = path.read_bytes()
+    buffered = await parse_fixture(BufferedAvitoParser(ReplayClient(body)), path)
+    streamed = await parse_fixture(StreamingAvitoParser(ReplayClient(body, chunk_size)), path)
+
+    assert streamed == buffered
@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+import scheduler as scheduler_module
+from config import settings
+from scheduler import TaskScheduler
+
+
+class FakeResult:
+    def __init__(self, values):
+        self.values = values
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.values
+
+
+class FakeSession:
+    """Keeps leases of the tasks in ``owned``; the rest were taken over by another replica."""
+
+    def __init__(self, owned: set):
+        self.owned = owned
+        self.statements = []
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement):
+        self.statements.append(statement.compile(dialect=postgresql.dialect()))
+        return FakeResult(list(self.owned))
+
+    async def commit(self):
+        self.commits += 1
+
+
+class FakeRabbitMQ:
+    async def publish_task_health(self, payload):
+        pass
+
+
+async def test_held_tasks_get_their_lease_extended_before_it_expires(monkeypatch):
+    scheduler = TaskScheduler(FakeRabbitMQ())
+    queued, running = uuid4(), uuid4()
+    scheduler.running_tasks.update({queued, running})
+    session = FakeSession(owned={queued, running})
+    monkeypatch.setattr(scheduler_module, "async_session", lambda: session)
+    started = datetime.now(timezone.utc)
+
+    lost = await scheduler.renew_leases()
+
+    assert lost == set()
+    assert session.commits == 1
+    params = session.statements[0].params
+    assert params["lease_owner_1"] == settings.instance_id
+    assert set(params["task_id_1"]) == {queued, running}
+    assert params["lease_expires_at"] >= started + timedelta(seconds=settings.task_lease_seconds)
+
+
+async def test_expired_lease_taken_by_another_replica_is_reported(monkeypatch):
+    scheduler = TaskScheduler(FakeRabbitMQ())
+    kept, taken_over = uuid4(), uuid4()
+    scheduler.running_tasks.update({kept, taken_over})
+    monkeypatch.setattr(scheduler_module, "async_session", lambda: FakeSession(owned={kept}))
+
+    assert await scheduler.renew_leases() == {taken_over}
+
+
+async def test_no_query_without_held_tasks(monkeypatch):
+    scheduler = TaskScheduler(FakeRabbitMQ())
+    session = FakeSession(owned=set())
+    monkeypatch.setattr(scheduler_module, "async_session", lambda: session)
+
+    assert await scheduler.renew_leases() == set()
+    assert session.statements == []
+
+
+async def test_leadership_loss_releases_every_lease_of_this_replica(monkeypatch):
+    scheduler = TaskScheduler(FakeRabbitMQ())
+    session = FakeSession(owned={uuid4(), uuid4()})
+    monkeypatch.setattr(scheduler_module, "async_session", lambda: session)
+
+    await scheduler.release_leases()
+
+    assert session.commits == 1
+    statement = session.statements[0]
+    assert statement.params["lease_owner_1"] == settings.instance_id
+    assert statement.params["lease_owner"] is None
+    assert statement.params["lease_expires_at"] is None
+
+
+class FakeElection:
+    def __init__(self, attempts_before_win: int):
+        self.attempts_before_win = attempts_before_win
+
+    async def try_acquire(self):
+        self.attempts_before_win -= 1
+        return self.attempts_before_win < 0
+
+
+async def test_standby_loads_the_schedule_once_it_wins_the_lock(monkeypatch):
+    scheduler = TaskScheduler(FakeRabbitMQ())
+    election = FakeElection(attempts_before_win=2)
+    loads = []
+
+    async def load_schedule():
+        loads.append(election.attempts_before_win)
+
+    monkeypatch.setattr(scheduler, "load_schedule", load_schedule)
+    no_wait = asyncio.sleep
+    monkeypatch.setattr(scheduler_module.asyncio, "sleep", lambda seconds: no_wait(0))
+
+    await scheduler.standby(election)
+
+    assert loads == [-1]
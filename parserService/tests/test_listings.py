@@ -0,0 +1,67 @@
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from models.Task import TaskCache
+from parsers.base import ParsedListing
+from repositories.listings import ListingRepository
+
+
+class FakeResult:
+    def __init__(self, values):
+        self.values = values
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.values
+
+
+class FakeRow:
+    def __init__(self, external_id):
+        self.external_id = external_id
+
+
+class FakeSession:
+    """Answers the existing-ID lookup with ``stored`` and echoes inserted rows back as RETURNING."""
+
+    def __init__(self, stored: set[str]):
+        self.stored = stored
+        self.inserted: list[str] = []
+        self.lookups = 0
+
+    async def execute(self, statement):
+        self.lookups += 1
+        candidates = statement.compile(dialect=postgresql.dialect()).params["external_id_1"]
+        return FakeResult([external_id for external_id in candidates if external_id in self.stored])
+
+    async def scalars(self, statement):
+        params = statement.compile(dialect=postgresql.dialect()).params
+        self.inserted = [value for key, value in params.items() if key.startswith("external_id")]
+        return [FakeRow(external_id) for external_id in self.inserted]
+
+
+def listing(external_id: str) -> ParsedListing:
+    return ParsedListing("avito", external_id, f"Listing {external_id}", 100, f"https://www.avito.ru/item_{external_id}")
+
+
+def task() -> TaskCache:
+    return TaskCache(task_id=uuid4(), user_id=uuid4(), platform="avito")
+
+
+async def test_only_listings_not_stored_yet_are_inserted():
+    session = FakeSession(stored={"1", "2"})
+
+    new_rows = await ListingRepository(session).save_new(task(), [listing("3"), listing("1"), listing("2"), listing("4")])
+
+    assert sorted(session.inserted) == ["3", "4"]
+    assert [row.external_id for row in new_rows] == ["3", "4"]
+
+
+async def test_page_of_known_listings_sends_no_insert():
+    session = FakeSession(stored={"1", "2"})
+
+    assert await ListingRepository(session).save_new(task(), [listing("1"), listing("2"), listing("1")]) == []
+    assert session.lookups == 1
+    assert session.inserted == []
@@ -0,0 +1,82 @@
+import asyncio
+
+from parsers.base import CrawlResult, ParsedListing
+from scheduling.coalescing import PageKey
+from scheduling.page_cache import PageResultCache
+
+KEY = PageKey("avito", "https://www.avito.ru/moskva/telefony")
+
+
+def listing(external_id: str) -> ParsedListing:
+    return ParsedListing("avito", external_id, "Phone", 1000, f"https://www.avito.ru/item/{external_id}")
+
+
+def make_cache() -> PageResultCache:
+    return PageResultCache(max_entries=10, ttl_for=lambda _: 60)
+
+
+async def test_results_of_different_crawl_depths_are_cached_separately():
+    cache = make_cache()
+    calls = []
+
+    async def parse(depth):
+        calls.append(depth)
+        return CrawlResult([listing(str(page)) for page in range(1, depth + 1)])
+
+    assert len(await cache.get_or_parse(KEY, lambda: parse(1), 1)) == 1
+    assert len(await cache.get_or_parse(KEY, lambda: parse(3), 3)) == 3
+    assert len(await cache.get_or_parse(KEY, lambda: parse(3), 3)) == 3
+    assert calls == [1, 3]
+
+
+async def test_partial_result_is_not_cached():
+    cache = make_cache()
+    calls = 0
+
+    async def parse():
+        nonlocal calls
+        calls += 1
+        return CrawlResult([listing("1")], partial=calls == 1)
+
+    await cache.get_or_parse(KEY, parse)
+    await cache.get_or_parse(KEY, parse)
+
+    assert calls == 2
+    assert cache.stats()["partial"] == 1
+
+
+async def test_partial_in_flight_result_is_not_shared():
+    cache = make_cache()
+    release = asyncio.Event()
+
+    async def stopped_early():
+        await release.wait()
+        return CrawlResult([listing("1")], partial=True)
+
+    async def full():
+        return CrawlResult([listing("1"), listing("2")])
+
+    first = asyncio.create_task(cache.get_or_parse(KEY, stopped_early))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(cache.get_or_parse(KEY, full))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert len(await first) == 1
+    assert len(await second) == 2
+
+
+async def test_full_in_flight_result_is_shared():
+    cache = make_cache()
+    calls = 0
+
+    async def parse():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return CrawlResult([listing("1")])
+
+    results = await asyncio.gather(cache.get_or_parse(KEY, parse), cache.get_or_parse(KEY, parse))
+
+    assert calls == 1
+    assert results[0] == results[1]
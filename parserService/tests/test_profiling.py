@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import time
+
+from profiling import SamplingProfiler, to_thread
+
+
+def busy(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def sampled_extraction():
+    busy(0.2)
+
+
+def unsampled_extraction():
+    busy(0.2)
+
+
+def sampled_loop_work():
+    busy(0.1)
+
+
+async def unsampled_loop_work(stop: asyncio.Event):
+    while not stop.is_set():
+        busy(0.005)
+        await asyncio.sleep(0)
+
+
+def profiled_functions(profiler: SamplingProfiler) -> set[str]:
+    return {frame.split(" (", 1)[0] for stack in profiler._stacks for frame in stack.split(";")}
+
+
+async def test_only_threads_and_tasks_of_sampled_runs_are_recorded(tmp_path):
+    profiler = SamplingProfiler(sample_rate=1.0, interval_ms=2, output_dir=str(tmp_path))
+    profiler.enable()
+    stop = asyncio.Event()
+    other_task = asyncio.create_task(unsampled_loop_work(stop))
+
+    async def sampled_run():
+        with profiler.sampled():
+            await to_thread(sampled_extraction)
+            sampled_loop_work()
+
+    other_thread = threading.Thread(target=unsampled_extraction)
+    other_thread.start()
+    try:
+        await asyncio.gather(sampled_run(), to_thread(unsampled_extraction))
+    finally:
+        stop.set()
+        await other_task
+        other_thread.join()
+        profiler.disable()
+
+    functions = profiled_functions(profiler)
+    assert "sampled_extraction" in functions
+    assert "sampled_loop_work" in functions
+    assert "unsampled_extraction" not in functions
+    assert "unsampled_loop_work" not in functions
+
+
+async def test_nothing_is_recorded_outside_sampled_runs(tmp_path):
+    profiler = SamplingProfiler(sample_rate=1.0, interval_ms=2, output_dir=str(tmp_path))
+    profiler.enable()
+    try:
+        with profiler.sampled(False):
+            await to_thread(sampled_extraction)
+    finally:
+        profiler.disable()
+
+    assert profiler.samples == 0
+    assert profiler.stats()["active_runs"] == 0
@@ -0,0 +1,100 @@
+import pytest
+
+from benchmark_parsers import FIXTURES_DIR, ReplayClient
+from models.Post import FoundListing  # noqa: F401
+from models.Task import TaskCache
+from parsers.base import ParsedListing
+from parsers.strategies import StrategyRanker, url_pattern
+from parsers.youla import YoulaParser
+
+URL = "https://youla.ru/moskva?q=chair"
+LISTING = ParsedListing("youla", "1", "Chair", 100, "https://youla.ru/moskva/chair-1")
+
+
+def returning(listings, calls=None, name=None):
+    async def strategy():
+        if calls is not None:
+            calls.append(name)
+        return listings
+
+    return strategy
+
+
+def test_ties_keep_the_declared_order():
+    assert StrategyRanker().order("youla", URL, ["state", "product_cards", "embedded_links"]) == [
+        "state",
+        "product_cards",
+        "embedded_links",
+    ]
+
+
+def test_scores_decay_towards_recent_results():
+    ranker = StrategyRanker(decay_alpha=0.5)
+
+    ranker.record("youla", URL, "state", False, 0.01)
+    assert ranker._scores[("youla", url_pattern(URL))]["state"] == pytest.approx(0.25)
+    ranker.record("youla", URL, "state", True, 0.01)
+    assert ranker._scores[("youla", url_pattern(URL))]["state"] == pytest.approx(0.625)
+
+
+async def test_failing_strategy_moves_behind_the_one_that_worked():
+    ranker = StrategyRanker(decay_alpha=0.5)
+    calls = []
+    strategies = {
+        "state": returning([], calls, "state"),
+        "product_cards": returning([LISTING], calls, "product_cards"),
+    }
+
+    assert await ranker.run("youla", URL, strategies) == ("product_cards", [LISTING])
+    assert calls == ["state", "product_cards"]
+
+    calls.clear()
+    assert await ranker.run("youla", "https://youla.ru/kazan?q=table", strategies) == ("product_cards", [LISTING])
+    assert calls == ["product_cards"]
+
+
+async def test_raising_strategy_is_recorded_as_a_failure_and_propagates():
+    ranker = StrategyRanker(decay_alpha=0.5)
+
+    async def broken():
+        raise RuntimeError("layout changed")
+
+    with pytest.raises(RuntimeError):
+        await ranker.run("youla", URL, {"state": broken, "product_cards": returning([LISTING])})
+
+    assert ranker.stats()["youla"]["state"] == {"attempts": 1, "success_rate": 0.0, "mean_ms": pytest.approx(0, abs=5)}
+    assert ranker.order("youla", URL, ["state", "product_cards"]) == ["product_cards", "state"]
+
+
+def test_least_recently_used_patterns_are_evicted():
+    ranker = StrategyRanker(decay_alpha=0.5, max_patterns=2)
+    urls = ["https://youla.ru/a?q=1", "https://youla.ru/a/b?q=1", "https://youla.ru/a/b/c?q=1"]
+    for url in urls[:2]:
+        ranker.record("youla", url, "product_cards", True, 0.01)
+    # Touching the first pattern makes the second one the least recently used.
+    ranker.record("youla", urls[0], "product_cards", True, 0.01)
+    ranker.record("youla", urls[2], "product_cards", True, 0.01)
+
+    assert set(ranker._scores) == {("youla", url_pattern(urls[0])), ("youla", url_pattern(urls[2]))}
+
+
+class CountingClient(ReplayClient):
+    posts = 0
+
+    async def post_json(self, platform, url, payload, **kwargs):
+        self.posts += 1
+        return await super().post_json(platform, url, payload, **kwargs)
+
+
+async def test_youla_feed_is_requested_only_after_the_page_strategies():
+    ranker = StrategyRanker(decay_alpha=0.5)
+    # The feed has been winning for this URL pattern, and the page strategies failing.
+    for _ in range(5):
+        ranker.record("youla", URL, "graphql_feed", True, 0.2)
+        ranker.record("youla", URL, "state", False, 0.01)
+    client = CountingClient((FIXTURES_DIR / "youla_state_and_cards.html").read_bytes())
+
+    page = await YoulaParser(client, strategies=ranker).parse_page(TaskCache(platform="youla", url=URL), 1, None)
+
+    assert len(page.listings) == 60
+    assert client.posts == 0
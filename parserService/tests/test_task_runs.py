@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from metrics import RunTrace
+from models.Task import TaskCache
+from repositories.task_runs import TaskRunLog, health_payload
+
+STARTED = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class Boom(Exception):
+    status = 503
+
+
+def make_task(**fields) -> TaskCache:
+    return TaskCache(task_id=uuid4(), platform="avito", adaptive_interval=True, **fields)
+
+
+def test_health_summarizes_runs_and_carries_interval_decision():
+    log = TaskRunLog(flush_seconds=30, keep_runs=50)
+    task = make_task(effective_interval_minutes=20, interval_reason="1.20 new per run, interval kept")
+    log.record(task, RunTrace(started_at=STARTED, fetch_seconds=0.4, bytes_read=4096), parsed=10, new=2)
+    task.effective_interval_minutes = 45
+    task.interval_reason = "0.10 new per run, polling slower"
+    log.record(task, RunTrace(started_at=STARTED + timedelta(minutes=20)), error=Boom())
+    log.record(task, RunTrace(started_at=STARTED + timedelta(minutes=40)), error=Boom())
+
+    [entry] = health_payload(log._pending)["tasks"]
+
+    assert entry["task_id"] == str(task.task_id)
+    assert entry["runs"] == 3
+    assert entry["failures"] == 2
+    assert entry["consecutive_failures"] == 2
+    assert entry["last_error_class"] == "Boom"
+    assert entry["last_http_status"] == 503
+    assert entry["new_count"] == 2
+    assert entry["page_kib_max"] == 4
+    assert entry["effective_interval_minutes"] == 45
+    assert entry["interval_reason"] == "0.10 new per run, polling slower"
+
+
+def test_health_averages_only_fetched_runs():
+    log = TaskRunLog(flush_seconds=30, keep_runs=50)
+    task = make_task()
+    fetched = RunTrace(started_at=STARTED, fetch_seconds=0.6, parse_seconds=0.05, requests=1, http_status=200)
+    log.record(task, fetched, parsed=10)
+    # Served from the page cache: no request, no parse of its own.
+    log.record(task, RunTrace(started_at=STARTED + timedelta(minutes=5)), parsed=10)
+
+    [entry] = health_payload(log._pending)["tasks"]
+
+    assert entry["runs"] == 2
+    assert entry["fetched_runs"] == 1
+    assert entry["fetch_ms_avg"] == 600
+    assert entry["parse_ms_avg"] == 50
+    assert entry["last_http_status"] == 200
+
+
+def test_health_without_fetched_runs_has_no_averages():
+    log = TaskRunLog(flush_seconds=30, keep_runs=50)
+    log.record(make_task(), RunTrace(started_at=STARTED), parsed=3)
+
+    [entry] = health_payload(log._pending)["tasks"]
+
+    assert entry["fetched_runs"] == 0
+    assert entry["fetch_ms_avg"] is None
+    assert entry["parse_ms_avg"] is None